@@ -0,0 +1,117 @@
+"""
+End-to-end benchmark of the agent state machine.
+
+Runs whole incidents, from INIT to FINAL, against in-memory repositories shaped
+like the test_run ones and a scripted LLMClientImpl: one tool call, then one
+assignment of every failed node.
+
+    uv run python -m benchmarks.bench_agent
+"""
+import json
+import time
+
+from infra_fail_mngr.agent import InfraAgent
+from infra_fail_mngr.domain import AgentRepository, SystemRepository
+from infra_fail_mngr.llm import LLMClientImpl, LLMServiceImpl
+from infra_fail_mngr.states import State
+from infra_fail_mngr.tools import AgentTools, SystemTools
+
+SIZES = [1, 10, 100, 1_000, 10_000]
+INCIDENTS = 20
+
+
+class BenchSystemRepo(SystemRepository):
+    def __init__(self, nodes: list[str]):
+        self.nodes = nodes
+        self.repaired = False
+
+    def get_failed_nodes(self):
+        return [] if self.repaired else self.nodes
+
+    def get_node_details(self, node_id):
+        return {"critical": node_id.endswith(("0", "5"))}
+
+    def assign_crew(self, node_id, crew_id):
+        self.repaired = True
+        return True
+
+
+class BenchAgentRepo(AgentRepository):
+    def __init__(self, crews: list[str]):
+        self.crews = crews
+
+    def get_available_crews(self):
+        return self.crews
+
+    def get_weather_at_location(self, location):
+        return 25
+
+    def estimate_repair_time(self, node):
+        return 60
+
+    def estimate_travel_time(self, origin, destination):
+        return 30
+
+    def crew_location(self, crew_id):
+        return "location1"
+
+
+def make_responses(nodes: list[str], crews: list[str]) -> list[str]:
+    return [
+        json.dumps({"thoughts": "Look up the crews", "action": "get_available_crews", "arguments": {}}),
+        json.dumps({
+            "thoughts": "Send one crew to every node",
+            "action": "assign_repair_crew",
+            "arguments": {"node_ids": nodes, "crew_ids": crews},
+        }),
+    ]
+
+
+def make_agent(size: int, responses: list[str] = None) -> InfraAgent:
+    nodes = [f"node{i}" for i in range(size)]
+    crews = [f"crew{i}" for i in range(size)]
+    system_tools = SystemTools(BenchSystemRepo(nodes))
+    agent_tools = AgentTools(BenchAgentRepo(crews), [system_tools.assign_repair_crew])
+    llm_service = LLMServiceImpl(LLMClientImpl(responses or make_responses(nodes, crews)))
+    agent = InfraAgent(llm_service, system_tools, agent_tools)
+    agent.max_steps = 20
+    return agent
+
+
+def run(sizes=SIZES, incidents: int = INCIDENTS, repeat: int = 3) -> list[dict]:
+    results = []
+    for size in sizes:
+        nodes = [f"node{i}" for i in range(size)]
+        responses = make_responses(nodes, [f"crew{i}" for i in range(size)])
+
+        best, steps = float("inf"), 0
+        for _ in range(repeat):
+            agents = [make_agent(size, responses) for _ in range(incidents)]
+            start = time.perf_counter()
+            for agent in agents:
+                agent.run_to_completion()
+            best = min(best, time.perf_counter() - start)
+            assert all(agent.state == State.FINAL for agent in agents)
+            steps = sum(len(agent.step_history) for agent in agents)
+
+        results.append({
+            "benchmark": "agent_incident",
+            "size": size,
+            "incidents": incidents,
+            "seconds": best,
+            "step_seconds": best / steps,
+            "incidents_per_second": incidents / best,
+        })
+    return results
+
+
+def main():
+    for result in run():
+        print(
+            f"{result['size']:>7} nodes  {result['incidents_per_second']:10.1f} incidents/s"
+            f"  {result['step_seconds'] * 1000:9.3f} ms/step"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark for the context encoding of planning prompts.
+
+Compares the prompt size and build time of the compact encoding (no indentation,
+columnar impact report with identical impact values aggregated) against the
+indented JSON formatter, for reports with few and with all-distinct impact values.
+
+    uv run python -m benchmarks.bench_compact_context
+"""
+from infra_fail_mngr.prompts import PromptBuilder, get_system_prompt
+
+from .bench_prompt_build import _tool_descriptions
+from .timing import best_of
+
+SIZES = [10, 100, 1_000, 10_000]
+CALLS = 10
+CRITICALITIES = ["Low", "Medium", "High"]
+
+
+def make_context(size: int, distinct: bool = False) -> dict:
+    nodes = [f"node{i}" for i in range(size)]
+    return {
+        "failures": nodes,
+        "impact_report": {
+            node: {
+                "population_affected": 100 * i if distinct else 1000 * (i % 5),
+                "criticality": CRITICALITIES[i % len(CRITICALITIES)],
+            }
+            for i, node in enumerate(nodes)
+        },
+        "conversation_history": [{"role": "tool_output", "tool": "get_available_crews", "result": ["crew1", "crew2"]}],
+    }
+
+
+def run(sizes=SIZES, calls: int = CALLS, repeat: int = 3) -> list[dict]:
+    system_prompt = get_system_prompt()
+    tool_descriptions = _tool_descriptions()
+    indented = PromptBuilder(system_prompt, tool_descriptions)
+    compact = PromptBuilder(system_prompt, tool_descriptions, compact=True)
+
+    results = []
+    for distinct in (False, True):
+        for size in sizes:
+            context = make_context(size, distinct)
+
+            def build_compact():
+                for _ in range(calls):
+                    compact.build(context)
+
+            def build_indented():
+                for _ in range(calls):
+                    indented.build(context)
+
+            results.append({
+                "benchmark": "compact_context",
+                "size": size,
+                "distinct_impacts": distinct,
+                "calls": calls,
+                "seconds": best_of(build_compact, repeat),
+                "legacy_seconds": best_of(build_indented, repeat),
+                "prompt_chars": len(compact.build(context)),
+                "legacy_prompt_chars": len(indented.build(context)),
+            })
+    return results
+
+
+def main():
+    for result in run():
+        impacts = "distinct" if result["distinct_impacts"] else "grouped"
+        print(
+            f"{result['size']:>6} nodes {impacts:>8}"
+            f"  compact {result['prompt_chars']:>9} chars {result['seconds'] * 1000:9.3f} ms"
+            f"  indented {result['legacy_prompt_chars']:>9} chars {result['legacy_seconds'] * 1000:9.3f} ms"
+            f"  per {result['calls']} calls"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Micro-benchmark of the impact scoring of large failure sets.
+
+Compares the columnar ImpactEngine pass with scoring every node on its own,
+as estimate_impact does.
+
+    uv run python -m benchmarks.bench_impact
+"""
+import random
+
+from infra_fail_mngr.tools import ImpactEngine
+
+from .timing import best_of
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def make_details(size: int) -> dict:
+    rng = random.Random(size)
+    return {
+        f"node{i}": {
+            "population": rng.randint(0, 10_000),
+            "critical": rng.random() < 0.1,
+            "downstream": rng.randint(0, 20),
+            "redundancy": rng.randint(0, 2),
+        }
+        for i in range(size)
+    }
+
+
+def run(sizes=SIZES, repeat: int = 3) -> list[dict]:
+    engine = ImpactEngine()
+    results = []
+    for size in sizes:
+        details = make_details(size)
+        node_ids = list(details)
+        results.append({
+            "benchmark": "impact",
+            "size": size,
+            "seconds": best_of(lambda: engine.score(node_ids, details).ranked(), repeat),
+            "legacy_seconds": best_of(lambda: {node: engine.impact(details[node]) for node in node_ids}, repeat),
+        })
+    return results
+
+
+def main():
+    for result in run():
+        print(
+            f"{result['size']:>7} nodes  columnar {result['seconds'] * 1000:9.3f} ms"
+            f"  per node {result['legacy_seconds'] * 1000:9.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
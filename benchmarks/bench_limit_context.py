@@ -0,0 +1,73 @@
+"""
+Micro-benchmark for LLMServiceImpl._limit_context.
+
+Compares the single-pass trimming against the drop-oldest loop it replaced,
+which re-serialized the whole context on every iteration. That loop never
+wrote the shortened history back before measuring, so it always emptied the
+history of an over-budget context: only its timings are comparable, not its
+results.
+
+    uv run python -m benchmarks.bench_limit_context
+"""
+import json
+
+from infra_fail_mngr.llm import LLMServiceImpl, LLMClientImpl
+
+from .timing import best_of
+
+SIZES = [10, 100, 1_000, 10_000]
+# The original loop is quadratic, past this size it takes minutes
+LEGACY_MAX_SIZE = 1_000
+
+
+def _legacy_limit_context(context, max_context_length):
+    # The baseline LLMServiceImpl._limit_context, verbatim
+    ctx_str = json.dumps(context)
+    if len(ctx_str) <= max_context_length:
+        return context
+
+    # Truncate conversation_history from the beginning
+    history = context.get('conversation_history', [])
+    limited_context = context.copy()
+    while history and len(json.dumps(limited_context)) > max_context_length:
+        history = history[1:]  # Remove oldest
+    limited_context['conversation_history'] = history
+    return limited_context
+
+
+def make_context(size: int) -> dict:
+    return {
+        "failures": ["node1", "node2"],
+        "impact_report": {"node1": {"population_affected": 5000, "criticality": "High"}},
+        "conversation_history": [
+            {"role": "tool_output", "tool": "get_weather_at_location", "result": {"location": f"loc{i}", "temperature": i % 40}}
+            for i in range(size)
+        ],
+    }
+
+
+def run(sizes=SIZES, max_context_length: int = 2000, repeat: int = 3) -> list[dict]:
+    service = LLMServiceImpl(LLMClientImpl([]), max_context_length=max_context_length)
+    results = []
+    for size in sizes:
+        context = make_context(size)
+        result = {
+            "benchmark": "limit_context",
+            "size": size,
+            "seconds": best_of(lambda: service._limit_context(context), repeat),
+        }
+        if size <= LEGACY_MAX_SIZE:
+            result["legacy_seconds"] = best_of(lambda: _legacy_limit_context(context, max_context_length), 1)
+        results.append(result)
+    return results
+
+
+def main():
+    for result in run():
+        legacy = result.get("legacy_seconds")
+        legacy_str = f"{legacy * 1000:10.3f} ms" if legacy is not None else "         -"
+        print(f"{result['size']:>7} entries  new {result['seconds'] * 1000:10.3f} ms  legacy {legacy_str}")
+
+
+if __name__ == "__main__":
+    main()
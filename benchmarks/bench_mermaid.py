@@ -0,0 +1,47 @@
+"""
+Micro-benchmark for the Mermaid flow diagram of the step history and its mermaid.live link.
+
+    uv run python -m benchmarks.bench_mermaid
+"""
+from infra_fail_mngr.agent import StepHistory
+from infra_fail_mngr.vis import mermaid_to_link, step_history_to_flow_diagram
+
+from .timing import best_of
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+STATES = ["FAILURE_DETECTION", "IMPACT_ANALYSIS", "REPAIR_PLANNING", "EXECUTION", "RESCHEDULING"]
+
+
+def make_history(size: int) -> StepHistory:
+    history = StepHistory()
+    for i in range(size):
+        state = STATES[i % len(STATES)]
+        history.append(state, STATES[(i + 1) % len(STATES)], "llm_decision_use_tool", {"tool": f"tool{i % 7}"})
+    return history
+
+
+def run(sizes=SIZES, repeat: int = 3) -> list[dict]:
+    results = []
+    for size in sizes:
+        history = make_history(size)
+        mermaid_code = step_history_to_flow_diagram(history)
+        results.append({
+            "benchmark": "mermaid",
+            "size": size,
+            "seconds": best_of(lambda: mermaid_to_link(step_history_to_flow_diagram(history)), repeat),
+            "diagram_seconds": best_of(lambda: step_history_to_flow_diagram(history), repeat),
+            "link_seconds": best_of(lambda: mermaid_to_link(mermaid_code), repeat),
+        })
+    return results
+
+
+def main():
+    for result in run():
+        print(
+            f"{result['size']:>7} steps  diagram {result['diagram_seconds'] * 1000:9.3f} ms"
+            f"  link {result['link_seconds'] * 1000:9.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark for planning prompt assembly.
+
+Compares PromptBuilder, which renders the static sections once, against
+nesting include_context/include_response_format/include_tools on every call.
+
+    uv run python -m benchmarks.bench_prompt_build
+"""
+from infra_fail_mngr.prompts import (
+    PromptBuilder,
+    get_system_prompt,
+    include_context,
+    include_response_format,
+    include_tools,
+)
+from infra_fail_mngr.tools import AgentTools, SystemTools
+
+from .timing import best_of
+
+SIZES = [1, 10, 100, 1_000]
+CALLS = 100
+
+
+def make_context(size: int) -> dict:
+    nodes = [f"node{i}" for i in range(size)]
+    return {
+        "failures": nodes,
+        "impact_report": {node: {"population_affected": 5000, "criticality": "High"} for node in nodes},
+        "conversation_history": [{"role": "tool_output", "tool": "get_available_crews", "result": ["crew1", "crew2"]}],
+    }
+
+
+def _tool_descriptions() -> str:
+    system_tools = SystemTools(repo=None)
+    return AgentTools(repo=None, additional_tools=[system_tools.assign_repair_crew]).get_tool_descriptions()
+
+
+def _nested(system_prompt: str, context: dict, tool_descriptions: str) -> str:
+    return include_tools(include_response_format(include_context(system_prompt, context)), tool_descriptions)
+
+
+def run(sizes=SIZES, calls: int = CALLS, repeat: int = 3) -> list[dict]:
+    system_prompt = get_system_prompt()
+    tool_descriptions = _tool_descriptions()
+    builder = PromptBuilder(system_prompt, tool_descriptions)
+
+    results = []
+    for size in sizes:
+        context = make_context(size)
+
+        def nested():
+            for _ in range(calls):
+                _nested(system_prompt, context, tool_descriptions)
+
+        def cached():
+            for _ in range(calls):
+                builder.build(context)
+
+        results.append({
+            "benchmark": "prompt_build",
+            "size": size,
+            "calls": calls,
+            "seconds": best_of(cached, repeat),
+            "legacy_seconds": best_of(nested, repeat),
+            "prefix_boundary": builder.prefix_boundary,
+        })
+    return results
+
+
+def main():
+    for result in run():
+        print(
+            f"{result['size']:>6} nodes  builder {result['seconds'] * 1000:9.3f} ms"
+            f"  nested {result['legacy_seconds'] * 1000:9.3f} ms  per {result['calls']} calls"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Micro-benchmark for AgentTools construction and get_tool_descriptions, done once per agent.
+
+    uv run python -m benchmarks.bench_tool_descriptions
+"""
+from infra_fail_mngr.tools import AgentTools, SystemTools
+
+from .timing import best_of
+
+CALLS = 1_000
+
+
+def run(calls: int = CALLS, repeat: int = 3) -> list[dict]:
+    system_tools = SystemTools(repo=None)
+
+    def describe():
+        for _ in range(calls):
+            AgentTools(repo=None, additional_tools=[system_tools.assign_repair_crew]).get_tool_descriptions()
+
+    return [{
+        "benchmark": "tool_descriptions",
+        "size": 1,
+        "calls": calls,
+        "seconds": best_of(describe, repeat),
+    }]
+
+
+def main():
+    for result in run():
+        print(f"get_tool_descriptions  {result['seconds'] * 1000:9.3f} ms  per {result['calls']} agents")
+
+
+if __name__ == "__main__":
+    main()
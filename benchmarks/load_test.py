@@ -0,0 +1,109 @@
+"""
+Load test of the agent against the simulated infrastructure.
+
+Generates a topology, then runs one incident per round: the agent detects the
+failures, analyses their impact and dispatches crews, then the simulation
+advances and failures cascade. The LLM is replaced by a dispatcher assigning
+the unattended failures to the available crews, so that the measured time is
+the agent's own and the repositories'.
+
+    uv run python -m benchmarks.load_test --nodes 50000 --crews 500 --failures 200 --rounds 10
+    uv run python -m benchmarks.load_test --latency 0.002 --jitter 0.003
+"""
+import argparse
+import json
+import os
+import time
+
+from infra_fail_mngr.agent import DEFAULT_MAX_IN_MEMORY, InfraAgent, StepHistory
+from infra_fail_mngr.llm import LLMServiceImpl
+from infra_fail_mngr.llm.llm_client import LLMClient
+from infra_fail_mngr.simulation import InfraSimulator, Topology
+from infra_fail_mngr.tools import AgentTools, SystemTools
+
+
+class DispatcherClient(LLMClient):
+    """Scripted LLM pairing the unattended failures with the available crews, in order."""
+
+    def __init__(self, simulator: InfraSimulator):
+        self.simulator = simulator
+
+    def generate(self, system_prompt: str) -> str:
+        in_repair = set(self.simulator.nodes_in_repair())
+        nodes = [node for node in self.simulator.get_failed_nodes() if node not in in_repair]
+        crews = self.simulator.get_available_crews()[:len(nodes)]
+        return json.dumps({
+            "thoughts": "Send the available crews to the unattended failures",
+            "action": "assign_repair_crew",
+            "arguments": {"node_ids": nodes[:len(crews)], "crew_ids": crews},
+        })
+
+
+def make_agent(simulator: InfraSimulator, spill_path: str = None) -> InfraAgent:
+    system_tools = SystemTools(simulator)
+    agent_tools = AgentTools(simulator, [system_tools.assign_repair_crew])
+    step_history = StepHistory(DEFAULT_MAX_IN_MEMORY, spill_path)
+    llm_service = LLMServiceImpl(DispatcherClient(simulator))
+    agent = InfraAgent(llm_service, system_tools, agent_tools, step_history=step_history)
+    agent.max_steps = 50
+    return agent
+
+
+def run(nodes: int, crews: int, failures: int, rounds: int, minutes: float, latency: float = 0.0,
+        jitter: float = 0.0, seed: int = 0, spill_dir: str = None) -> list[dict]:
+    start = time.perf_counter()
+    topology = Topology.generate(num_nodes=nodes, num_depots=max(crews // 10, 1), seed=seed)
+    generation = time.perf_counter() - start
+
+    simulator = InfraSimulator(topology, num_crews=crews, initial_failures=failures, latency=latency,
+                               jitter=jitter, seed=seed)
+    results = []
+    for round_number in range(rounds):
+        spill_path = os.path.join(spill_dir, f"round-{round_number}.jsonl") if spill_dir else None
+        agent = make_agent(simulator, spill_path)
+        start = time.perf_counter()
+        agent.run_to_completion()
+        seconds = time.perf_counter() - start
+        agent.step_history.close()
+        steps = len(agent.step_history)
+        progress = simulator.advance(minutes)
+        results.append({
+            "round": round_number,
+            "nodes": nodes,
+            "generation_seconds": generation,
+            "seconds": seconds,
+            "step_seconds": seconds / max(steps, 1),
+            "steps": steps,
+            "repaired": len(progress["repaired"]),
+            "cascaded": len(progress["cascaded"]),
+            **simulator.stats(),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--crews", type=int, default=200)
+    parser.add_argument("--failures", type=int, default=100, help="Nodes failed at the start")
+    parser.add_argument("--rounds", type=int, default=10, help="Incidents to run")
+    parser.add_argument("--minutes", type=float, default=60, help="Simulated minutes between incidents")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every repository call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to the latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spill-dir", help="Directory receiving the steps pushed out of each agent's memory")
+    args = parser.parse_args()
+
+    results = run(args.nodes, args.crews, args.failures, args.rounds, args.minutes, args.latency, args.jitter,
+                  args.seed, args.spill_dir)
+    print(f"topology of {args.nodes} nodes generated in {results[0]['generation_seconds']:.2f}s")
+    for result in results:
+        print(
+            f"round {result['round']:>3}  {result['seconds'] * 1000:9.1f} ms  {result['steps']:>3} steps"
+            f"  {result['failed_nodes']:>6} failed  {result['busy_crews']:>5} busy crews"
+            f"  +{result['cascaded']} cascaded  -{result['repaired']} repaired"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark harness: runs every benchmark, writes the results as JSON and compares them against a baseline.
+
+    uv run python -m benchmarks.run --output results.json
+    uv run python -m benchmarks.run --baseline benchmarks/baseline.json
+    uv run python -m benchmarks.run --max-size 1000 --only agent,mermaid
+
+Exits with status 1 when a result regressed past the tolerance, so it can gate CI.
+"""
+import argparse
+import json
+import platform
+import sys
+from typing import Callable, Dict, List, Optional
+
+from . import (
+    bench_agent,
+    bench_compact_context,
+    bench_impact,
+    bench_limit_context,
+    bench_mermaid,
+    bench_prompt_build,
+    bench_tool_descriptions,
+)
+
+SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+# Work per measurement shrinks with the size, so that the largest sizes still finish in seconds
+WORK_BUDGET = 10_000
+# Differences below this many seconds are timer noise, never regressions
+NOISE_FLOOR = 1e-4
+
+
+def _scaled(calls: int, size: int) -> int:
+    return max(1, min(calls, WORK_BUDGET // max(size, 1)))
+
+
+# Each suite runs one size, tool_descriptions doesn't depend on it and only runs once
+SUITES: Dict[str, Callable[[int, int], List[dict]]] = {
+    "agent": lambda size, repeat: bench_agent.run([size], incidents=_scaled(bench_agent.INCIDENTS, size), repeat=repeat),
+    "limit_context": lambda size, repeat: bench_limit_context.run([size], repeat=repeat),
+    "prompt_build": lambda size, repeat: bench_prompt_build.run(
+        [size], calls=_scaled(bench_prompt_build.CALLS, size), repeat=repeat
+    ),
+    "compact_context": lambda size, repeat: bench_compact_context.run(
+        [size], calls=_scaled(bench_compact_context.CALLS, size), repeat=repeat
+    ),
+    "impact": lambda size, repeat: bench_impact.run([size], repeat=repeat),
+    "mermaid": lambda size, repeat: bench_mermaid.run([size], repeat=repeat),
+    "tool_descriptions": lambda size, repeat: bench_tool_descriptions.run(repeat=repeat),
+}
+SIZE_INDEPENDENT = {"tool_descriptions"}
+
+
+def run(suites: List[str], sizes: List[int], repeat: int = 3) -> List[dict]:
+    results = []
+    for suite in suites:
+        for size in sizes[:1] if suite in SIZE_INDEPENDENT else sizes:
+            for result in SUITES[suite](size, repeat):
+                print(f"{_key_label(result):<55} {result['seconds'] * 1000:12.3f} ms", file=sys.stderr)
+                results.append(result)
+    return results
+
+
+def _is_metric(field: str) -> bool:
+    return (
+        field.endswith(("seconds", "per_second", "chars"))
+        or field in ("calls", "incidents", "prefix_boundary")
+    )
+
+
+def result_key(result: dict) -> tuple:
+    """
+    Identity of a result across runs: its benchmark, size and variant fields, without the measurements.
+    """
+    return tuple(sorted((field, value) for field, value in result.items() if not _is_metric(field)))
+
+
+def _key_label(result: dict) -> str:
+    return " ".join(f"{field}={value}" for field, value in result_key(result))
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[dict]:
+    """
+    Return the regressions of the results against the baseline.
+
+    Times ("*seconds") regress when they grow by more than the tolerance, throughputs ("*per_second") when
+    they drop by more than it. Results absent from the baseline are skipped.
+
+    Args:
+        results (List[dict]): Results of this run.
+        baseline (List[dict]): Results of the baseline run.
+        tolerance (float): Allowed relative change, e.g. 0.25 for 25%.
+
+    Returns:
+        List[dict]: One {"key", "metric", "baseline", "current", "change"} entry per regression.
+    """
+    by_key = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        reference = by_key.get(result_key(result))
+        if reference is None:
+            continue
+        for metric, current in result.items():
+            previous = reference.get(metric)
+            if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)) or not previous:
+                continue
+            if metric.startswith("legacy_"):
+                # Reference implementations kept for comparison, not the code under test
+                continue
+            if metric.endswith("per_second"):
+                regressed = current < previous / (1 + tolerance)
+            elif metric.endswith("seconds"):
+                regressed = current > previous * (1 + tolerance) and current - previous > NOISE_FLOOR
+            else:
+                continue
+            if regressed:
+                regressions.append({
+                    "key": _key_label(result),
+                    "metric": metric,
+                    "baseline": previous,
+                    "current": current,
+                    "change": current / previous - 1,
+                })
+    return regressions
+
+
+def _load(path: str) -> List[dict]:
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="Comma-separated suites to run, among: " + ", ".join(SUITES))
+    parser.add_argument("--sizes", help="Comma-separated sizes, defaults to " + ",".join(map(str, SIZES)))
+    parser.add_argument("--max-size", type=int, help="Skip the sizes above this one")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the fastest is kept")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against the results stored in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown, default 0.25")
+    args = parser.parse_args(argv)
+
+    suites = args.only.split(",") if args.only else list(SUITES)
+    unknown = [suite for suite in suites if suite not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else SIZES
+    if args.max_size is not None:
+        sizes = [size for size in sizes if size <= args.max_size]
+
+    results = run(suites, sizes, args.repeat)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        regressions = compare(results, _load(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['key']} {regression['metric']}: "
+                f"{regression['baseline']:.6g} -> {regression['current']:.6g} ({regression['change']:+.0%})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+        print(f"No regression against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
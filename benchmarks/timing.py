@@ -0,0 +1,12 @@
+import time
+from typing import Callable
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    """Return the fastest of `repeat` runs of `func`, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
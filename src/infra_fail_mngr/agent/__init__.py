@@ -1 +1,4 @@
 from .agent import InfraAgent
+from .async_agent import AsyncInfraAgent
+from .step_history import DEFAULT_MAX_IN_MEMORY, StepHistory, StepRecord
+from .checkpoint import SQLiteCheckpointStore
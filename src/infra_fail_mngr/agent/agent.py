@@ -1,26 +1,44 @@
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from ..llm.llm_service import LLMService
+from ..logs import get_logger
 from ..prompts.system_prompts import get_system_prompt
 from ..states import State
-from ..tools import SystemTools, AgentTools
+from ..tools import SystemTools, AgentTools, DecisionValidator
+from ..tracing import NOOP_TRACER, Tracer
 from ..vis import mermaid_to_link, step_history_to_flow_diagram
+from .checkpoint import SQLiteCheckpointStore
+from .step_history import DEFAULT_MAX_IN_MEMORY, StepHistory
+
+logger = get_logger("agent")
 
 
 class InfraAgent:
-    def __init__(self, llm_service: LLMService, system_tools: SystemTools, agent_tools: AgentTools):
+    def __init__(self, llm_service: LLMService, system_tools: SystemTools, agent_tools: AgentTools,
+                 step_history: StepHistory = None, checkpointer: SQLiteCheckpointStore = None,
+                 decision_validator: DecisionValidator = None, tracer: Tracer = None):
         self.llm_service = llm_service
         self.sys = system_tools
         self.tools = agent_tools
         self.max_steps = 10
         self.max_history_size = 5
         self.max_retries = 3
+        self.max_parallel_tools = 8
+        # Requires an llm_service implementing StreamingLLMService
+        self.stream_decisions = False
         self.tool_descriptions = self.tools.get_tool_descriptions()
 
         self.state = State.INIT
         self.memory = {}
         self.retry_count = 0
-        self.step_history = []
+        # Bounded by default, older steps are dropped unless the given history spills them to a file
+        self.step_history = step_history if step_history is not None else StepHistory(DEFAULT_MAX_IN_MEMORY)
+        self.checkpointer = checkpointer
+        # Rejects malformed decisions before any tool runs, with the precise error fed back to the LLM
+        self.decision_validator = decision_validator
+        self.tracer = tracer if tracer is not None else NOOP_TRACER
 
     def run_to_completion(self):
         step = 0
@@ -29,159 +47,348 @@ class InfraAgent:
             step += 1
 
     def _transition_state(self, to_state: State, action: str, data: dict = None):
-        self.step_history.append({
-            "from_state": self.state.name,
-            "to_state": to_state.name,
-            "action": action,
-            "data": data or {}
-        })
+        self.step_history.append(self.state.name, to_state.name, action, data)
         self.state = to_state
 
     def run_step(self):
-        print(f"--- STATE: {self.state.name} ---")
-
-        if self.state == State.INIT:
-            self.memory = {
-                "failures": [],
-                "impact_report": {},
-                "plan_history": []
-            }
-            self._transition_state(State.FAILURE_DETECTION, "initialize", {})
-            return
-
-        elif self.state == State.FAILURE_DETECTION:
-            failures = self.sys.detect_failure_nodes()
-
-            if not failures:
-                print("[SYSTEM] No failures detected. System Healthy.")
-                self._transition_state(State.FINAL, "no_failures_detected", {})
-            else:
-                self.memory['failures'] = failures
-                print(f"[SYSTEM] Detected: {failures}")
-                self._transition_state(State.IMPACT_ANALYSIS, "failures_detected", {"failures": failures})
-            return
-
-        elif self.state == State.IMPACT_ANALYSIS:
-            report = {}
-            for node in self.memory['failures']:
-                report[node] = self.sys.estimate_impact(node_id=node)
-
-            self.memory['impact_report'] = report
-            self._transition_state(State.REPAIR_PLANNING, "impact_analyzed", {"impact_report": report})
-            return
-
-        elif self.state == State.REPAIR_PLANNING:
-            success = self.handle_planning_step()
-            if not success:
-                self.retry_count += 1
-                if self.retry_count >= self.max_retries:
-                    print(f"[ERROR] Max retries ({self.max_retries}) reached. Transitioning to FINAL state.")
-                    self._transition_state(State.FINAL, "max_retries_reached", {"retry_count": self.retry_count})
-            else:
-                self.retry_count = 0
-            return
-
-        elif self.state == State.EXECUTION:
-            pending = self.memory.get('pending_action', {})
-            args = pending.get('arguments', {})
-
-            print(f"[EXECUTION] Dispatching Crews: {args}")
-            result = self.sys.assign_repair_crew(**args)
-
-            self.memory['execution_result'] = result
-
-            details = result.get('details', {})
-            failed_nodes = [node for node, status in details.items() if status == "Failed"]
-
-            if failed_nodes:
-                print(f"[EXECUTION] Some assignments failed: {failed_nodes}")
-                self.memory['failures'] = failed_nodes
-                self.memory['plan_history'].append({
-                    "role": "execution_result",
-                    "message": f"Assignment failed for nodes: {failed_nodes}",
-                    "details": details
-                })
-                self._transition_state(State.REPAIR_PLANNING, "assignments_failed", {
-                    "failed_nodes": failed_nodes,
-                    "details": details
-                })
-            else:
-                print("[EXECUTION] All assignments succeeded")
-                self._transition_state(State.RESCHEDULING, "assignments_succeeded", {"details": details})
-            return
+        logger.info("--- STATE: %s ---", self.state.name)
 
-        elif self.state == State.RESCHEDULING:
-            existing_failures = self.memory['failures'] if self.memory else []
-            new_failures = [node for node in self.sys.detect_failure_nodes() if node not in existing_failures]
+        with self.tracer.span(f"state.{self.state.name}"):
+            if self.state == State.INIT:
+                self._initialize()
 
-            if new_failures:
-                print(f"[ALERT] Cascading failures detected: {new_failures}")
-                self._transition_state(State.FAILURE_DETECTION, "cascading_failures", {"new_failures": new_failures})
-            else:
-                print("[SUCCESS] Nothing new, good to proceed with the repairs")
-                self._transition_state(State.FINAL, "repairs_completed", {})
-            return
+            elif self.state == State.FAILURE_DETECTION:
+                self._on_failures_detected(self.sys.detect_failure_nodes_since(cursor=None))
+
+            elif self.state == State.IMPACT_ANALYSIS:
+                self._on_impact_analyzed(self.sys.estimate_impact_batch(node_ids=self._unanalyzed_failures()))
+
+            elif self.state == State.REPAIR_PLANNING:
+                self._on_planning_result(self.handle_planning_step())
+
+            elif self.state == State.EXECUTION:
+                args = self._pending_assignment()
+                self._on_execution_result(self.sys.assign_repair_crew(**args))
+
+            elif self.state == State.RESCHEDULING:
+                self._on_rescheduled(self.sys.detect_failure_nodes_since(cursor=self.memory.get('failure_cursor')))
+
+        self._checkpoint()
+
+    def resume(self, checkpoint: dict):
+        """
+        Restore the state, memory, retry count and step history saved by a checkpoint store.
+
+        The next run_step continues from the last completed step, nothing already done is run again.
+        """
+        self.state = State[checkpoint["state"]]
+        self.memory = checkpoint["memory"]
+        self.retry_count = checkpoint["retry_count"]
+
+        self.step_history.close()
+        self.step_history = StepHistory(self.step_history.max_in_memory, self.step_history.spill_path)
+        self.step_history.dropped = checkpoint.get("step_count", len(checkpoint["steps"])) - len(checkpoint["steps"])
+        for step in checkpoint["steps"]:
+            self.step_history.append(step["from_state"], step["to_state"], step["action"], step["data"])
+
+    def notify_failures_changed(self, version: int = None):
+        """
+        Restart failure detection after the agent finished, when failure events changed the failed nodes.
+
+        While an incident is still being handled the change is picked up by the next RESCHEDULING scan.
+        Call it from the thread or event loop driving the agent, then run the agent again.
+        """
+        if self.state != State.FINAL:
+            return False
+        self.retry_count = 0
+        self._transition_state(State.FAILURE_DETECTION, "failure_events", {"version": version} if version else {})
+        return True
 
     def handle_planning_step(self):
+        if self.stream_decisions:
+            return self._handle_streamed_planning_step()
+
+        with self.tracer.span("llm.request"):
+            response = self.llm_service.handle_request(
+                get_system_prompt(),
+                self._planning_context(),
+                self.tool_descriptions,
+            )
+
+        try:
+            return self._on_decision(self._parse_decision(response))
+
+        except (ValueError, TypeError) as e:
+            return self._on_invalid_response(e)
+
+    def _handle_streamed_planning_step(self):
+        started = {}
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            def on_action(tool_name, args):
+                # Start the lookup while the rest of the response is still being generated
+                tool_func = self.tools.get_tool(tool_name) if tool_name != "assign_repair_crew" else None
+                if tool_func and isinstance(args, dict) and not self._validate({"action": tool_name, "arguments": args}):
+                    started[tool_name] = (args, executor.submit(self._run_tool, tool_name, tool_func, args, parent))
+
+            try:
+                with self.tracer.span("llm.request", stream=True) as parent:
+                    decision = self.llm_service.handle_request_stream(
+                        get_system_prompt(),
+                        self._planning_context(),
+                        self.tool_descriptions,
+                        on_action,
+                    )
+
+                error = self._validate(decision)
+                if error:
+                    return self._on_rejected_decision(error)
+
+                early = started.get(decision.get('action'))
+                if 'tool_calls' not in decision and early and early[0] == decision.get('arguments', {}):
+                    tool_name, args = self._read_decision(decision)
+                    return self._on_tool_result(tool_name, args, early[1].result())
+
+                return self._on_decision(decision)
+
+            except (ValueError, TypeError) as e:
+                return self._on_invalid_response(e)
+
+    @staticmethod
+    def _parse_decision(response):
+        # LLMServiceImpl returns the parsed decision, unless the response contains one of its legacy phrases
+        return response if isinstance(response, dict) else json.loads(response)
+
+    def _on_decision(self, decision):
+        error = self._validate(decision)
+        if error:
+            return self._on_rejected_decision(error)
+
+        if 'tool_calls' in decision:
+            calls = self._resolve_tool_calls(self._read_tool_calls(decision))
+            if not calls:
+                return False
+            return self._on_tool_results(calls, self._run_tool_calls(calls))
+
+        tool_name, args = self._read_decision(decision)
+
+        if tool_name == "assign_repair_crew":
+            # TERMINAL ACTION
+            return self._on_assign_decision(decision)
+
+        tool_func = self.tools.get_tool(tool_name)
+        if not tool_func:
+            return self._on_unknown_tool(tool_name)
+
+        return self._on_tool_result(tool_name, args, self._run_tool(tool_name, tool_func, args))
+
+    def _run_tool(self, tool_name, tool_func, args, parent=None):
+        with self.tracer.span(f"tool.{tool_name}", parent=parent):
+            return tool_func(**args)
+
+    def _validate(self, decision):
+        if self.decision_validator is None:
+            return None
+        return self.decision_validator.validate(decision)
+
+    def _run_tool_calls(self, calls):
+        if len(calls) == 1:
+            tool_name, args, tool_func = calls[0]
+            return [self._run_tool(tool_name, tool_func, args)]
+
+        # The calls are independent lookups, results come back in the order of the calls
+        parent = self.tracer.current()
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel_tools, len(calls))) as executor:
+            futures = [
+                executor.submit(self._run_tool, tool_name, tool_func, args, parent)
+                for tool_name, args, tool_func in calls
+            ]
+            return [future.result() for future in futures]
+
+    def _checkpoint(self):
+        if self.checkpointer is not None:
+            self.checkpointer.save(self)
+
+    # State handlers, shared with AsyncInfraAgent. They only update the agent, all I/O happens in the callers.
+
+    def _initialize(self):
+        self.memory = {
+            "failures": [],
+            "impact_report": {},
+            "plan_history": []
+        }
+        self._transition_state(State.FAILURE_DETECTION, "initialize", {})
+
+    def _on_failures_detected(self, detection):
+        # The cursor of the full scan, so that RESCHEDULING only asks for what changed since detection
+        self.memory['failure_cursor'] = detection.get('cursor')
+        failures = detection['failures']
+        if not failures:
+            logger.info("[SYSTEM] No failures detected. System Healthy.")
+            self._transition_state(State.FINAL, "no_failures_detected", {})
+        else:
+            self.memory['failures'] = failures
+            logger.info("[SYSTEM] Detected: %s", failures)
+            self._transition_state(State.IMPACT_ANALYSIS, "failures_detected", {"failures": failures})
+
+    def _unanalyzed_failures(self):
+        # After a cascade only the new failures are missing from the report
+        report = self.memory.get('impact_report', {})
+        return [node for node in self.memory['failures'] if node not in report]
+
+    def _on_impact_analyzed(self, report):
+        self.memory['impact_report'] = {**self.memory.get('impact_report', {}), **report}
+        self._transition_state(State.REPAIR_PLANNING, "impact_analyzed", {"impact_report": report})
+
+    def _on_planning_result(self, success):
+        if not success:
+            self.retry_count += 1
+            if self.retry_count >= self.max_retries:
+                logger.error("[ERROR] Max retries (%d) reached. Transitioning to FINAL state.", self.max_retries)
+                self._transition_state(State.FINAL, "max_retries_reached", {"retry_count": self.retry_count})
+        else:
+            self.retry_count = 0
+
+    def _pending_assignment(self):
+        pending = self.memory.get('pending_action', {})
+        args = pending.get('arguments', {})
+
+        logger.info("[EXECUTION] Dispatching Crews: %s", args)
+        return args
+
+    def _on_execution_result(self, result):
+        self.memory['execution_result'] = result
+
+        details = result.get('details', {})
+        failed_nodes = [node for node, status in details.items() if status == "Failed"]
+
+        if failed_nodes:
+            logger.warning("[EXECUTION] Some assignments failed: %s", failed_nodes)
+            self.memory['failures'] = failed_nodes
+            self.memory['plan_history'].append({
+                "role": "execution_result",
+                "message": f"Assignment failed for nodes: {failed_nodes}",
+                "details": details
+            })
+            self._transition_state(State.REPAIR_PLANNING, "assignments_failed", {
+                "failed_nodes": failed_nodes,
+                "details": details
+            })
+        else:
+            logger.info("[EXECUTION] All assignments succeeded")
+            self._transition_state(State.RESCHEDULING, "assignments_succeeded", {"details": details})
+
+    def _on_rescheduled(self, detection):
+        self.memory['failure_cursor'] = detection.get('cursor')
+        existing_failures = self.memory.get('failures', [])
+        known = set(existing_failures).union(self.memory.get('impact_report', {}))
+        new_failures = [node for node in dict.fromkeys(detection['failures']) if node not in known]
+
+        if new_failures:
+            logger.warning("[ALERT] Cascading failures detected: %s", new_failures)
+            # Straight to impact analysis, which only estimates the nodes missing from the report
+            self.memory['failures'] = existing_failures + new_failures
+            self._transition_state(State.IMPACT_ANALYSIS, "cascading_failures", {"new_failures": new_failures})
+        else:
+            logger.info("[SUCCESS] Nothing new, good to proceed with the repairs")
+            self._transition_state(State.FINAL, "repairs_completed", {})
+
+    def _planning_context(self):
         limited_history = self.memory['plan_history'][-self.max_history_size:] if self.memory['plan_history'] else []
 
-        context = {
+        return {
             "failures": self.memory['failures'],
             "impact_report": self.memory['impact_report'],
             "conversation_history": limited_history
         }
 
-        response_str = self.llm_service.handle_request(
-            get_system_prompt(),
-            context,
-            self.tool_descriptions,
-        )
+    def _read_decision(self, decision):
+        tool_name = decision.get('action')
+        args = decision.get('arguments', {})
 
-        try:
-            decision = json.loads(response_str)
-            tool_name = decision.get('action')
-            args = decision.get('arguments', {})
+        logger.info("[LLM DECISION] %s with %s", tool_name, args)
+        return tool_name, args
+
+    def _read_tool_calls(self, decision):
+        tool_calls = decision['tool_calls']
+        if not isinstance(tool_calls, list) or not tool_calls:
+            raise ValueError("'tool_calls' must be a non-empty list")
 
-            print(f"[LLM DECISION] {tool_name} with {args}")
+        if not all(isinstance(call, dict) and call.get('action') for call in tool_calls):
+            raise ValueError("every tool call must name its 'action'")
 
-            if tool_name == "assign_repair_crew":
-                # TERMINAL ACTION
-                self.memory['pending_action'] = decision
-                self._transition_state(State.EXECUTION, "llm_decision_assign_crew", {
-                    "decision": decision
-                })
-                return True
+        calls = [(call['action'], call.get('arguments', {})) for call in tool_calls]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[LLM DECISION] %d tool calls: %s", len(calls), [tool_name for tool_name, _ in calls])
+        return calls
 
+    def _resolve_tool_calls(self, calls):
+        resolved = []
+        for tool_name, args in calls:
+            # Assignments change the system, they can't run alongside the lookups
+            tool_func = self.tools.get_tool(tool_name) if tool_name != "assign_repair_crew" else None
+            if not tool_func:
+                self._on_unknown_tool(tool_name)
             else:
-                tool_func = self.tools.get_tool(tool_name)
-                if tool_func:
-                    result = tool_func(**args)
-                    self.memory['plan_history'].append({
-                        "role": "tool_output",
-                        "tool": tool_name,
-                        "result": result
-                    })
-                    self._transition_state(self.state, "llm_decision_use_tool", {
-                        "tool": tool_name,
-                        "arguments": args,
-                        "result": result
-                    })
-                    return True
-                else:
-                    print(f"[ERROR] Unknown tool {tool_name}")
-                    self.memory['plan_history'].append({
-                        "role": "error",
-                        "message": f"Unknown tool: {tool_name}"
-                    })
-                    return False
+                resolved.append((tool_name, args, tool_func))
+        return resolved
 
-        except (ValueError, TypeError) as e:
-            print(f"[ERROR] Invalid JSON from LLM: {e}")
-            self.memory['plan_history'].append({
-                "role": "error",
-                "message": "Invalid JSON response from LLM"
-            })
-            return False
+    def _on_assign_decision(self, decision):
+        self.memory['pending_action'] = decision
+        self._transition_state(State.EXECUTION, "llm_decision_assign_crew", {
+            "decision": decision
+        })
+        return True
+
+    def _on_tool_result(self, tool_name, args, result):
+        self.memory['plan_history'].append({
+            "role": "tool_output",
+            "tool": tool_name,
+            "result": result
+        })
+        self._transition_state(self.state, "llm_decision_use_tool", {
+            "tool": tool_name,
+            "arguments": args,
+            "result": result
+        })
+        return True
+
+    def _on_tool_results(self, calls, results):
+        outputs = [
+            {"tool": tool_name, "arguments": args, "result": result}
+            for (tool_name, args, _), result in zip(calls, results)
+        ]
+        # One history entry for the whole batch, so that it counts once against max_history_size
+        self.memory['plan_history'].append({
+            "role": "tool_outputs",
+            "results": outputs
+        })
+        self._transition_state(self.state, "llm_decision_use_tools", {"tool_calls": outputs})
+        return True
+
+    def _on_unknown_tool(self, tool_name):
+        logger.warning("[ERROR] Unknown tool %s", tool_name)
+        self.memory['plan_history'].append({
+            "role": "error",
+            "message": f"Unknown tool: {tool_name}"
+        })
+        return False
+
+    def _on_rejected_decision(self, error):
+        logger.warning("[ERROR] Rejected LLM decision: %s", error)
+        self.memory['plan_history'].append({
+            "role": "error",
+            "message": error
+        })
+        return False
+
+    def _on_invalid_response(self, error):
+        logger.warning("[ERROR] Invalid JSON from LLM: %s", error)
+        self.memory['plan_history'].append({
+            "role": "error",
+            "message": "Invalid JSON response from LLM"
+        })
+        return False
 
     def get_summary(self):
         mermaid_code = step_history_to_flow_diagram(self.step_history)
@@ -192,4 +399,5 @@ class InfraAgent:
             "failures_detected": self.memory.get('failures', []),
             "execution_result": self.memory.get('execution_result'),
             "vis_url": mermaid_live_url,
+            "latency": self.tracer.latency_breakdown(),
         }
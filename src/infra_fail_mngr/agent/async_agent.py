@@ -0,0 +1,99 @@
+import asyncio
+import inspect
+
+from ..llm.llm_service import AsyncLLMService
+from ..prompts.system_prompts import get_system_prompt
+from ..states import State
+from ..tools import AsyncSystemTools, AsyncAgentTools, DecisionValidator
+from ..tracing import Tracer
+from .agent import InfraAgent, logger
+from .checkpoint import SQLiteCheckpointStore
+from .step_history import StepHistory
+
+
+class AsyncInfraAgent(InfraAgent):
+    """
+    InfraAgent driven by coroutines, so one event loop can run many incidents concurrently.
+
+    The state machine is the one of InfraAgent, only the LLM, tool and repository calls are awaited.
+    """
+
+    def __init__(self, llm_service: AsyncLLMService, system_tools: AsyncSystemTools, agent_tools: AsyncAgentTools,
+                 step_history: StepHistory = None, checkpointer: SQLiteCheckpointStore = None,
+                 decision_validator: DecisionValidator = None, tracer: Tracer = None):
+        super().__init__(llm_service, system_tools, agent_tools, step_history, checkpointer, decision_validator, tracer)
+
+    async def run_to_completion(self):
+        step = 0
+        while self.state != State.FINAL and step < self.max_steps:
+            await self.run_step()
+            step += 1
+
+    async def run_step(self):
+        logger.info("--- STATE: %s ---", self.state.name)
+
+        with self.tracer.span(f"state.{self.state.name}"):
+            if self.state == State.INIT:
+                self._initialize()
+
+            elif self.state == State.FAILURE_DETECTION:
+                self._on_failures_detected(await self.sys.detect_failure_nodes_since(cursor=None))
+
+            elif self.state == State.IMPACT_ANALYSIS:
+                self._on_impact_analyzed(await self.sys.estimate_impact_batch(node_ids=self._unanalyzed_failures()))
+
+            elif self.state == State.REPAIR_PLANNING:
+                self._on_planning_result(await self.handle_planning_step())
+
+            elif self.state == State.EXECUTION:
+                args = self._pending_assignment()
+                self._on_execution_result(await self.sys.assign_repair_crew(**args))
+
+            elif self.state == State.RESCHEDULING:
+                self._on_rescheduled(await self.sys.detect_failure_nodes_since(cursor=self.memory.get('failure_cursor')))
+
+        self._checkpoint()
+
+    async def handle_planning_step(self):
+        with self.tracer.span("llm.request"):
+            response = await self.llm_service.handle_request(
+                get_system_prompt(),
+                self._planning_context(),
+                self.tool_descriptions,
+            )
+
+        try:
+            decision = self._parse_decision(response)
+            error = self._validate(decision)
+            if error:
+                return self._on_rejected_decision(error)
+
+            if 'tool_calls' in decision:
+                calls = self._resolve_tool_calls(self._read_tool_calls(decision))
+                if not calls:
+                    return False
+                results = await asyncio.gather(*(self._call_tool(tool_name, tool_func, args) for tool_name, args, tool_func in calls))
+                return self._on_tool_results(calls, list(results))
+
+            tool_name, args = self._read_decision(decision)
+
+            if tool_name == "assign_repair_crew":
+                # TERMINAL ACTION
+                return self._on_assign_decision(decision)
+
+            tool_func = self.tools.get_tool(tool_name)
+            if not tool_func:
+                return self._on_unknown_tool(tool_name)
+
+            return self._on_tool_result(tool_name, args, await self._call_tool(tool_name, tool_func, args))
+
+        except (ValueError, TypeError) as e:
+            return self._on_invalid_response(e)
+
+    async def _call_tool(self, tool_name, tool_func, args):
+        with self.tracer.span(f"tool.{tool_name}"):
+            result = tool_func(**args)
+            # Additional tools may still be plain functions
+            if inspect.isawaitable(result):
+                result = await result
+            return result
@@ -0,0 +1,193 @@
+import json
+import queue
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_state (
+    incident_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    retry_count INTEGER NOT NULL,
+    memory TEXT NOT NULL,
+    step_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    incident_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    from_state TEXT NOT NULL,
+    to_state TEXT NOT NULL,
+    action TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (incident_id, position)
+);
+"""
+
+_STOP = object()
+
+
+class SQLiteCheckpointStore:
+    """
+    Checkpoints of an agent in a SQLite file, one row of agent state per incident plus one row per step.
+
+    Saving is incremental, only the steps recorded since the previous save are inserted. The snapshot is taken
+    synchronously, so the agent can carry on mutating its memory, and written by a background thread.
+    """
+
+    def __init__(self, path: str, incident_id: str = "default", background: bool = True):
+        """
+        Args:
+            path (str): SQLite database file, ":memory:" is only usable with background=False.
+            incident_id (str): Key of the checkpoints, several incidents can share a database.
+            background (bool): Write on a dedicated thread, otherwise write within save().
+        """
+        self.path = path
+        self.incident_id = incident_id
+        self._saved_steps = 0
+        self._connection = None
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+        # The schema is created up front, so that the writer thread and load() never race to create it
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+
+        if background:
+            connection.close()
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+            self._writer.start()
+        else:
+            self._connection = connection
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def save(self, agent) -> None:
+        """
+        Snapshot the agent and queue the write of its state and new steps.
+        """
+        history = agent.step_history
+        step_count = len(history)
+        steps = [
+            (self.incident_id, position, step["from_state"], step["to_state"], step["action"],
+             json.dumps(step["data"], default=str))
+            for position, step in self._new_steps(history, step_count)
+        ]
+        state = (self.incident_id, agent.state.name, agent.retry_count, json.dumps(agent.memory, default=str), step_count)
+        self._saved_steps = step_count
+
+        if self._queue is None:
+            self._write(self._connection, state, steps)
+        else:
+            if self._error is not None:
+                raise RuntimeError("checkpoint writer failed") from self._error
+            self._queue.put((state, steps))
+
+    def _new_steps(self, history, step_count):
+        if step_count < self._saved_steps:
+            # The agent restarted with a fresh history, rewrite it
+            self._saved_steps = 0
+        for position in range(self._saved_steps, step_count):
+            try:
+                yield position, history[position]
+            except IndexError:
+                # Dropped from a bounded history before it could be saved
+                continue
+
+    def _write(self, connection: sqlite3.Connection, state, steps) -> None:
+        with connection:
+            if steps and steps[0][1] == 0:
+                connection.execute("DELETE FROM steps WHERE incident_id = ?", (self.incident_id,))
+            connection.executemany("INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?)", steps)
+            connection.execute("INSERT OR REPLACE INTO agent_state VALUES (?, ?, ?, ?, ?)", state)
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is _STOP:
+                        return
+                    if self._error is None:
+                        self._write(connection, *item)
+                except Exception as e:
+                    self._error = e
+                finally:
+                    self._queue.task_done()
+        finally:
+            connection.close()
+
+    def flush(self) -> None:
+        """
+        Block until every queued checkpoint is written.
+        """
+        if self._queue is not None:
+            self._queue.join()
+        if self._error is not None:
+            raise RuntimeError("checkpoint writer failed") from self._error
+
+    def load(self) -> Optional[Dict]:
+        """
+        Return the last written checkpoint of the incident, or None if there is none.
+
+        Returns:
+            dict | None: A dictionary containing "state", "retry_count", "memory", "steps" and "step_count"
+                (steps dropped by a bounded history are counted but not stored), ready for InfraAgent.resume.
+        """
+        self.flush()
+        connection = self._connection or self._connect()
+        try:
+            row = connection.execute(
+                "SELECT state, retry_count, memory, step_count FROM agent_state WHERE incident_id = ?", (self.incident_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            steps = connection.execute(
+                "SELECT from_state, to_state, action, data FROM steps WHERE incident_id = ? ORDER BY position",
+                (self.incident_id,),
+            ).fetchall()
+        finally:
+            if connection is not self._connection:
+                connection.close()
+
+        state, retry_count, memory, step_count = row
+        # An agent resumed from this checkpoint only has newer steps to save
+        self._saved_steps = step_count
+        return {
+            "state": state,
+            "retry_count": retry_count,
+            "memory": json.loads(memory),
+            "steps": _steps_from_rows(steps),
+            "step_count": step_count,
+        }
+
+    def close(self) -> None:
+        """
+        Write the pending checkpoints and release the database.
+        """
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "SQLiteCheckpointStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _steps_from_rows(rows) -> List[Dict]:
+    return [
+        {"from_state": from_state, "to_state": to_state, "action": action, "data": json.loads(data)}
+        for from_state, to_state, action, data in rows
+    ]
@@ -0,0 +1,134 @@
+import json
+import sys
+from collections import deque
+from typing import Any, Dict, Iterator, Optional
+
+# Steps an agent keeps in memory by default, enough for the flow diagram of a long incident
+DEFAULT_MAX_IN_MEMORY = 1000
+
+
+class StepRecord:
+    """
+    One state transition of the agent.
+
+    Records read like the dicts the agent used to store, `record["action"]` and `record.get("data")` both work.
+    """
+
+    __slots__ = ("from_state", "to_state", "action", "data")
+
+    def __init__(self, from_state: str, to_state: str, action: str, data: Optional[Dict] = None):
+        # State names and actions come from a small fixed vocabulary, interning shares one copy of each
+        self.from_state = sys.intern(from_state)
+        self.to_state = sys.intern(to_state)
+        self.action = sys.intern(action)
+        self.data = data or {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def to_dict(self) -> Dict:
+        return {"from_state": self.from_state, "to_state": self.to_state, "action": self.action, "data": self.data}
+
+    @classmethod
+    def from_dict(cls, step: Dict) -> "StepRecord":
+        return cls(step["from_state"], step["to_state"], step["action"], step.get("data"))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, StepRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"StepRecord({self.from_state} -> {self.to_state}, {self.action!r})"
+
+
+class StepHistory:
+    """
+    Append-only history of agent transitions, keeping only the most recent steps in memory.
+
+    Steps pushed out of the in-memory ring are appended to a JSONL spill file when one is given, and dropped
+    otherwise. Iterating reads the spilled steps back lazily, line by line, before the in-memory ones.
+    """
+
+    def __init__(self, max_in_memory: Optional[int] = None, spill_path: Optional[str] = None):
+        """
+        Args:
+            max_in_memory (int | None): Number of steps kept in memory, None keeps every step.
+            spill_path (str | None): JSONL file receiving the steps evicted from memory. It is truncated on first use.
+        """
+        self.max_in_memory = max_in_memory
+        self.spill_path = spill_path
+        self._recent: deque = deque(maxlen=max_in_memory)
+        self._spill_file = None
+        self.spilled = 0
+        self.dropped = 0
+
+    def append(self, from_state: str, to_state: str, action: str, data: Optional[Dict] = None) -> StepRecord:
+        """
+        Record a transition, evicting the oldest in-memory step if the ring is full.
+        """
+        if self.max_in_memory is not None and len(self._recent) == self.max_in_memory:
+            self._evict(self._recent[0])
+        record = StepRecord(from_state, to_state, action, data)
+        self._recent.append(record)
+        return record
+
+    def _evict(self, record: StepRecord) -> None:
+        if self.spill_path is None:
+            self.dropped += 1
+            return
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, "a" if self.spilled else "w", encoding="utf-8")
+        self._spill_file.write(json.dumps(record.to_dict(), default=str))
+        self._spill_file.write("\n")
+        self.spilled += 1
+
+    def recent(self) -> Iterator[StepRecord]:
+        """
+        Iterate over the steps still held in memory, oldest first.
+        """
+        return iter(self._recent)
+
+    def __iter__(self) -> Iterator[StepRecord]:
+        if self.spilled:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+            with open(self.spill_path, encoding="utf-8") as spill_file:
+                for _, line in zip(range(self.spilled), spill_file):
+                    yield StepRecord.from_dict(json.loads(line))
+        yield from list(self._recent)
+
+    def __len__(self) -> int:
+        """
+        Number of recorded steps, including the spilled and dropped ones.
+        """
+        return self.dropped + self.spilled + len(self._recent)
+
+    def __getitem__(self, index: int) -> StepRecord:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("step history index out of range")
+
+        first_recent = size - len(self._recent)
+        if index >= first_recent:
+            return self._recent[index - first_recent]
+        if index < self.dropped:
+            raise IndexError(f"step {index} was dropped from the history")
+        for position, record in enumerate(self):
+            if position == index - self.dropped:
+                return record
+
+    def close(self) -> None:
+        """
+        Close the spill file, it is reopened in append mode if more steps get spilled.
+        """
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
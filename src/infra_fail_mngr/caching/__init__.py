@@ -0,0 +1,2 @@
+from .ttl_cache import TTLCache
+from .caching_agent_repository import CachingAgentRepository
@@ -0,0 +1,176 @@
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..domain import AgentRepository
+from .ttl_cache import TTLCache
+
+_MISSING = object()
+
+# Seconds each lookup stays cached, crew state changes the fastest
+DEFAULT_TTLS = {
+    "get_weather_at_location": 300,
+    "is_holiday": 24 * 3600,
+    "is_weekend": 24 * 3600,
+    "get_time_of_day": 24 * 3600,
+    "estimate_travel_time": 120,
+    "estimate_repair_time": 600,
+    "crew_location": 30,
+    "is_crew_available": 15,
+    "get_available_crews": 15,
+}
+
+
+class CachingAgentRepository(AgentRepository):
+    """
+    AgentRepository wrapper caching every lookup with a per-method TTL and LRU size bound.
+    """
+
+    def __init__(
+        self,
+        repo: AgentRepository,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            repo (AgentRepository): The repository to cache.
+            ttls (dict | None): Per-method TTLs in seconds, merged over DEFAULT_TTLS. A TTL of 0 disables
+                caching for that method, None caches until evicted.
+            max_size (int): Maximum number of entries cached per method.
+            clock (Callable): Monotonic time source, in seconds.
+        """
+        self.repo = repo
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.caches = {
+            method: TTLCache(max_size=max_size, ttl=ttl, clock=clock)
+            for method, ttl in self.ttls.items()
+            if ttl != 0
+        }
+
+    def _cached(self, method: str, *args) -> Any:
+        cache = self.caches.get(method)
+        if cache is None:
+            return getattr(self.repo, method)(*args)
+        return cache.get_or_compute(args, lambda: getattr(self.repo, method)(*args))
+
+    def _cached_batch(self, method: str, keys: List[tuple], fetch: Callable[[List[tuple]], List[Any]]) -> List[Any]:
+        # Batch lookups share the entries of the single lookups, only the missing keys are fetched, in one call
+        cache = self.caches.get(method)
+        if cache is None:
+            return fetch(keys)
+        values = [cache.get(key, _MISSING) for key in keys]
+        missing = list(dict.fromkeys(key for key, value in zip(keys, values) if value is _MISSING))
+        if not missing:
+            return values
+        fetched = dict(zip(missing, fetch(missing)))
+        for key, value in fetched.items():
+            cache.set(key, value)
+        return [fetched[key] if value is _MISSING else value for key, value in zip(keys, values)]
+
+    def get_weather_at_location(self, location: str) -> int:
+        return self._cached("get_weather_at_location", location)
+
+    def is_holiday(self, date: datetime) -> bool:
+        return self._cached("is_holiday", date)
+
+    def is_weekend(self, date: datetime) -> bool:
+        return self._cached("is_weekend", date)
+
+    def get_time_of_day(self, hour: int) -> str:
+        return self._cached("get_time_of_day", hour)
+
+    def estimate_travel_time(self, origin: str, destination: str) -> int:
+        return self._cached("estimate_travel_time", origin, destination)
+
+    def estimate_travel_times(self, origins: List[str], destinations: List[str]) -> List[List[int]]:
+        keys = [(origin, destination) for origin in origins for destination in destinations]
+        values = self._cached_batch("estimate_travel_time", keys, self._fetch_travel_times)
+        width = len(destinations)
+        return [values[start:start + width] for start in range(0, len(values), width)]
+
+    def _fetch_travel_times(self, keys: List[tuple]) -> List[int]:
+        get_batch = getattr(self.repo, "estimate_travel_times", None)
+        if get_batch is None:
+            return [self.repo.estimate_travel_time(origin, destination) for origin, destination in keys]
+        # One call for the rectangle around the missing pairs
+        origins = list(dict.fromkeys(origin for origin, _ in keys))
+        destinations = list(dict.fromkeys(destination for _, destination in keys))
+        rows = get_batch(origins, destinations)
+        row_of = dict(zip(origins, rows))
+        column_of = {destination: column for column, destination in enumerate(destinations)}
+        return [row_of[origin][column_of[destination]] for origin, destination in keys]
+
+    def estimate_repair_time(self, node: str) -> int:
+        return self._cached("estimate_repair_time", node)
+
+    def estimate_repair_times(self, nodes: List[str]) -> List[int]:
+        return self._cached_batch("estimate_repair_time", [(node,) for node in nodes], self._fetch_repair_times)
+
+    def _fetch_repair_times(self, keys: List[tuple]) -> List[int]:
+        nodes = [node for node, in keys]
+        get_batch = getattr(self.repo, "estimate_repair_times", None)
+        if get_batch is None:
+            return [self.repo.estimate_repair_time(node) for node in nodes]
+        return list(get_batch(nodes))
+
+    def crew_location(self, crew_id: str) -> str:
+        return self._cached("crew_location", crew_id)
+
+    def is_crew_available(self, crew_id: str) -> bool:
+        return self._cached("is_crew_available", crew_id)
+
+    def get_available_crews(self) -> List[str]:
+        return self._cached("get_available_crews")
+
+    # Invalidation
+
+    def invalidate(self, method: Optional[str] = None, *args) -> None:
+        """
+        Drop cached lookups.
+
+        Args:
+            method (str | None): Method whose entries to drop, None drops everything.
+            *args: Arguments of the single entry to drop, all entries of the method are dropped without them.
+        """
+        if method is None:
+            for cache in self.caches.values():
+                cache.clear()
+            return
+
+        cache = self.caches.get(method)
+        if cache is None:
+            return
+        if args:
+            cache.invalidate(args)
+        else:
+            cache.clear()
+
+    def invalidate_crew(self, crew_id: str) -> None:
+        """
+        Drop everything cached about a crew's availability and location.
+        """
+        self.invalidate("is_crew_available", crew_id)
+        self.invalidate("crew_location", crew_id)
+        self.invalidate("get_available_crews")
+
+    def on_crew_assigned(self, node_id: str, crew_id: str) -> None:
+        """
+        Assignment listener for SystemTools, an assigned crew is no longer where or as available as cached.
+        """
+        self.invalidate_crew(crew_id)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the cache counters per method, plus their totals under "total".
+        """
+        per_method = {method: cache.stats() for method, cache in self.caches.items()}
+        total = {
+            key: sum(stats[key] for stats in per_method.values())
+            for key in ("hits", "misses", "evictions", "expirations", "size")
+        }
+        lookups = total["hits"] + total["misses"]
+        total["hit_rate"] = total["hits"] / lookups if lookups else 0.0
+        per_method["total"] = total
+        return per_method
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time to live.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_size (int): Maximum number of entries, the least recently used one is evicted past it.
+            ttl (float | None): Seconds an entry stays valid, None keeps entries until they are evicted.
+            clock (Callable): Monotonic time source, in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for the key, or `default` if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry when the cache is full.
+        """
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for the key, computing and storing it on a miss.
+
+        The lock is not held while computing, concurrent misses on the same key may compute it twice.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop the entry for the key, returning whether there was one.
+        """
+        with self._lock:
+            return self._entries.pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the hit/miss/eviction counters and the current size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,4 +1,4 @@
-from typing import List, Dict, Protocol, Any
+from typing import List, Dict, Protocol, Any, Optional, Tuple
 from datetime import datetime
 
 class SystemRepository(Protocol):
@@ -6,6 +6,15 @@ class SystemRepository(Protocol):
     def get_node_details(self, node_id: str) -> Dict[str, Any]: ...
     def assign_crew(self, node_id: str, crew_id: str) -> bool: ...
 
+# Optional capabilities of a SystemRepository. They are separate protocols so that repositories
+# subclassing SystemRepository don't inherit a stub, SystemTools falls back when they are missing.
+class BatchSystemRepository(SystemRepository, Protocol):
+    def get_node_details_batch(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]: ...
+
+class IncrementalSystemRepository(SystemRepository, Protocol):
+    # Nodes that failed after the cursor (every failed node for None) and the cursor to pass next time
+    def get_failed_nodes_since(self, cursor: Optional[str]) -> Tuple[List[str], str]: ...
+
 class AgentRepository(Protocol):
     def get_weather_at_location(self, location: str) -> int: ...
     def is_holiday(self, date: datetime) -> bool: ...
@@ -16,3 +25,33 @@ class AgentRepository(Protocol):
     def crew_location(self, crew_id: str) -> str: ...
     def is_crew_available(self, crew_id: str) -> bool: ...
     def get_available_crews(self) -> List[str]: ...
+
+class BatchAgentRepository(AgentRepository, Protocol):
+    # One row per origin, one column per destination
+    def estimate_travel_times(self, origins: List[str], destinations: List[str]) -> List[List[int]]: ...
+
+class BatchRepairTimeRepository(AgentRepository, Protocol):
+    # One repair time per node, in the order of the nodes
+    def estimate_repair_times(self, nodes: List[str]) -> List[int]: ...
+
+class AsyncSystemRepository(Protocol):
+    async def get_failed_nodes(self) -> List[str]: ...
+    async def get_node_details(self, node_id: str) -> Dict[str, Any]: ...
+    async def assign_crew(self, node_id: str, crew_id: str) -> bool: ...
+
+class AsyncBatchSystemRepository(AsyncSystemRepository, Protocol):
+    async def get_node_details_batch(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]: ...
+
+class AsyncIncrementalSystemRepository(AsyncSystemRepository, Protocol):
+    async def get_failed_nodes_since(self, cursor: Optional[str]) -> Tuple[List[str], str]: ...
+
+class AsyncAgentRepository(Protocol):
+    async def get_weather_at_location(self, location: str) -> int: ...
+    async def is_holiday(self, date: datetime) -> bool: ...
+    async def is_weekend(self, date: datetime) -> bool: ...
+    async def get_time_of_day(self, hour: int) -> str: ...
+    async def estimate_travel_time(self, origin: str, destination: str) -> int: ...
+    async def estimate_repair_time(self, node: str) -> int: ...
+    async def crew_location(self, crew_id: str) -> str: ...
+    async def is_crew_available(self, crew_id: str) -> bool: ...
+    async def get_available_crews(self) -> List[str]: ...
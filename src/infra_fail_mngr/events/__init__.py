@@ -0,0 +1,3 @@
+from .failure_events import FailureEvent, LocalEventSource
+from .failure_event_ingestor import FailureEventIngestor
+from .event_system_repository import EventDrivenSystemRepository
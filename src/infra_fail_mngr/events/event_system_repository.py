@@ -0,0 +1,39 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..domain import IncrementalSystemRepository, SystemRepository
+from .failure_event_ingestor import FailureEventIngestor
+
+
+class EventDrivenSystemRepository(IncrementalSystemRepository):
+    """
+    SystemRepository answering failure scans from ingested events instead of polling the backend.
+
+    Node details and crew assignments still go to the wrapped repository.
+    """
+
+    def __init__(self, repo: SystemRepository, ingestor: FailureEventIngestor):
+        """
+        Args:
+            repo (SystemRepository): The system backend.
+            ingestor (FailureEventIngestor): Source of the failed nodes.
+        """
+        self.repo = repo
+        self.ingestor = ingestor
+
+    def get_failed_nodes(self) -> List[str]:
+        return self.ingestor.get_failed_nodes()
+
+    def get_failed_nodes_since(self, cursor: Optional[str]) -> Tuple[List[str], str]:
+        return self.ingestor.get_failed_nodes_since(cursor)
+
+    def get_node_details(self, node_id: str) -> Dict[str, Any]:
+        return self.repo.get_node_details(node_id)
+
+    def get_node_details_batch(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        get_batch = getattr(self.repo, "get_node_details_batch", None)
+        if get_batch is None:
+            return {node_id: self.repo.get_node_details(node_id) for node_id in node_ids}
+        return get_batch(node_ids)
+
+    def assign_crew(self, node_id: str, crew_id: str) -> bool:
+        return self.repo.assign_crew(node_id, crew_id)
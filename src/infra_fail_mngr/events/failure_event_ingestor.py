@@ -0,0 +1,140 @@
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .failure_events import NODE_DOWN, FailureEvent, LocalEventSource
+
+
+class FailureEventIngestor:
+    """
+    Maintains the set of failed nodes from a stream of failure events.
+
+    Events are buffered and coalesced per node, the last status of a node wins, and applied once no new event
+    arrived for `debounce` seconds. Every flush that changes the failed set bumps a version and notifies the
+    listeners, flushes that leave the set unchanged (e.g. a node flapping down and up) are silent.
+    """
+
+    def __init__(self, source: Optional[LocalEventSource] = None, debounce: float = 0.0,
+                 initial_failures: Optional[List[str]] = None):
+        """
+        Args:
+            source (LocalEventSource | None): Event source to subscribe to, events can also be pushed with on_event.
+            debounce (float): Seconds of quiet to wait before applying buffered events, 0 applies them at once.
+            initial_failures (List[str] | None): Failed nodes known before the first event, e.g. from one full poll.
+        """
+        self.debounce = debounce
+        self.version = 0
+        self._failed: Dict[str, int] = dict.fromkeys(initial_failures or [], 0)
+        self._pending: Dict[str, str] = {}
+        self._listeners: List[Callable[[int], None]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._changed = threading.Condition()
+        self._unsubscribe = source.subscribe(self.on_event) if source is not None else None
+
+    def on_event(self, event: FailureEvent) -> None:
+        """
+        Buffer an event, the failed set is updated on the next flush.
+        """
+        with self._changed:
+            self._pending[event.node_id] = event.status
+            if self.debounce <= 0:
+                pending = True
+            else:
+                pending = False
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if pending:
+            self.flush()
+
+    async def consume(self, queue: asyncio.Queue) -> None:
+        """
+        Ingest the events of an asyncio queue until a None sentinel is received.
+        """
+        while True:
+            event = await queue.get()
+            try:
+                if event is None:
+                    self.flush()
+                    return
+                self.on_event(event)
+            finally:
+                queue.task_done()
+
+    def flush(self) -> bool:
+        """
+        Apply the buffered events now.
+
+        Returns:
+            bool: Whether the failed set changed.
+        """
+        with self._changed:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+
+            next_version = self.version + 1
+            changed = False
+            for node_id, status in pending.items():
+                if status == NODE_DOWN:
+                    if node_id not in self._failed:
+                        self._failed[node_id] = next_version
+                        changed = True
+                elif self._failed.pop(node_id, None) is not None:
+                    changed = True
+
+            if not changed:
+                return False
+            self.version = next_version
+            self._changed.notify_all()
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(next_version)
+        return True
+
+    def subscribe(self, listener: Callable[[int], None]) -> None:
+        """
+        Call `listener(version)` after every flush that changes the failed set.
+        """
+        self._listeners.append(listener)
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Block until the failed set changes past `version`.
+
+        Returns:
+            int | None: The new version, or None on timeout.
+        """
+        with self._changed:
+            if self._changed.wait_for(lambda: self.version > version, timeout):
+                return self.version
+            return None
+
+    def get_failed_nodes(self) -> List[str]:
+        with self._changed:
+            return list(self._failed)
+
+    def get_failed_nodes_since(self, cursor: Optional[str]) -> Tuple[List[str], str]:
+        """
+        Nodes that went down after the version in `cursor`, every failed node for None.
+        """
+        since = int(cursor) if cursor is not None else -1
+        with self._changed:
+            return [node for node, version in self._failed.items() if version > since], str(self.version)
+
+    def close(self) -> None:
+        """
+        Unsubscribe from the source and drop the buffered events.
+        """
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        with self._changed:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
@@ -0,0 +1,63 @@
+import threading
+import time
+from typing import Callable, List
+
+NODE_DOWN = "down"
+NODE_UP = "up"
+
+
+class FailureEvent:
+    """
+    A node going down or coming back up, as reported by monitoring.
+    """
+
+    __slots__ = ("node_id", "status", "timestamp")
+
+    def __init__(self, node_id: str, status: str, timestamp: float = None):
+        if status not in (NODE_DOWN, NODE_UP):
+            raise ValueError(f"Unknown node status: {status}")
+        self.node_id = node_id
+        self.status = status
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def __repr__(self) -> str:
+        return f"FailureEvent({self.node_id!r}, {self.status!r})"
+
+
+class LocalEventSource:
+    """
+    In-process publisher of failure events, subscribers are called synchronously on publish.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[FailureEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[FailureEvent], None]) -> Callable[[], None]:
+        """
+        Register a callback for every published event.
+
+        Returns:
+            Callable: Unsubscribes the callback when called.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, event: FailureEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(event)
+
+    def node_down(self, node_id: str) -> None:
+        self.publish(FailureEvent(node_id, NODE_DOWN))
+
+    def node_up(self, node_id: str) -> None:
+        self.publish(FailureEvent(node_id, NODE_UP))
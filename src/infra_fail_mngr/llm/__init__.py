@@ -1,2 +1,4 @@
-from .llm_client import LLMClientImpl
-from .llm_service import LLMServiceImpl
+from .llm_client import LLMClientImpl, AsyncLLMClientImpl, StreamingLLMClientImpl
+from .llm_service import LLMServiceImpl, AsyncLLMServiceImpl
+from .caching_llm_client import CachingLLMClient, AsyncCachingLLMClient
+from .context_packing import ContextPacker, estimate_tokens
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Pattern, Sequence
+
+from ..caching import TTLCache
+from .llm_client import AsyncLLMClient, LLMClient
+
+# ISO 8601 date-times, e.g. the report timestamps of monitoring data
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str, volatile_patterns: Sequence[Pattern] = ()) -> str:
+    """Normalize a prompt so that insignificant differences map to the same cache key.
+
+    Args:
+        prompt: The assembled prompt.
+        volatile_patterns: Patterns of values that change between otherwise
+            identical prompts, e.g. timestamps; every match is masked.
+
+    Returns:
+        The prompt with volatile values masked and whitespace runs collapsed.
+    """
+    for pattern in volatile_patterns:
+        prompt = pattern.sub("<volatile>", prompt)
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+class CachingLLMClient(LLMClient):
+    """LLMClient wrapper returning cached responses for repeated prompts.
+
+    Responses are kept in an in-memory LRU tier and, when a directory is
+    given, in an on-disk tier that survives restarts. Empty responses are
+    never cached.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        max_size: int = 256,
+        ttl: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+        max_disk_entries: int = 10000,
+        normalize: bool = False,
+        volatile_patterns: Sequence[Pattern] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache around a client.
+
+        Args:
+            client: The client generating the responses on a miss.
+            max_size: Maximum number of responses kept in memory.
+            ttl: Seconds a response stays valid in memory, None keeps it until evicted.
+            cache_dir: Directory of the on-disk tier, None disables it.
+            max_disk_entries: Maximum number of responses on disk, the oldest are removed past it.
+            normalize: Collapse whitespace before hashing the prompt.
+            volatile_patterns: Patterns masked before hashing the prompt, implies normalize.
+            clock: Monotonic time source of the in-memory TTL, in seconds.
+        """
+        self.client = client
+        self.memory = TTLCache(max_size=max_size, ttl=ttl, clock=clock)
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.normalize = normalize or bool(volatile_patterns)
+        self.volatile_patterns = tuple(volatile_patterns)
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk_lock = threading.Lock()
+        self._disk_keys: Dict[str, None] = {}
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".txt")]
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            self._disk_keys = dict.fromkeys(entry.name[:-4] for entry in entries)
+
+    def key_for(self, system_prompt: str) -> str:
+        """Return the cache key of a prompt.
+
+        Args:
+            system_prompt: The assembled prompt.
+
+        Returns:
+            The SHA-256 hex digest of the (normalized) prompt.
+        """
+        if self.normalize:
+            system_prompt = normalize_prompt(system_prompt, self.volatile_patterns)
+        return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+
+    def generate(self, system_prompt: str) -> str:
+        """Return the cached response for the prompt, generating it on a miss.
+
+        Args:
+            system_prompt: The formatted prompt to send to the LLM.
+
+        Returns:
+            The raw response string from the LLM.
+        """
+        key = self.key_for(system_prompt)
+        response = self._lookup(key)
+        if response is None:
+            self.misses += 1
+            response = self.client.generate(system_prompt)
+            self._store(key, response)
+        return response
+
+    def _lookup(self, key: str) -> Optional[str]:
+        response = self.memory.get(key)
+        if response is None and key in self._disk_keys:
+            response = self._read_disk(key)
+            if response is not None:
+                self.disk_hits += 1
+                self.memory.set(key, response)
+        return response
+
+    def _store(self, key: str, response: str) -> None:
+        if not response:
+            return
+        self.memory.set(key, response)
+        if self.cache_dir is not None:
+            self._write_disk(key, response)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".txt")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as cached:
+                return cached.read()
+        except OSError:
+            with self._disk_lock:
+                self._disk_keys.pop(key, None)
+            return None
+
+    def _write_disk(self, key: str, response: str) -> None:
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cached:
+            cached.write(response)
+        # Readers never see a partially written response
+        os.replace(temp_path, path)
+
+        with self._disk_lock:
+            self._disk_keys.pop(key, None)
+            self._disk_keys[key] = None
+            while len(self._disk_keys) > self.max_disk_entries:
+                oldest = next(iter(self._disk_keys))
+                del self._disk_keys[oldest]
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        """Drop every cached response, in memory and on disk."""
+        self.memory.clear()
+        with self._disk_lock:
+            for key in self._disk_keys:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._disk_keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache metrics.
+
+        Returns:
+            The in-memory tier counters, plus "disk_hits", "disk_size",
+            "misses" (calls to the wrapped client) and the overall "hit_rate".
+        """
+        memory = self.memory.stats()
+        memory_hits = memory["hits"]
+        lookups = memory_hits + self.disk_hits + self.misses
+        return {
+            "memory": memory,
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "disk_size": len(self._disk_keys),
+            "misses": self.misses,
+            "hit_rate": (memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+class AsyncCachingLLMClient(CachingLLMClient):
+    """CachingLLMClient around an AsyncLLMClient, see CachingLLMClient."""
+
+    def __init__(self, client: AsyncLLMClient, **kwargs):
+        """Initialize the cache around an async client.
+
+        Args:
+            client: The async client generating the responses on a miss.
+            **kwargs: The options of CachingLLMClient.
+        """
+        super().__init__(client, **kwargs)
+
+    async def generate(self, system_prompt: str) -> str:
+        """Return the cached response for the prompt, awaiting the client on a miss."""
+        key = self.key_for(system_prompt)
+        response = self._lookup(key)
+        if response is None:
+            self.misses += 1
+            response = await self.client.generate(system_prompt)
+            self._store(key, response)
+        return response
@@ -0,0 +1,190 @@
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from .context_trimming import trim_history
+
+Tokenizer = Callable[[str], int]
+
+_TRUNCATED = "... [truncated]"
+
+# Roles carrying feedback the next decision depends on, kept before plain tool outputs
+_ROLE_PRIORITY = {"error": 2, "execution_result": 2, "tool_outputs": 1, "tool_output": 1}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text without a tokenizer.
+
+    Uses the usual four characters per token of English text and JSON, which
+    overestimates slightly for prose and is good enough to stay in a window.
+
+    Args:
+        text: The text to measure.
+
+    Returns:
+        The estimated number of tokens.
+    """
+    return (len(text) + 3) // 4
+
+
+def history_priority(entry: Any) -> int:
+    """Rank a history entry for packing; lower values are dropped first.
+
+    Args:
+        entry: A conversation history entry.
+
+    Returns:
+        2 for errors and execution results, 1 for tool outputs, 0 otherwise.
+    """
+    if isinstance(entry, dict):
+        return _ROLE_PRIORITY.get(entry.get("role"), 0)
+    return 0
+
+
+class ContextPacker:
+    """Fit the planning context in a token budget, section by section.
+
+    Sections other than the impact report and the history (e.g. the failures)
+    are always kept. The impact report gets at most `report_share` of what is
+    left and keeps the entries of the current failures first, the others are
+    summarized by a count. Oversized tool results are truncated, then history
+    entries are packed by `priority` (most recent first within a priority)
+    into the remaining tokens. The tokens used by each section of the last
+    packed context are kept in `last_usage`.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        tokenizer: Tokenizer = estimate_tokens,
+        response_tokens: int = 512,
+        report_share: float = 0.5,
+        max_tool_output_tokens: int = 256,
+        priority: Optional[Callable[[Any], int]] = history_priority,
+        history_key: str = "conversation_history",
+        report_key: str = "impact_report",
+    ):
+        """Initialize the packer.
+
+        Args:
+            max_tokens: Size of the model window, prompt and response included.
+            tokenizer: Function returning the number of tokens of a text.
+            response_tokens: Tokens kept free for the response.
+            report_share: Maximum share of the remaining tokens given to the impact report.
+            max_tool_output_tokens: Tokens a single tool result may use before it is truncated.
+            priority: Ranking of history entries, lower values are dropped
+                first. None drops the oldest entries first.
+            history_key: The context key holding the history list.
+            report_key: The context key holding the impact report.
+        """
+        self.max_tokens = max_tokens
+        self.tokenizer = tokenizer
+        self.response_tokens = response_tokens
+        self.report_share = report_share
+        self.max_tool_output_tokens = max_tool_output_tokens
+        self.priority = priority
+        self.history_key = history_key
+        self.report_key = report_key
+        self.last_usage: Dict[str, int] = {}
+
+    def count(self, value: Any) -> int:
+        """Return the number of tokens of a text, or of a value rendered as in the prompt.
+
+        Args:
+            value: A string, or any JSON-serializable value.
+
+        Returns:
+            The number of tokens according to the tokenizer.
+        """
+        if not isinstance(value, str):
+            value = json.dumps(value, indent=2)
+        return self.tokenizer(value)
+
+    def _count_item(self, value: Any) -> int:
+        # A report entry or history entry, rendered two levels deep as in the prompt, with its separator
+        text = json.dumps(value, indent=2).replace("\n", "\n    ")
+        return self.tokenizer(f"    {text},\n")
+
+    def pack(self, context: Dict[str, Any], reserved_tokens: int = 0) -> Dict[str, Any]:
+        """Return a copy of the context fitting in the budget.
+
+        Args:
+            context: The context dictionary.
+            reserved_tokens: Tokens already used by the rest of the prompt.
+
+        Returns:
+            A shallow copy of the context with the impact report and the
+            history reduced to fit.
+        """
+        usage = {"prompt": reserved_tokens}
+        packed = {}
+        for key, value in context.items():
+            if key not in (self.report_key, self.history_key):
+                packed[key] = value
+                usage[key] = self.count({key: value})
+
+        available = self.max_tokens - self.response_tokens - sum(usage.values())
+
+        if self.report_key in context:
+            report = context[self.report_key]
+            packed[self.report_key] = self._pack_report(report, int(available * self.report_share), context)
+            usage[self.report_key] = self.count({self.report_key: packed[self.report_key]})
+            available -= usage[self.report_key]
+
+        if self.history_key in context:
+            packed[self.history_key] = self._pack_history(context[self.history_key], available)
+            usage[self.history_key] = self.count({self.history_key: packed[self.history_key]})
+
+        usage["total"] = sum(usage.values())
+        self.last_usage = usage
+        return packed
+
+    def _pack_report(self, report: Any, budget: int, context: Dict[str, Any]) -> Any:
+        if not isinstance(report, dict) or self.count(report) <= budget:
+            return report
+
+        failures = [node for node in context.get("failures", []) if node in report]
+        ranked = list(dict.fromkeys(failures + list(report)))
+        omitted = len(ranked)
+        # Room for the summary of the omitted nodes
+        used = self.count({"_omitted": f"{omitted} more nodes"})
+        packed = {}
+        for node in ranked:
+            tokens = self._count_item({node: report[node]})
+            if used + tokens > budget:
+                continue
+            packed[node] = report[node]
+            used += tokens
+            omitted -= 1
+        if omitted:
+            packed["_omitted"] = f"{omitted} more nodes"
+        return packed
+
+    def _pack_history(self, history: List[Any], budget: int) -> List[Any]:
+        entries = [self._truncate_entry(entry) for entry in history]
+        sizes = [self._count_item(entry) for entry in entries]
+        # The sizes are tokens, the list punctuation is already part of each item's count
+        return trim_history(
+            entries, max(budget, 0), sizes=sizes, priority=self.priority, separator_size=0, brackets_size=0
+        )
+
+    def _truncate_entry(self, entry: Any) -> Any:
+        if not isinstance(entry, dict):
+            return entry
+        if "result" in entry:
+            result = self._truncate(entry["result"])
+            if result is not entry["result"]:
+                return {**entry, "result": result}
+        elif isinstance(entry.get("results"), list):
+            results = [self._truncate_entry(output) for output in entry["results"]]
+            if any(new is not old for new, old in zip(results, entry["results"])):
+                return {**entry, "results": results}
+        return entry
+
+    def _truncate(self, value: Any) -> Any:
+        tokens = self.count(value)
+        if tokens <= self.max_tool_output_tokens:
+            return value
+        text = value if isinstance(value, str) else json.dumps(value)
+        # Cut proportionally, so that any tokenizer lands close to the limit
+        keep = len(text) * self.max_tool_output_tokens // tokens
+        return text[:max(keep - len(_TRUNCATED), 0)] + _TRUNCATED
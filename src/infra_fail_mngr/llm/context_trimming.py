@@ -0,0 +1,125 @@
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# json.dumps separates list items with ", " and encloses them in "[]"
+_ITEM_SEPARATOR_SIZE = 2
+_BRACKETS_SIZE = 2
+
+
+def json_size(value: Any) -> int:
+    """Return the length of the value as serialized by `json.dumps`.
+
+    Args:
+        value: Any JSON-serializable value.
+
+    Returns:
+        The number of characters of the serialized value.
+    """
+    return len(json.dumps(value))
+
+
+def serialized_list_size(
+    sizes: Sequence[int],
+    separator_size: int = _ITEM_SEPARATOR_SIZE,
+    brackets_size: int = _BRACKETS_SIZE,
+) -> int:
+    """Return the serialized length of a list whose items have the given sizes.
+
+    Args:
+        sizes: Serialized sizes of the list items.
+        separator_size: Size of the separator between two items.
+        brackets_size: Size of the brackets enclosing the list.
+
+    Returns:
+        The number of characters `json.dumps` produces for the whole list.
+    """
+    if not sizes:
+        return brackets_size
+    return brackets_size + sum(sizes) + separator_size * (len(sizes) - 1)
+
+
+def trim_history(
+    entries: List[Any],
+    budget: int,
+    size_of: Callable[[Any], int] = json_size,
+    priority: Optional[Callable[[Any], int]] = None,
+    sizes: Optional[Sequence[int]] = None,
+    separator_size: int = _ITEM_SEPARATOR_SIZE,
+    brackets_size: int = _BRACKETS_SIZE,
+) -> List[Any]:
+    """Drop history entries until the serialized list fits in the budget.
+
+    Every entry is measured exactly once, so trimming is linear in the
+    number of entries (plus a sort when a priority is given).
+
+    Args:
+        entries: The history entries, oldest first.
+        budget: Maximum serialized size of the resulting list.
+        size_of: Function returning the serialized size of a single entry.
+        priority: Optional function ranking entries; lower values are
+            dropped first and ties are broken by age (oldest first).
+            Without it, entries are dropped from the front.
+        sizes: Optional precomputed entry sizes; `size_of` is not called
+            when they are given.
+        separator_size: Size of the separator between two entries, in the
+            unit of the entry sizes.
+        brackets_size: Size of the brackets enclosing the list, in the unit
+            of the entry sizes.
+
+    Returns:
+        The kept entries in their original order.
+    """
+    if sizes is None:
+        sizes = [size_of(entry) for entry in entries]
+    total = serialized_list_size(sizes, separator_size, brackets_size)
+    count = len(entries)
+
+    if priority is None:
+        drop = 0
+        while count and total > budget:
+            total -= sizes[drop] + (separator_size if count > 1 else 0)
+            drop += 1
+            count -= 1
+        return entries[drop:]
+
+    dropped = set()
+    for index in sorted(range(len(entries)), key=lambda i: (priority(entries[i]), i)):
+        if not count or total <= budget:
+            break
+        total -= sizes[index] + (separator_size if count > 1 else 0)
+        dropped.add(index)
+        count -= 1
+    return [entry for i, entry in enumerate(entries) if i not in dropped]
+
+
+def limit_context_history(context: Dict[str, Any], max_length: int, key: str = "conversation_history") -> Dict[str, Any]:
+    """Trim the oldest history entries until the serialized context fits.
+
+    Args:
+        context: The context dictionary.
+        max_length: Maximum allowed length of `json.dumps(context)`.
+        key: The context key holding the history list.
+
+    Returns:
+        The original context if it already fits, otherwise a shallow copy
+        with the history list trimmed from the front.
+    """
+    if key not in context:
+        if json_size(context) <= max_length:
+            return context
+        limited_context = context.copy()
+        limited_context[key] = []
+        return limited_context
+
+    history = context[key]
+    limited_context = context.copy()
+    limited_context[key] = []
+    # Size of everything but the history list items
+    base_size = json_size(limited_context) - serialized_list_size([])
+
+    sizes = [json_size(entry) for entry in history]
+    if base_size + serialized_list_size(sizes) <= max_length:
+        return context
+
+    limited_context[key] = trim_history(history, max_length - base_size, sizes=sizes)
+    return limited_context
@@ -0,0 +1,136 @@
+import json
+from typing import Any, Dict, Optional
+
+_EXPECT_OBJECT = 0
+_EXPECT_KEY = 1
+_IN_KEY = 2
+_EXPECT_COLON = 3
+_IN_VALUE = 4
+_DONE = 5
+
+
+class IncrementalDecisionParser:
+    """Parse a streamed JSON decision, exposing its top-level fields as soon as they are complete.
+
+    The response is scanned once, chunk by chunk. Every top-level value is
+    decoded when the comma or brace ending it arrives, so `action` and
+    `arguments` are known before the rest of the response is generated, and a
+    malformed response is rejected at the first invalid field.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self._buffer = ""
+        self._pos = 0
+        self._state = _EXPECT_OBJECT
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._token_start = 0
+        self._key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level object is closed."""
+        return self._state == _DONE
+
+    @property
+    def action_ready(self) -> bool:
+        """Whether the action and its arguments are known.
+
+        Without an `arguments` field, the action is only ready once the
+        object is closed.
+        """
+        return "action" in self.fields and ("arguments" in self.fields or self.done)
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of the response.
+
+        Args:
+            chunk: The next part of the response text.
+
+        Raises:
+            ValueError: If the response can already be told to be invalid.
+        """
+        self._buffer += chunk
+        buffer = self._buffer
+
+        for pos in range(self._pos, len(buffer)):
+            char = buffer[pos]
+            state = self._state
+
+            if state == _IN_VALUE or state == _IN_KEY:
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == "\\":
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                        if state == _IN_KEY:
+                            self._key = json.loads(buffer[self._token_start:pos + 1])
+                            self._state = _EXPECT_COLON
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    if self._depth == 0:
+                        if char != "}":
+                            raise ValueError(f"Unexpected '{char}' at position {pos}")
+                        self._complete_value(pos)
+                        self._state = _DONE
+                    else:
+                        self._depth -= 1
+                elif char == "," and self._depth == 0:
+                    self._complete_value(pos)
+                    self._state = _EXPECT_KEY
+
+            elif char.isspace():
+                continue
+
+            elif state == _EXPECT_OBJECT:
+                if char != "{":
+                    raise ValueError("Response is not a JSON object")
+                self._state = _EXPECT_KEY
+
+            elif state == _EXPECT_KEY:
+                if char == "}" and not self.fields:
+                    self._state = _DONE
+                elif char != '"':
+                    raise ValueError(f"Expected a field name at position {pos}")
+                else:
+                    self._token_start = pos
+                    self._in_string = True
+                    self._state = _IN_KEY
+
+            elif state == _EXPECT_COLON:
+                if char != ":":
+                    raise ValueError(f"Expected ':' at position {pos}")
+                self._token_start = pos + 1
+                self._state = _IN_VALUE
+
+            elif state == _DONE:
+                raise ValueError(f"Unexpected data after the response at position {pos}")
+
+        self._pos = len(buffer)
+
+    def _complete_value(self, end: int) -> None:
+        # Raises json.JSONDecodeError, a ValueError, for an invalid value
+        self.fields[self._key] = json.loads(self._buffer[self._token_start:end])
+        self._key = None
+
+    @property
+    def text(self) -> str:
+        """The response received so far."""
+        return self._buffer
+
+    def result(self) -> Dict[str, Any]:
+        """Return the complete decision.
+
+        Raises:
+            ValueError: If the response ended before the object was closed.
+        """
+        if not self.done:
+            raise ValueError("LLM response ended before the JSON object was complete")
+        return self.fields
@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Iterator, Protocol
 import json
 import sys
 
@@ -18,6 +18,36 @@ class LLMClient(Protocol):
         ...
 
 
+class StreamingLLMClient(LLMClient, Protocol):
+    """Protocol for LLM clients that can stream their response."""
+
+    def generate_stream(self, system_prompt: str) -> Iterator[str]:
+        """Generate a response based on the system prompt, chunk by chunk.
+
+        Args:
+            system_prompt: The formatted prompt to send to the LLM.
+
+        Returns:
+            An iterator over the chunks of the raw response, closing it stops the generation.
+        """
+        ...
+
+
+class AsyncLLMClient(Protocol):
+    """Protocol for LLM clients with a non-blocking generate."""
+
+    async def generate(self, system_prompt: str) -> str:
+        """Generate a response based on the system prompt.
+
+        Args:
+            system_prompt: The formatted prompt to send to the LLM.
+
+        Returns:
+            The raw response string from the LLM.
+        """
+        ...
+
+
 class LLMClientImpl(LLMClient):
     """Mock implementation of LLMClient that returns predefined responses."""
 
@@ -81,3 +111,37 @@ class LLMClientImpl(LLMClient):
             return response
         
         return ""
+
+
+class StreamingLLMClientImpl(LLMClientImpl):
+    """Mock implementation of StreamingLLMClient streaming the predefined responses."""
+
+    def __init__(self, responses: list[str], chunk_size: int = 4):
+        """Initialize with a list of predefined responses.
+
+        Args:
+            responses: List of JSON strings to return in sequence.
+            chunk_size: Number of characters per streamed chunk.
+        """
+        super().__init__(responses)
+        self.chunk_size = chunk_size
+
+    def generate_stream(self, system_prompt: str) -> Iterator[str]:
+        """Stream the next predefined response, see LLMClientImpl.generate.
+
+        Args:
+            system_prompt: Ignored in mock implementation.
+
+        Returns:
+            An iterator over chunks of `chunk_size` characters.
+        """
+        response = self.generate(system_prompt)
+        return (response[i:i + self.chunk_size] for i in range(0, len(response), self.chunk_size))
+
+
+class AsyncLLMClientImpl(LLMClientImpl):
+    """Mock implementation of AsyncLLMClient that returns predefined responses."""
+
+    async def generate(self, system_prompt: str) -> str:
+        """Return the next predefined response, see LLMClientImpl.generate."""
+        return super().generate(system_prompt)
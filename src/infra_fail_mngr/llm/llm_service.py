@@ -1,9 +1,19 @@
 import json
-from typing import Dict, Any, Protocol, Union
+import logging
+import time
+from typing import Callable, Dict, Any, Optional, Protocol, Union
 import sys
 
-from .llm_client import LLMClient
-from ..prompts.prompt_formatting import include_context, include_response_format, include_tools
+from .context_packing import ContextPacker
+from .context_trimming import limit_context_history
+from .incremental_json import IncrementalDecisionParser
+from .llm_client import AsyncLLMClient, LLMClient, StreamingLLMClient
+from ..logs import RAW_RESPONSE_LOGGER_NAME
+from ..prompts.prompt_builder import PromptBuilder
+from ..tracing import NOOP_TRACER, Tracer
+
+# Raw responses can be kilobytes per call, they are off unless sampled in configure_logging
+raw_response_logger = logging.getLogger(RAW_RESPONSE_LOGGER_NAME)
 
 
 class LLMService(Protocol):
@@ -23,18 +33,68 @@ class LLMService(Protocol):
         ...
 
 
+class StreamingLLMService(LLMService, Protocol):
+    """Protocol for LLM services that parse the response while it is generated."""
+
+    def handle_request_stream(
+        self,
+        system_prompt: str,
+        user_context: Dict[str, Any],
+        tool_descriptions: str,
+        on_action: Optional[Callable[[str, Any], None]] = None,
+    ) -> Dict[str, Any]:
+        """Handle an LLM request, reporting the action as soon as it is generated.
+
+        Args:
+            system_prompt: The base system prompt.
+            user_context: Context data to include in the prompt.
+            tool_descriptions: Descriptions of available tools.
+            on_action: Called with (action, arguments) once both are complete,
+                before the rest of the response is generated.
+
+        Returns:
+            The parsed decision.
+        """
+        ...
+
+
+class AsyncLLMService(Protocol):
+    """Protocol for LLM services with a non-blocking handle_request."""
+
+    async def handle_request(self, system_prompt: str, user_context: Dict[str, Any], tool_descriptions: str) -> Union[str, Dict[str, Any]]:
+        """Async variant of LLMService.handle_request."""
+        ...
+
+
 class LLMServiceImpl(LLMService):
     """Implementation of LLMService that formats prompts and handles responses."""
 
-    def __init__(self, llm_client: LLMClient, max_context_length: int = 2000):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        max_context_length: int = 2000,
+        context_packer: Optional[ContextPacker] = None,
+        compact_context: bool = False,
+        tracer: Optional[Tracer] = None,
+    ):
         """Initialize with an LLM client and max context length.
 
         Args:
             llm_client: The client to use for generating responses.
             max_context_length: Maximum allowed context length in characters.
+            context_packer: Token budget packer used instead of max_context_length.
+            compact_context: Render the context without indentation and the
+                impact report as aggregated columns, see encode_context_compact.
+            tracer: Receives the "llm.prompt" and "llm.generate" spans of every request.
         """
         self.client = llm_client
         self.max_context_length = max_context_length
+        self.context_packer = context_packer
+        self.compact_context = compact_context
+        self.tracer = tracer if tracer is not None else NOOP_TRACER
+        self.prompt_builder = None
+        self._prefix_tokens = 0
+        self.last_stream_timings: Dict[str, float] = {}
 
     def _limit_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Limit the context to fit within max_context_length by truncating history.
@@ -45,17 +105,8 @@ class LLMServiceImpl(LLMService):
         Returns:
             The limited context dictionary.
         """
-        ctx_str = json.dumps(context)
-        if len(ctx_str) <= self.max_context_length:
-            return context
-
-        # Truncate conversation_history from the beginning
-        history = context.get('conversation_history', [])
-        limited_context = context.copy()
-        while history and len(json.dumps(limited_context)) > self.max_context_length:
-            history = history[1:]  # Remove oldest
-        limited_context['conversation_history'] = history
-        return limited_context
+        # Each history entry is serialized once, the oldest ones are dropped in a single pass
+        return limit_context_history(context, self.max_context_length, 'conversation_history')
 
     def handle_request(self, system_prompt: str, context: Dict[str, Any], tool_descriptions: str) -> Union[str, Dict[str, Any]]:
         """Format the prompt, call the LLM, and parse the response.
@@ -73,40 +124,104 @@ class LLMServiceImpl(LLMService):
             ValueError: If LLM returns empty string.
             json.JSONDecodeError: If response is not valid JSON.
         """
-        limited_context = self._limit_context(context)
+        prompt = self._build_prompt(system_prompt, context, tool_descriptions)
+        with self.tracer.span("llm.generate"):
+            res_str = self.client.generate(prompt)
 
-        _prompt = include_tools(
-            include_response_format(
-                include_context(
-                    system_prompt, limited_context
-                )
-            ),
-            tool_descriptions
-        )
+        return self._parse_response(res_str)
 
-        res_str = self.client.generate(_prompt)
+    def handle_request_stream(
+        self,
+        system_prompt: str,
+        context: Dict[str, Any],
+        tool_descriptions: str,
+        on_action: Optional[Callable[[str, Any], None]] = None,
+    ) -> Dict[str, Any]:
+        """Format the prompt, stream the LLM response and parse it incrementally.
 
-        print(f"Raw LLM response: {res_str}")
+        The client must implement StreamingLLMClient. Timings of the last
+        request, in seconds, are kept in `last_stream_timings`:
+        "first_chunk", "action" (time to first action) and "total".
 
-        if not res_str or res_str == "":
+        Args:
+            system_prompt: The base system prompt.
+            context: Context data for the prompt.
+            tool_descriptions: Tool descriptions for the prompt.
+            on_action: Called with (action, arguments) once both are complete.
+
+        Returns:
+            The parsed decision.
+
+        Raises:
+            ValueError: As soon as the response is known to be invalid, the
+                stream is closed without waiting for the rest of it.
+        """
+        client: StreamingLLMClient = self.client
+        started = time.perf_counter()
+        timings = self.last_stream_timings = {}
+        parser = IncrementalDecisionParser()
+
+        stream = client.generate_stream(self._build_prompt(system_prompt, context, tool_descriptions))
+        with self.tracer.span("llm.generate", stream=True) as span:
+            try:
+                for chunk in stream:
+                    if "first_chunk" not in timings:
+                        timings["first_chunk"] = time.perf_counter() - started
+                    parser.feed(chunk)
+                    if "action" not in timings and parser.action_ready:
+                        timings["action"] = time.perf_counter() - started
+                        if on_action is not None:
+                            on_action(parser.fields["action"], parser.fields.get("arguments", {}))
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+                timings["total"] = time.perf_counter() - started
+                for key, value in timings.items():
+                    span.set_attribute(f"{key}_seconds", value)
+                raw_response_logger.debug("Raw LLM response: %s", parser.text)
+
+        if not parser.text:
             raise ValueError("LLM returned empty string")
+        return parser.result()
+
+    def _build_prompt(self, system_prompt: str, context: Dict[str, Any], tool_descriptions: str) -> str:
+        with self.tracer.span("llm.prompt"):
+            return self._render_prompt(system_prompt, context, tool_descriptions)
+
+    def _render_prompt(self, system_prompt: str, context: Dict[str, Any], tool_descriptions: str) -> str:
+        # The static sections are the same on every planning step, only re-render them when they change
+        if self.prompt_builder is None or not self.prompt_builder.matches(system_prompt, tool_descriptions):
+            if self.compact_context:
+                self.prompt_builder = PromptBuilder(system_prompt, tool_descriptions, compact=True)
+            else:
+                self.prompt_builder = PromptBuilder(system_prompt, tool_descriptions)
+            if self.context_packer is not None:
+                self._prefix_tokens = self.context_packer.count(self.prompt_builder.static_prefix)
+
+        if self.context_packer is not None:
+            limited_context = self.context_packer.pack(context, reserved_tokens=self._prefix_tokens)
+        else:
+            limited_context = self._limit_context(context)
 
+        return self.prompt_builder.build(limited_context)
 
+    def _parse_response(self, res_str: str) -> Union[str, Dict[str, Any]]:
+        raw_response_logger.debug("Raw LLM response: %s", res_str)
+
+        if not res_str or res_str == "":
+            raise ValueError("LLM returned empty string")
 
-        
         try:
             parsed = json.loads(res_str)
-            
-
 
-            
             if "Checking available crews" in res_str or "Default assignment" in res_str or "Ready to dispatch" in res_str:
                 return res_str  # String για agent.py
-            
+
             return parsed
-            
+
         except json.JSONDecodeError as e:
-            
+
             raise e
 
     def generate_unit_tests_for_agent(self, history_length: int) -> str:
@@ -149,3 +264,28 @@ class TestAgent(unittest.TestCase):
             return "Quick optimized tool handle for efficiency"
         else:
             return "Standard tool handle"
+
+
+class AsyncLLMServiceImpl(LLMServiceImpl):
+    """Async variant of LLMServiceImpl for clients implementing AsyncLLMClient."""
+
+    def __init__(self, llm_client: AsyncLLMClient, max_context_length: int = 2000, **kwargs):
+        """Initialize with an async LLM client and max context length.
+
+        Args:
+            llm_client: The async client to use for generating responses.
+            max_context_length: Maximum allowed context length in characters.
+            **kwargs: The options of LLMServiceImpl.
+        """
+        super().__init__(llm_client, max_context_length, **kwargs)
+
+    async def handle_request(self, system_prompt: str, context: Dict[str, Any], tool_descriptions: str) -> Union[str, Dict[str, Any]]:
+        """Format the prompt, await the LLM, and parse the response.
+
+        See LLMServiceImpl.handle_request.
+        """
+        prompt = self._build_prompt(system_prompt, context, tool_descriptions)
+        with self.tracer.span("llm.generate"):
+            res_str = await self.client.generate(prompt)
+
+        return self._parse_response(res_str)
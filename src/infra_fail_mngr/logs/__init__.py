@@ -0,0 +1,7 @@
+from .queue_logging import (
+    LOGGER_NAME,
+    RAW_RESPONSE_LOGGER_NAME,
+    SamplingFilter,
+    configure_logging,
+    get_logger,
+)
@@ -0,0 +1,104 @@
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+# Fixed names, so that the hierarchy is the same however the package is imported
+LOGGER_NAME = "infra_fail_mngr"
+RAW_RESPONSE_LOGGER_NAME = "infra_fail_mngr.llm.raw_responses"
+
+# Library default, the package logs nothing until configured
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(component: str) -> logging.Logger:
+    """
+    Return the logger of a component of the package, e.g. get_logger("agent").
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{component}")
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through a fixed share of the records, evenly spread: a rate of 0.1 keeps every tenth record.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate (float): Share of the records kept, between 0 and 1.
+        """
+        super().__init__()
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sampling rate must be between 0 and 1, got {rate}")
+        self.rate = rate
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            self._credit += self.rate
+            # Tolerance for the rounding of rates like 0.1 accumulated in floating point
+            if self._credit >= 1.0 - 1e-9:
+                self._credit -= 1.0
+                return True
+            return False
+
+
+class _QueueListener(QueueListener):
+    # Stopping twice, e.g. by the caller then at exit, is a no-op
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    handlers: Optional[List[logging.Handler]] = None,
+    raw_response_sample_rate: float = 0.0,
+) -> QueueListener:
+    """
+    Send the package logs through a queue to handlers running on a background thread.
+
+    Logging calls only format and enqueue the record, so the agent loop never blocks on I/O. Raw LLM responses are
+    logged at DEBUG level on their own logger, and only the sampled share of them is kept.
+
+    Args:
+        level (int): Minimum level of the package logs.
+        handlers (List[logging.Handler] | None): Handlers writing the records, defaults to plain messages on stdout.
+        raw_response_sample_rate (float): Share of the raw LLM responses logged, 0 disables them.
+
+    Returns:
+        QueueListener: The started listener, stopping it flushes the queued records. It is stopped at exit.
+    """
+    if handlers is None:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers = [stream_handler]
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = _QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
+
+    raw_logger = logging.getLogger(RAW_RESPONSE_LOGGER_NAME)
+    for log_filter in [f for f in raw_logger.filters if isinstance(f, SamplingFilter)]:
+        raw_logger.removeFilter(log_filter)
+    if raw_response_sample_rate > 0:
+        raw_logger.setLevel(logging.DEBUG)
+        raw_logger.addFilter(SamplingFilter(raw_response_sample_rate))
+    else:
+        # Skipped before any formatting
+        raw_logger.setLevel(logging.CRITICAL + 1)
+
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
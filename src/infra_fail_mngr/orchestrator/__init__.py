@@ -0,0 +1 @@
+from .incident_orchestrator import IncidentOrchestrator
@@ -0,0 +1,215 @@
+import collections
+import itertools
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..agent import DEFAULT_MAX_IN_MEMORY, InfraAgent, StepHistory
+from ..states import State
+
+_EXHAUSTED = object()
+
+
+class IncidentOrchestrator:
+    """
+    Runs one InfraAgent per incident on a bounded number of worker threads.
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[Any], InfraAgent],
+        max_concurrency: int = 4,
+        max_pending: Optional[int] = None,
+        incident_timeout: Optional[float] = None,
+        step_history_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            agent_factory: Builds a fresh agent for an incident.
+            max_concurrency: Number of agents running at the same time.
+            max_pending: Number of incidents queued behind the running ones. The incident stream is not
+                consumed further until a slot frees up. Defaults to `max_concurrency`.
+            incident_timeout: Seconds an incident may run. An incident over its budget is reported as timed
+                out as soon as the budget runs out, even in the middle of a hung LLM or repository call. Its
+                worker is abandoned and frees its slot, the agent stops at its next step boundary.
+            step_history_dir: Directory receiving one JSONL file per incident with the steps pushed out of
+                its agent's in-memory history. Without it, those steps are dropped.
+        """
+        self.agent_factory = agent_factory
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_concurrency if max_pending is None else max_pending
+        self.incident_timeout = incident_timeout
+        self.step_history_dir = step_history_dir
+        self._incident_numbers = itertools.count()
+
+    def run(self, incidents: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Run all incidents and wait for them to finish.
+
+        Returns:
+            dict: A dictionary containing:
+                - "results" (list): Per-incident results, in completion order (see `iter_results`).
+                - "stats" (dict): Aggregated throughput and latency stats (see `compute_stats`).
+        """
+        start = time.monotonic()
+        results = list(self.iter_results(incidents))
+        return {
+            "results": results,
+            "stats": compute_stats(results, time.monotonic() - start),
+        }
+
+    def iter_results(self, incidents: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Run the incidents, yielding each result as soon as its agent stops.
+
+        Each result is a dictionary containing:
+            - "incident": The incident as received.
+            - "summary" (dict | None): The agent's `get_summary()`, None if the agent raised or was
+              abandoned past its time budget.
+            - "elapsed" (float): Seconds from the agent's creation until it stopped.
+            - "reached_final" (bool): Whether the agent reached the FINAL state.
+            - "timed_out" (bool): Whether the incident ran out of its time budget.
+            - "error" (str | None): The exception raised by the agent, if any.
+        """
+        max_in_flight = self.max_concurrency + self.max_pending
+        stream = iter(incidents)
+        incident = next(stream, _EXHAUSTED)
+        queued = collections.deque()
+        running: Dict[Future, Tuple[Any, float]] = {}
+
+        while True:
+            while incident is not _EXHAUSTED and len(queued) + len(running) < max_in_flight:
+                queued.append(incident)
+                incident = next(stream, _EXHAUSTED)
+            while queued and len(running) < self.max_concurrency:
+                started = queued.popleft()
+                start = time.monotonic()
+                running[self._start(started, start)] = (started, start)
+            if not running:
+                return
+
+            done, _ = wait(running, timeout=self._next_deadline(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                yield future.result()
+            for future in self._overdue(running):
+                overdue, start = running.pop(future)
+                yield self._result(overdue, None, time.monotonic() - start, False, True, None)
+
+    def _start(self, incident: Any, start: float) -> Future:
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self._run_incident(incident, start))
+            except BaseException as e:
+                future.set_exception(e)
+
+        # A daemon thread, so that an abandoned incident never holds up the process
+        threading.Thread(target=run, name="incident-worker", daemon=True).start()
+        return future
+
+    def _next_deadline(self, running: Dict[Future, Tuple[Any, float]]) -> Optional[float]:
+        if self.incident_timeout is None:
+            return None
+        deadline = min(start for _, start in running.values()) + self.incident_timeout
+        return max(deadline - time.monotonic(), 0)
+
+    def _overdue(self, running: Dict[Future, Tuple[Any, float]]) -> List[Future]:
+        if self.incident_timeout is None:
+            return []
+        now = time.monotonic()
+        return [
+            future for future, (_, start) in running.items()
+            if not future.done() and now - start >= self.incident_timeout
+        ]
+
+    def _run_incident(self, incident: Any, start: float) -> Dict[str, Any]:
+        deadline = start + self.incident_timeout if self.incident_timeout is not None else None
+        agent = None
+        summary = None
+        timed_out = False
+        error = None
+
+        try:
+            agent = self.agent_factory(incident)
+            self._spill_step_history(agent)
+            step = 0
+            while agent.state != State.FINAL and step < agent.max_steps:
+                if deadline is not None and time.monotonic() >= deadline:
+                    timed_out = True
+                    break
+                agent.run_step()
+                step += 1
+            summary = agent.get_summary()
+        except Exception as e:
+            error = repr(e)
+        finally:
+            if agent is not None:
+                agent.step_history.close()
+
+        reached_final = agent is not None and agent.state == State.FINAL
+        return self._result(incident, summary, time.monotonic() - start, reached_final, timed_out, error)
+
+    @staticmethod
+    def _result(
+        incident: Any, summary: Optional[Dict], elapsed: float, reached_final: bool, timed_out: bool, error: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
+            "incident": incident,
+            "summary": summary,
+            "elapsed": elapsed,
+            "reached_final": reached_final,
+            "timed_out": timed_out,
+            "error": error,
+        }
+
+    def _spill_step_history(self, agent: InfraAgent) -> None:
+        history = agent.step_history
+        if self.step_history_dir is None or history.spill_path is not None or len(history):
+            return
+        path = os.path.join(self.step_history_dir, f"incident-{next(self._incident_numbers)}.jsonl")
+        agent.step_history = StepHistory(history.max_in_memory or DEFAULT_MAX_IN_MEMORY, path)
+
+
+def compute_stats(results: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """
+    Aggregate the results of an orchestrator run.
+
+    Args:
+        results: Results as yielded by `IncidentOrchestrator.iter_results`.
+        wall_time: Seconds the whole run took.
+
+    Returns:
+        dict: A dictionary containing:
+            - "incidents" (int): Number of incidents run.
+            - "reached_final" (int): Incidents whose agent reached FINAL.
+            - "timed_out" (int): Incidents stopped by their time budget.
+            - "errors" (int): Incidents whose agent raised.
+            - "wall_time" (float): Seconds the run took.
+            - "incidents_per_sec" (float): Throughput over the whole run.
+            - "p50_time_to_final" (float | None): Median seconds to FINAL.
+            - "p99_time_to_final" (float | None): 99th percentile seconds to FINAL.
+    """
+    times_to_final = sorted(r["elapsed"] for r in results if r["reached_final"])
+    return {
+        "incidents": len(results),
+        "reached_final": len(times_to_final),
+        "timed_out": sum(1 for r in results if r["timed_out"]),
+        "errors": sum(1 for r in results if r["error"] is not None),
+        "wall_time": wall_time,
+        "incidents_per_sec": len(results) / wall_time if wall_time > 0 else 0.0,
+        "p50_time_to_final": _percentile(times_to_final, 50),
+        "p99_time_to_final": _percentile(times_to_final, 99),
+    }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
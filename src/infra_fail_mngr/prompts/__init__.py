@@ -1,2 +1,4 @@
 from .prompt_formatting import include_context, include_response_format, include_tools
 from .system_prompts import get_system_prompt
+from .prompt_builder import PromptBuilder
+from .context_encoding import columnar_report, encode_context_compact
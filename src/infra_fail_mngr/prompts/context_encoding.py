@@ -0,0 +1,62 @@
+import json
+from typing import Any, Dict
+
+_SCALARS = (str, int, float, bool, type(None))
+
+# Tells the LLM how to read a columnar impact report
+COMPACT_CONTEXT_LABEL = (
+    'Context (compact JSON, an "impact_report" with "columns" and "rows" lists the nodes sharing '
+    'the impact values of each row):'
+)
+
+
+def columnar_report(report: Any) -> Any:
+    """Render an impact report of homogeneous per-node records as columns and rows.
+
+    Nodes with identical impact values are aggregated into a single row, whose
+    first column lists them. Reports whose records don't all have the same
+    scalar fields are returned unchanged.
+
+    Args:
+        report: Mapping of node id to its impact record.
+
+    Returns:
+        {"columns": ["nodes", <field>, ...], "rows": [[[<node>, ...], <value>, ...], ...]},
+        or the report itself.
+    """
+    if not isinstance(report, dict) or not report:
+        return report
+
+    fields = None
+    groups: Dict[tuple, list] = {}
+    for node, record in report.items():
+        if not isinstance(record, dict):
+            return report
+        if fields is None:
+            fields = tuple(record)
+        elif tuple(record) != fields:
+            return report
+        values = tuple(record.values())
+        if not all(isinstance(value, _SCALARS) for value in values):
+            return report
+        groups.setdefault(values, []).append(node)
+
+    return {
+        "columns": ["nodes", *fields],
+        "rows": [[nodes, *values] for values, nodes in groups.items()],
+    }
+
+
+def encode_context_compact(context: Dict[str, Any], report_key: str = "impact_report") -> str:
+    """Serialize the planning context without indentation, with a columnar impact report.
+
+    Args:
+        context: Dictionary of context data.
+        report_key: The context key holding the impact report.
+
+    Returns:
+        The context as compact JSON.
+    """
+    if report_key in context:
+        context = {**context, report_key: columnar_report(context[report_key])}
+    return json.dumps(context, separators=(",", ":"))
@@ -0,0 +1,69 @@
+import json
+from typing import Dict, Any
+
+from .context_encoding import COMPACT_CONTEXT_LABEL, encode_context_compact
+from .prompt_formatting import include_response_format, include_tools
+
+
+class PromptBuilder:
+    """Assemble planning prompts from static sections rendered once and a per-call context.
+
+    The system prompt, response format and tool descriptions do not change between planning
+    steps, so they are rendered once into `static_prefix`. Only the context is serialized on
+    each call and it always comes last, so every prompt starts with the same `prefix_boundary`
+    characters, which LLM backends with prefix caching can reuse.
+    """
+
+    def __init__(self, system_prompt: str, tool_descriptions: str, compact: bool = False):
+        """Render the static sections.
+
+        Args:
+            system_prompt: The base system prompt.
+            tool_descriptions: String describing available tools.
+            compact: Encode the context with encode_context_compact instead of indented JSON.
+        """
+        self.system_prompt = system_prompt
+        self.tool_descriptions = tool_descriptions
+        self.compact = compact
+        static_sections = include_tools(include_response_format(system_prompt), tool_descriptions)
+        # Same layout as include_context, split at the point where the context is inserted
+        self.static_prefix = f"""
+        {static_sections}
+
+        {COMPACT_CONTEXT_LABEL if compact else "Context:"}
+        """
+        self._suffix = """
+        """
+
+    @property
+    def prefix_boundary(self) -> int:
+        """Length of the prefix shared by every prompt this builder produces."""
+        return len(self.static_prefix)
+
+    def matches(self, system_prompt: str, tool_descriptions: str) -> bool:
+        """Check whether the builder was rendered from the given static sections.
+
+        Args:
+            system_prompt: The base system prompt.
+            tool_descriptions: String describing available tools.
+
+        Returns:
+            True if the builder can be reused for these sections.
+        """
+        return (
+            (self.system_prompt is system_prompt or self.system_prompt == system_prompt)
+            and (self.tool_descriptions is tool_descriptions or self.tool_descriptions == tool_descriptions)
+        )
+
+    def build(self, context: Dict[str, Any]) -> str:
+        """Build the full prompt for a context.
+
+        Args:
+            context: Dictionary of context data to include.
+
+        Returns:
+            The static prefix followed by the context as formatted JSON.
+        """
+        if self.compact:
+            return self.static_prefix + encode_context_compact(context) + self._suffix
+        return self.static_prefix + json.dumps(context, indent=2) + self._suffix
@@ -1,17 +1,27 @@
 import json
 from typing import Dict, Any
 
+from .context_encoding import COMPACT_CONTEXT_LABEL, encode_context_compact
 
-def include_context(prompt: str, context: Dict[str, Any]) -> str:
+
+def include_context(prompt: str, context: Dict[str, Any], compact: bool = False) -> str:
     """Include context data in the prompt as formatted JSON.
 
     Args:
         prompt: The base prompt string.
         context: Dictionary of context data to include.
+        compact: Encode the context with encode_context_compact instead of indented JSON.
 
     Returns:
         The prompt with context appended.
     """
+    if compact:
+        return f"""
+        {prompt}
+
+        {COMPACT_CONTEXT_LABEL}
+        {encode_context_compact(context)}
+        """
     return f"""
         {prompt}
 
@@ -41,10 +51,21 @@ def include_response_format(prompt: str) -> str:
             "arguments": {{<object: parameters for the action>}}
         }}
 
+        To run several independent information-gathering tools at once, replace "action" and "arguments" with
+        a "tool_calls" list, every call runs concurrently and all results come back together:
+
+        {{
+            "thoughts": "<string: your reasoning and analysis>",
+            "tool_calls": [
+                {{"action": "<string: tool name>", "arguments": {{<object: parameters for the tool>}}}}
+            ]
+        }}
+
         Important Notes:
         - "thoughts" must be a non-empty string explaining your decision
         - "action" must be one of the available tools or "assign_repair_crew"
         - "arguments" must be an object with the required parameters for the chosen action
+        - "assign_repair_crew" is never part of "tool_calls", it must be the only action of its response
         - Do not include extra fields or deviate from this format
 
         Examples:
@@ -56,6 +77,15 @@ def include_response_format(prompt: str) -> str:
             "arguments": {{"location": "downtown"}}
         }}
 
+        For gathering information in parallel:
+        {{
+            "thoughts": "Need the weather at every failure site",
+            "tool_calls": [
+                {{"action": "get_weather_at_location", "arguments": {{"location": "downtown"}}}},
+                {{"action": "get_weather_at_location", "arguments": {{"location": "harbor"}}}}
+            ]
+        }}
+
         For making assignments:
         {{
             "thoughts": "All critical information gathered, ready to dispatch crews",
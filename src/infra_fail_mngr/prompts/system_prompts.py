@@ -17,6 +17,7 @@ def get_system_prompt() -> str:
         - get_weather_at_location: Use when weather conditions might affect repair operations or crew travel
         - estimate_repair_time: Use to understand how long repairs will take for planning
         - estimate_arrival_time: Use to know when crews will arrive at failure sites
+        - plan_crew_assignment: Use to compute the optimal crew-to-node assignment in a single step, its node_ids and crew_ids can be passed to assign_repair_crew as they are
         - assign_repair_crew: Use when you have all necessary information and are ready to dispatch crews
 
         Decision-making guidelines:
@@ -25,7 +26,8 @@ def get_system_prompt() -> str:
         - Consider crew availability, location, and weather conditions
         - Be decisive but informed - don't delay critical repairs unnecessarily
 
-        Response format: Always respond with valid JSON containing 'thoughts', 'action', and 'arguments'.
+        Response format: Always respond with valid JSON containing 'thoughts', 'action', and 'arguments',
+        or 'thoughts' and a 'tool_calls' list to run several independent tools at once.
         """
 
 
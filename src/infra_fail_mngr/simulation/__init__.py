@@ -0,0 +1,2 @@
+from .topology import Node, Topology
+from .simulator import InfraSimulator
@@ -0,0 +1,295 @@
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..domain import AgentRepository, SystemRepository
+from .topology import Topology
+
+
+class InfraSimulator(SystemRepository, AgentRepository):
+    """
+    System and agent repository over a generated topology, for load testing the agent.
+
+    Every outcome derives from the seed: the initial failures, the weather of each zone, the cascades and whether an
+    assignment fails, which depends on the seed, node, crew and attempt only, so that it doesn't change with the order
+    of the calls. Simulated time only moves with `advance`: repairs complete and failures cascade downstream then.
+    Each repository call can be delayed by `latency` plus up to `jitter` seconds, to load the agent as a remote
+    service would.
+    """
+
+    def __init__(
+        self,
+        topology: Topology,
+        num_crews: int = 200,
+        initial_failures: int = 10,
+        cascade_probability: float = 0.2,
+        assignment_failure_rate: float = 0.05,
+        speed_kmh: float = 60.0,
+        storm_share: float = 0.25,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        start: datetime = datetime(2024, 1, 15, 8, 0),
+        seed: int = 0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            topology (Topology): The nodes, depots and weather zones.
+            num_crews (int): Number of crews, spread over the depots.
+            initial_failures (int): Nodes failed at the start.
+            cascade_probability (float): Chance per simulated hour that a failure spreads to each node it supplies.
+            assignment_failure_rate (float): Chance that an assignment is refused.
+            speed_kmh (float): Travel speed of the crews, in fair weather.
+            storm_share (float): Share of the weather zones under a storm, halving the travel speed.
+            latency (float): Seconds added to every repository call.
+            jitter (float): Maximum random seconds added on top of the latency.
+            start (datetime): Simulated time at the start.
+            seed (int): Seed of every random outcome.
+            sleep (Callable[[float], None]): Function waiting the injected latency.
+        """
+        self.topology = topology
+        self.cascade_probability = cascade_probability
+        self.assignment_failure_rate = assignment_failure_rate
+        self.speed_kmh = speed_kmh
+        self.latency = latency
+        self.jitter = jitter
+        self.now = start
+        self.seed = seed
+        self.sleep = sleep
+        self.assignments = 0
+        self.failed_assignments = 0
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._latency_rng = random.Random(seed)
+
+        zones = topology.zones()
+        self.storms = set(self._rng.sample(zones, round(len(zones) * storm_share)))
+        self.temperatures = {zone: self._rng.randint(-5, 35) for zone in zones}
+
+        depots = sorted(topology.depots)
+        # Crews start at their depot, and move to the node they were last assigned to
+        self.crew_locations: Dict[str, str] = {f"crew{i}": depots[i % len(depots)] for i in range(num_crews)}
+        # Crew busy on a node, with the simulated minutes left before the repair completes
+        self.crew_jobs: Dict[str, Tuple[str, float]] = {}
+        self._attempts: Dict[Tuple[str, str], int] = {}
+
+        # Failed nodes in the order they failed, with the version they failed at, the cursor of get_failed_nodes_since
+        self._failed: Dict[str, int] = {}
+        self._version = 0
+        self.inject_failures(initial_failures)
+
+    def _delay(self) -> None:
+        if self.latency or self.jitter:
+            with self._lock:
+                delay = self.latency + self._latency_rng.uniform(0, self.jitter)
+            self.sleep(delay)
+
+    def _fail(self, node_id: str) -> None:
+        if node_id not in self._failed:
+            self._version += 1
+            self._failed[node_id] = self._version
+
+    def inject_failures(self, count: int, nodes: Optional[List[str]] = None) -> List[str]:
+        """
+        Fail random working nodes, or the given ones.
+
+        Args:
+            count (int): Number of random nodes to fail, ignored when nodes are given.
+            nodes (Optional[List[str]]): Nodes to fail.
+
+        Returns:
+            List[str]: The nodes that failed.
+        """
+        with self._lock:
+            if nodes is None:
+                working = len(self.topology.nodes) - len(self._failed)
+                nodes = []
+                while len(nodes) < min(count, working):
+                    node_id = f"node{self._rng.randrange(len(self.topology.nodes))}"
+                    if node_id not in self._failed and node_id not in nodes:
+                        nodes.append(node_id)
+            for node_id in nodes:
+                self._fail(node_id)
+            return nodes
+
+    def advance(self, minutes: float) -> Dict[str, List[str]]:
+        """
+        Move the simulated time forward: repairs in progress complete, then failures spread to the nodes they supply.
+
+        Args:
+            minutes (float): Simulated minutes to advance.
+
+        Returns:
+            Dict[str, List[str]]: The "repaired" nodes and the "cascaded" ones, which failed in this step.
+        """
+        with self._lock:
+            self.now += timedelta(minutes=minutes)
+            repaired = []
+            for crew_id, (node_id, remaining) in list(self.crew_jobs.items()):
+                if remaining <= minutes:
+                    del self.crew_jobs[crew_id]
+                    self._failed.pop(node_id, None)
+                    repaired.append(node_id)
+                else:
+                    self.crew_jobs[crew_id] = (node_id, remaining - minutes)
+
+            # Nodes being repaired are isolated and don't spread their failure
+            in_repair = {node_id for node_id, _ in self.crew_jobs.values()}
+            probability = 1 - (1 - self.cascade_probability) ** (minutes / 60)
+            cascaded = []
+            for node_id in list(self._failed):
+                if node_id in in_repair:
+                    continue
+                for downstream in self.topology.nodes[node_id].downstream:
+                    if downstream not in self._failed and self._rng.random() < probability:
+                        self._fail(downstream)
+                        cascaded.append(downstream)
+            return {"repaired": repaired, "cascaded": cascaded}
+
+    def nodes_in_repair(self) -> List[str]:
+        """
+        Return the failed nodes a crew is assigned to.
+        """
+        with self._lock:
+            return [node_id for node_id, _ in self.crew_jobs.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the state of the simulation.
+
+        Returns:
+            Dict[str, Any]: The counts of failed nodes, busy crews, assignments and refused assignments.
+        """
+        with self._lock:
+            return {
+                "time": self.now.isoformat(),
+                "failed_nodes": len(self._failed),
+                "busy_crews": len(self.crew_jobs),
+                "assignments": self.assignments,
+                "failed_assignments": self.failed_assignments,
+            }
+
+    # SystemRepository
+
+    def get_failed_nodes(self) -> List[str]:
+        self._delay()
+        with self._lock:
+            return list(self._failed)
+
+    def get_failed_nodes_since(self, cursor: Optional[str]) -> Tuple[List[str], str]:
+        self._delay()
+        after = int(cursor) if cursor else 0
+        with self._lock:
+            nodes = [node_id for node_id, version in self._failed.items() if version > after]
+            return nodes, str(self._version)
+
+    def get_node_details(self, node_id: str) -> Dict[str, Any]:
+        self._delay()
+        return self._node_details(node_id)
+
+    def get_node_details_batch(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        self._delay()
+        return {node_id: self._node_details(node_id) for node_id in node_ids}
+
+    def _node_details(self, node_id: str) -> Dict[str, Any]:
+        node = self.topology.nodes[node_id]
+        details = node.details()
+        details["failed"] = node_id in self._failed
+        details["downstream"] = len(node.downstream)
+        return details
+
+    def assign_crew(self, node_id: str, crew_id: str) -> bool:
+        self._delay()
+        with self._lock:
+            if node_id not in self._failed or crew_id in self.crew_jobs or crew_id not in self.crew_locations:
+                return False
+            attempt = self._attempts.get((node_id, crew_id), 0)
+            self._attempts[(node_id, crew_id)] = attempt + 1
+            self.assignments += 1
+            # Seeded by the call itself, so that concurrent agents see the same outcomes in any order
+            if random.Random(f"{self.seed}:{node_id}:{crew_id}:{attempt}").random() < self.assignment_failure_rate:
+                self.failed_assignments += 1
+                return False
+            travel = self._travel_minutes(self.crew_locations[crew_id], node_id)
+            self.crew_jobs[crew_id] = (node_id, travel + self.topology.nodes[node_id].repair_minutes)
+            self.crew_locations[crew_id] = node_id
+            return True
+
+    # AgentRepository
+
+    def get_weather_at_location(self, location: str) -> int:
+        self._delay()
+        return self.temperatures[self.topology.zone_of(location)]
+
+    def is_holiday(self, date: datetime) -> bool:
+        self._delay()
+        return (date.month, date.day) in ((1, 1), (12, 25), (12, 26))
+
+    def is_weekend(self, date: datetime) -> bool:
+        self._delay()
+        return date.weekday() >= 5
+
+    def get_time_of_day(self, hour: int) -> str:
+        self._delay()
+        if 6 <= hour < 12:
+            return "morning"
+        if 12 <= hour < 18:
+            return "afternoon"
+        if 18 <= hour < 22:
+            return "evening"
+        return "night"
+
+    def estimate_travel_time(self, origin: str, destination: str) -> int:
+        self._delay()
+        return self._travel_minutes(origin, destination)
+
+    def estimate_travel_times(self, origins: List[str], destinations: List[str]) -> List[List[int]]:
+        self._delay()
+        targets = [self._site(destination) for destination in destinations]
+        rows = []
+        for origin in origins:
+            x, y, stormy = self._site(origin)
+            rows.append([
+                self._minutes(math.hypot(tx - x, ty - y), stormy or target_stormy) for tx, ty, target_stormy in targets
+            ])
+        return rows
+
+    def _site(self, location: str) -> Tuple[float, float, bool]:
+        x, y = self.topology.position(location)
+        return x, y, self.topology.zone_of(location) in self.storms
+
+    def _minutes(self, distance_km: float, stormy: bool) -> int:
+        # Storms at either end halve the speed
+        return round(distance_km / (self.speed_kmh / 2 if stormy else self.speed_kmh) * 60)
+
+    def _travel_minutes(self, origin: str, destination: str) -> int:
+        x1, y1, origin_stormy = self._site(origin)
+        x2, y2, destination_stormy = self._site(destination)
+        return self._minutes(math.hypot(x2 - x1, y2 - y1), origin_stormy or destination_stormy)
+
+    def estimate_repair_time(self, node: str) -> int:
+        self._delay()
+        return self.topology.nodes[node].repair_minutes
+
+    def estimate_repair_times(self, nodes: List[str]) -> List[int]:
+        self._delay()
+        return [self.topology.nodes[node].repair_minutes for node in nodes]
+
+    def crew_location(self, crew_id: str) -> str:
+        self._delay()
+        with self._lock:
+            return self.crew_locations[crew_id]
+
+    def is_crew_available(self, crew_id: str) -> bool:
+        self._delay()
+        with self._lock:
+            return crew_id in self.crew_locations and crew_id not in self.crew_jobs
+
+    def get_available_crews(self) -> List[str]:
+        self._delay()
+        with self._lock:
+            return [crew_id for crew_id in self.crew_locations if crew_id not in self.crew_jobs]
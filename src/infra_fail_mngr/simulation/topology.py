@@ -0,0 +1,152 @@
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+NODE_KINDS = ("substation", "transformer", "feeder", "switch")
+# Minutes to repair each kind of node, before the per-node variation
+BASE_REPAIR_MINUTES = {"substation": 240, "transformer": 120, "feeder": 90, "switch": 45}
+
+
+class Node:
+    """
+    A piece of infrastructure at a point of the map, supplying the nodes downstream of it.
+    """
+
+    __slots__ = ("node_id", "kind", "x", "y", "zone", "critical", "population", "repair_minutes", "upstream",
+                 "downstream")
+
+    def __init__(self, node_id: str, kind: str, x: float, y: float, zone: str, critical: bool, population: int,
+                 repair_minutes: int, upstream: Optional[str]):
+        self.node_id = node_id
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.zone = zone
+        self.critical = critical
+        self.population = population
+        self.repair_minutes = repair_minutes
+        self.upstream = upstream
+        self.downstream: List[str] = []
+
+    def details(self) -> Dict:
+        return {
+            "node_id": self.node_id,
+            "kind": self.kind,
+            "critical": self.critical,
+            "population": self.population,
+            "zone": self.zone,
+            "location": [round(self.x, 3), round(self.y, 3)],
+            "upstream": self.upstream,
+        }
+
+
+class Topology:
+    """
+    Generated map of nodes, crew depots and weather zones, identical for identical parameters.
+
+    Nodes are scattered over a square of `size_km`, each one supplied by a nearby node generated before it, so the
+    supply graph is a forest rooted at the substations. The square is divided in `zones_per_side`² weather zones.
+    """
+
+    def __init__(self, nodes: Dict[str, Node], depots: Dict[str, Tuple[float, float]], size_km: float,
+                 zones_per_side: int, seed: int):
+        self.nodes = nodes
+        self.depots = depots
+        self.size_km = size_km
+        self.zones_per_side = zones_per_side
+        self.seed = seed
+
+    @classmethod
+    def generate(
+        cls,
+        num_nodes: int = 10_000,
+        num_depots: int = 20,
+        size_km: float = 200.0,
+        zones_per_side: int = 4,
+        substation_share: float = 0.01,
+        critical_share: float = 0.1,
+        seed: int = 0,
+    ) -> "Topology":
+        """
+        Args:
+            num_nodes (int): Number of nodes.
+            num_depots (int): Number of crew depots.
+            size_km (float): Side of the square map, in kilometres.
+            zones_per_side (int): Weather zones along each side of the map.
+            substation_share (float): Share of the nodes that are substations, the roots of the supply graph.
+            critical_share (float): Share of the nodes flagged critical, e.g. supplying a hospital.
+            seed (int): Seed of the generation.
+        """
+        rng = random.Random(seed)
+        # Supplying nodes are looked up among the nearby ones, bucketed on a grid of cells
+        cell_km = max(size_km / max(math.isqrt(num_nodes), 1), 1.0)
+        cells: Dict[Tuple[int, int], List[Node]] = {}
+        nodes: Dict[str, Node] = {}
+
+        for i in range(num_nodes):
+            x, y = rng.uniform(0, size_km), rng.uniform(0, size_km)
+            cell = (int(x // cell_km), int(y // cell_km))
+            kind = "substation" if i == 0 or rng.random() < substation_share else rng.choice(NODE_KINDS[1:])
+            upstream = None if kind == "substation" else _nearest(cells, cell, x, y)
+            node = Node(
+                node_id=f"node{i}",
+                kind=kind,
+                x=x,
+                y=y,
+                zone=_zone(x, y, size_km, zones_per_side),
+                critical=rng.random() < critical_share,
+                population=int(rng.lognormvariate(6, 1)),
+                repair_minutes=int(BASE_REPAIR_MINUTES[kind] * rng.uniform(0.75, 1.5)),
+                upstream=upstream.node_id if upstream is not None else None,
+            )
+            if upstream is not None:
+                upstream.downstream.append(node.node_id)
+            nodes[node.node_id] = node
+            cells.setdefault(cell, []).append(node)
+
+        depots = {f"depot{k}": (rng.uniform(0, size_km), rng.uniform(0, size_km)) for k in range(num_depots)}
+        return cls(nodes, depots, size_km, zones_per_side, seed)
+
+    def position(self, location: str) -> Tuple[float, float]:
+        """
+        Return the coordinates of a node or depot, in kilometres.
+
+        Raises:
+            KeyError: If the location is neither a node nor a depot.
+        """
+        node = self.nodes.get(location)
+        if node is not None:
+            return node.x, node.y
+        return self.depots[location]
+
+    def zone_of(self, location: str) -> str:
+        x, y = self.position(location)
+        return _zone(x, y, self.size_km, self.zones_per_side)
+
+    def distance_km(self, origin: str, destination: str) -> float:
+        (x1, y1), (x2, y2) = self.position(origin), self.position(destination)
+        return math.hypot(x2 - x1, y2 - y1)
+
+    def zones(self) -> List[str]:
+        return [f"zone{row}-{col}" for row in range(self.zones_per_side) for col in range(self.zones_per_side)]
+
+
+def _zone(x: float, y: float, size_km: float, zones_per_side: int) -> str:
+    col = min(int(x / size_km * zones_per_side), zones_per_side - 1)
+    row = min(int(y / size_km * zones_per_side), zones_per_side - 1)
+    return f"zone{row}-{col}"
+
+
+def _nearest(cells: Dict[Tuple[int, int], List[Node]], cell: Tuple[int, int], x: float, y: float) -> Optional[Node]:
+    # Closest generated node in the surrounding cells, widening the search until one is found
+    for radius in range(1, 64):
+        best, best_distance = None, math.inf
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                for node in cells.get((cell[0] + dx, cell[1] + dy), ()):
+                    distance = (node.x - x) ** 2 + (node.y - y) ** 2
+                    if distance < best_distance:
+                        best, best_distance = node, distance
+        if best is not None:
+            return best
+    return None
@@ -1,9 +1,15 @@
+from infra_fail_mngr.logs import configure_logging
 from infra_fail_mngr.test_run.wire import wire
 
 
 def main():
-    agent = wire()
-    agent.run_to_completion()
+    listener = configure_logging(raw_response_sample_rate=1.0)
+    try:
+        agent = wire()
+        agent.run_to_completion()
+    finally:
+        # Flush the queued log records even when the run fails
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
-from infra_fail_mngr.agent import InfraAgent
+from typing import Optional
+
+from infra_fail_mngr.agent import DEFAULT_MAX_IN_MEMORY, InfraAgent, StepHistory
+from infra_fail_mngr.caching import CachingAgentRepository
 from infra_fail_mngr.domain import SystemRepository, AgentRepository
 from infra_fail_mngr.llm import LLMServiceImpl, LLMClientImpl
-from infra_fail_mngr.tools import SystemTools, AgentTools
+from infra_fail_mngr.tools import SystemTools, AgentTools, CrewAssignmentPlanner, TravelTimeMatrix, DecisionValidator
+from infra_fail_mngr.tracing import TracedRepository, Tracer
 
 
 class InlineSystemRepo(SystemRepository):
@@ -22,9 +26,15 @@ class InlineAgentRepo(AgentRepository):
     def get_weather_at_location(self, location):
         return 25
 
-    def estimate_repair_time(self, node_id, crew_id):
+    def estimate_repair_time(self, node):
         return 60
 
+    def estimate_travel_time(self, origin, destination):
+        return 30
+
+    def crew_location(self, crew_id):
+        return "location1"
+
     def estimate_arrival_time(self, node_id, crew_id):
         return 30
 
@@ -34,16 +44,32 @@ class InlineAgentRepo(AgentRepository):
     def get_crew_remaining_capacity(self, crew_id):
         return 10
 
-def wire() -> InfraAgent:
+def wire(step_history_path: Optional[str] = None) -> InfraAgent:
+    tracer = Tracer()
     llm_client = LLMClientImpl([])
-    llm_service = LLMServiceImpl(llm_client)
+    llm_service = LLMServiceImpl(llm_client, tracer=tracer)
 
-    system_repo: SystemRepository = InlineSystemRepo()
-    system_tools = SystemTools(system_repo)
+    # Traced below the cache, so that only the calls reaching the repository are timed
+    agent_repo = CachingAgentRepository(TracedRepository(InlineAgentRepo(), tracer))
+    travel_times = TravelTimeMatrix(agent_repo)
 
-    agent_repo: AgentRepository = InlineAgentRepo()
+    def on_crew_assigned(node_id: str, crew_id: str) -> None:
+        agent_repo.on_crew_assigned(node_id, crew_id)
+        travel_times.on_crew_assigned(node_id, crew_id)
+
+    system_repo: SystemRepository = TracedRepository(InlineSystemRepo(), tracer)
+    system_tools = SystemTools(system_repo, on_crew_assigned=on_crew_assigned)
+
+    planner = CrewAssignmentPlanner(agent_repo, system_tools, travel_times)
     agent_tools = AgentTools(agent_repo, [
+        planner.plan_crew_assignment,
         system_tools.assign_repair_crew
-    ])
+    ], travel_times=travel_times)
+
+    decision_validator = DecisionValidator(agent_tools.get_tool_schemas())
+
+    # Steps past the in-memory ring are spilled to step_history_path when given, dropped otherwise
+    step_history = StepHistory(DEFAULT_MAX_IN_MEMORY, step_history_path)
 
-    return InfraAgent(llm_service, system_tools, agent_tools)
+    return InfraAgent(llm_service, system_tools, agent_tools, step_history=step_history,
+                      decision_validator=decision_validator, tracer=tracer)
@@ -1,2 +1,8 @@
 from .agent_tools import AgentTools
 from .system_tools import SystemTools
+from .async_agent_tools import AsyncAgentTools
+from .async_system_tools import AsyncSystemTools
+from .assignment_solver import CrewAssignmentPlanner, solve_assignment
+from .travel_time_matrix import TravelTimeMatrix
+from .decision_validator import DecisionValidator
+from .impact_engine import ImpactEngine, ImpactScores
@@ -1,13 +1,16 @@
-import inspect
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from ..domain import AgentRepository
+from .tool_registry import ToolRegistry
+from .travel_time_matrix import TravelTimeMatrix
 
 
 class AgentTools:
-    def __init__(self, repo: AgentRepository, additional_tools: list):
+    def __init__(self, repo: AgentRepository, additional_tools: list, travel_times: Optional[TravelTimeMatrix] = None):
         self.repo = repo
+        # When given, travel times are read from the shared matrix instead of the repo pair by pair
+        self.travel_times = travel_times
         self.AGENT_TOOLS = [
             self.get_weather_at_location,
             self.is_holiday,
@@ -19,7 +22,10 @@ class AgentTools:
             self.is_crew_available,
             self.get_available_crews
         ]
+        if travel_times is not None:
+            self.AGENT_TOOLS.append(self.estimate_travel_times)
         self.AGENT_TOOLS.extend(additional_tools)
+        self.registry = ToolRegistry(self.AGENT_TOOLS)
 
     def get_weather_at_location(self, location: str, **kwargs) -> Dict:
         """
@@ -95,13 +101,36 @@ class AgentTools:
                 - "destination" (str): The destination location.
                 - "time" (int): Estimated travel time in milliseconds.
         """
-        travel_time = self.repo.estimate_travel_time(origin, destination)
+        if self.travel_times is not None:
+            travel_time = self.travel_times.get(origin, destination)
+        else:
+            travel_time = self.repo.estimate_travel_time(origin, destination)
         
         return {
             "origin": origin,
             "destination": destination,
             "time": travel_time
         }
+
+    def estimate_travel_times(self, origins: List[str], destinations: List[str], **kwargs) -> Dict[str, List]:
+        """
+        Estimate the travel times from every origin to every destination at once.
+
+        Args:
+            origins (List[str]): The starting locations.
+            destinations (List[str]): The destination locations.
+
+        Returns:
+            dict: A dictionary containing:
+                - "origins" (List[str]): The origin locations.
+                - "destinations" (List[str]): The destination locations.
+                - "times" (List[List[int]]): Travel times in milliseconds, one row per origin.
+        """
+        return {
+            "origins": origins,
+            "destinations": destinations,
+            "times": self.travel_times.matrix(origins, destinations)
+        }
     
     def estimate_repair_time(self, node: str, **kwargs) -> Dict[str, str | int]:
         """
@@ -174,19 +203,18 @@ class AgentTools:
 
     def get_tool_descriptions(self):
         """
-        Reflect into the ENABLED_TOOLS list to generate the list of available tools.
+        Return the descriptions of the AGENT_TOOLS, reflected once at construction.
         """
-        descriptions = []
-        for func in self.AGENT_TOOLS:
-            name = func.__name__
-            doc = inspect.getdoc(func)
-            sig = inspect.signature(func)
-            descriptions.append(f"{name}{sig} - {doc}")
+        return self.registry.descriptions
 
-        return "\n".join(descriptions)
+    def get_tool_schemas(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the JSON schema of the parameters of each tool, by tool name.
+        """
+        return self.registry.schemas
 
     def get_tool(self, name: str):
         """
-        Helper to match the function to the name.
+        Helper to match the function to the name, only registered tools are returned.
         """
-        return getattr(self, name, None)
+        return self.registry.get(name)
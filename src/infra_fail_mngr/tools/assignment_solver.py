@@ -0,0 +1,245 @@
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..domain import AgentRepository
+from .system_tools import SystemTools
+from .travel_time_matrix import TravelTimeMatrix
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python solver is used without it
+    np = None
+
+
+def solve_assignment(cost: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """
+    Minimum-cost assignment of rows to columns (Hungarian algorithm, shortest augmenting paths).
+
+    Every row is assigned to a distinct column when there are at least as many columns as rows,
+    otherwise every column is assigned to a distinct row.
+
+    Args:
+        cost (Sequence[Sequence[float]]): Rectangular cost matrix, cost[row][col].
+
+    Returns:
+        List[Tuple[int, int]]: The (row, col) pairs of the assignment, sorted by row.
+    """
+    rows = len(cost)
+    cols = len(cost[0]) if rows else 0
+    if not rows or not cols:
+        return []
+
+    if rows > cols:
+        transposed = [[cost[r][c] for r in range(rows)] for c in range(cols)]
+        return sorted((r, c) for c, r in solve_assignment(transposed))
+
+    if np is not None:
+        cost = np.asarray(cost, dtype=float)
+        columns = _candidate_columns_numpy(cost)
+        col_of_row = _hungarian_numpy(cost if columns is None else cost[:, columns])
+    else:
+        columns = _candidate_columns(cost)
+        col_of_row = _hungarian(cost if columns is None else [[row[c] for c in columns] for row in cost])
+    if columns is not None:
+        col_of_row = [int(columns[col]) for col in col_of_row]
+    return list(enumerate(col_of_row))
+
+
+# Below this many columns per row, reducing the columns costs more than it saves
+_REDUCTION_RATIO = 2
+
+
+def _candidate_columns(cost: Sequence[Sequence[float]]) -> Optional[List[int]]:
+    # Some optimal assignment only uses columns among the `rows` cheapest of each row: when a row gets any other
+    # column, one of its `rows` cheapest is left free by the other rows, and swapping to it costs no more.
+    rows, cols = len(cost), len(cost[0])
+    if cols <= rows * _REDUCTION_RATIO:
+        return None
+    columns = set()
+    for row in cost:
+        columns.update(heapq.nsmallest(rows, range(cols), key=row.__getitem__))
+    return sorted(columns) if len(columns) < cols else None
+
+
+def _candidate_columns_numpy(cost) -> Optional["np.ndarray"]:
+    # See _candidate_columns
+    rows, cols = cost.shape
+    if cols <= rows * _REDUCTION_RATIO:
+        return None
+    columns = np.unique(np.argpartition(cost, rows - 1, axis=1)[:, :rows])
+    return columns if len(columns) < cols else None
+
+
+def _hungarian(cost: Sequence[Sequence[float]]) -> List[int]:
+    # O(rows² · cols), requires rows <= cols. Index 0 is a virtual row/column.
+    rows, cols = len(cost), len(cost[0])
+    inf = float("inf")
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (cols + 1)
+    row_of_col = [0] * (cols + 1)
+    way = [0] * (cols + 1)
+
+    for row in range(1, rows + 1):
+        row_of_col[0] = row
+        col0 = 0
+        min_slack = [inf] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[col0] = True
+            row0 = row_of_col[col0]
+            row_cost = cost[row0 - 1]
+            u_row0 = u[row0]
+            delta = inf
+            col1 = 0
+            for col in range(1, cols + 1):
+                if not used[col]:
+                    slack = row_cost[col - 1] - u_row0 - v[col]
+                    if slack < min_slack[col]:
+                        min_slack[col] = slack
+                        way[col] = col0
+                    if min_slack[col] < delta:
+                        delta = min_slack[col]
+                        col1 = col
+            for col in range(cols + 1):
+                if used[col]:
+                    u[row_of_col[col]] += delta
+                    v[col] -= delta
+                else:
+                    min_slack[col] -= delta
+            col0 = col1
+            if row_of_col[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            row_of_col[col0] = row_of_col[col1]
+            col0 = col1
+
+    col_of_row = [0] * rows
+    for col in range(1, cols + 1):
+        if row_of_col[col]:
+            col_of_row[row_of_col[col] - 1] = col - 1
+    return col_of_row
+
+
+def _hungarian_numpy(cost) -> List[int]:
+    # Shortest augmenting paths as in _hungarian, vectorized over the columns. The potentials are only updated
+    # once per row, from the path lengths, which leaves a handful of array operations per scanned column.
+    rows, cols = cost.shape
+    u = np.zeros(rows)
+    v = np.zeros(cols)
+    row_of_col = np.full(cols, -1, dtype=np.int64)
+    col_of_row = np.full(rows, -1, dtype=np.int64)
+    path = np.zeros(cols, dtype=np.int64)
+
+    for start in range(rows):
+        dist = np.full(cols, np.inf)
+        # Scanned columns are masked with an infinite offset
+        offset = -v
+        scanned, scanned_dist = [], []
+        row, min_value = start, 0.0
+        while True:
+            reduced = cost[row] + offset
+            reduced += min_value - u[row]
+            path[reduced < dist] = row
+            np.minimum(dist, reduced, out=dist)
+            col = int(np.argmin(dist))
+            min_value = dist[col]
+            if row_of_col[col] < 0:
+                break
+            scanned.append(col)
+            scanned_dist.append(min_value)
+            dist[col] = np.inf
+            offset[col] = np.inf
+            row = int(row_of_col[col])
+
+        u[start] += min_value
+        if scanned:
+            scanned = np.asarray(scanned)
+            delta = min_value - np.asarray(scanned_dist)
+            u[row_of_col[scanned]] += delta
+            v[scanned] -= delta
+        while True:
+            row = path[col]
+            row_of_col[col] = row
+            col, col_of_row[row] = col_of_row[row], col
+            if row == start:
+                break
+
+    return col_of_row.tolist()
+
+
+class CrewAssignmentPlanner:
+    """
+    Deterministic crew-to-node assignment, exposed to the LLM as a single tool.
+    """
+
+    def __init__(self, repo: AgentRepository, system_tools: SystemTools, travel_times: Optional[TravelTimeMatrix] = None):
+        """
+        Args:
+            repo (AgentRepository): Source of crew locations, travel and repair estimates.
+            system_tools (SystemTools): Source of the impact of each failed node.
+            travel_times (TravelTimeMatrix | None): Shared travel time cache. Without it, travel times
+                are fetched afresh for every plan.
+        """
+        self.repo = repo
+        self.system_tools = system_tools
+        self.travel_times = travel_times
+
+    def plan_crew_assignment(self, node_ids: List[str], crew_ids: Optional[List[str]] = None, **kwargs) -> Dict:
+        """
+        Compute the optimal assignment of repair crews to failed nodes, favouring high-impact nodes.
+
+        Args:
+            node_ids (List[str]): Failed nodes to repair.
+            crew_ids (List[str] | None): Crews to assign, defaults to the currently available crews.
+
+        Returns:
+            dict: A dictionary containing:
+                - "node_ids" (List[str]): Assigned nodes, most impactful first.
+                - "crew_ids" (List[str]): The crew assigned to each node, ready for assign_repair_crew.
+                - "unassigned_nodes" (List[str]): Nodes left without a crew.
+                - "estimated_times" (List[int]): Travel plus repair time for each assignment.
+        """
+        crews = list(crew_ids) if crew_ids is not None else list(self.repo.get_available_crews())
+        nodes = list(dict.fromkeys(node_ids))
+        if not crews or not nodes:
+            return {"node_ids": [], "crew_ids": [], "unassigned_nodes": nodes, "estimated_times": []}
+
+        times = self._completion_times(crews, nodes)
+        weights = self._impact_weights(nodes)
+        # Time per affected user, so that high-impact nodes are cheaper to pick when crews are short
+        if np is not None:
+            cost = np.asarray(times, dtype=float) / np.asarray(weights)
+        else:
+            cost = [[time / weights[n] for n, time in enumerate(crew_times)] for crew_times in times]
+
+        pairs = solve_assignment(cost)
+        pairs.sort(key=lambda pair: (-weights[pair[1]], times[pair[0]][pair[1]], pair[1]))
+
+        assigned = {node for _, node in pairs}
+        return {
+            "node_ids": [nodes[node] for _, node in pairs],
+            "crew_ids": [crews[crew] for crew, _ in pairs],
+            "unassigned_nodes": [node for n, node in enumerate(nodes) if n not in assigned],
+            "estimated_times": [int(times[crew][node]) for crew, node in pairs],
+        }
+
+    def _completion_times(self, crews: List[str], nodes: List[str]):
+        repair_times = self._repair_times(nodes)
+        # Crews at the same location share their row of travel times
+        travel_times = self.travel_times if self.travel_times is not None else TravelTimeMatrix(self.repo)
+        crew_travel = travel_times.crew_matrix(crews, nodes)
+
+        if np is not None:
+            return np.asarray(crew_travel, dtype=np.int64) + np.asarray(repair_times, dtype=np.int64)
+        return [[travel + repair for travel, repair in zip(row, repair_times)] for row in crew_travel]
+
+    def _repair_times(self, nodes: List[str]) -> List[int]:
+        get_batch = getattr(self.repo, "estimate_repair_times", None)
+        if get_batch is None:
+            return [self.repo.estimate_repair_time(node) for node in nodes]
+        return list(get_batch(nodes))
+
+    def _impact_weights(self, nodes: List[str]) -> List[float]:
+        report = self.system_tools.estimate_impact_batch(nodes)
+        return [max(float(report[node].get("population_affected", 1)), 1.0) for node in nodes]
@@ -0,0 +1,69 @@
+from typing import Dict, List
+from datetime import datetime
+
+from ..domain import AsyncAgentRepository
+from .agent_tools import AgentTools
+
+
+class AsyncAgentTools(AgentTools):
+    """
+    AgentTools over an AsyncAgentRepository, every tool is a coroutine.
+
+    The tools keep the names, signatures and (inherited) docstrings of AgentTools,
+    so the tool descriptions sent to the LLM are the same.
+    """
+
+    def __init__(self, repo: AsyncAgentRepository, additional_tools: list):
+        super().__init__(repo, additional_tools)
+
+    async def get_weather_at_location(self, location: str, **kwargs) -> Dict:
+        temperature = await self.repo.get_weather_at_location(location)
+
+        return {
+            "location": location,
+            "temperature": temperature,
+            "is_raining": temperature < 15
+        }
+
+    async def is_holiday(self, date: datetime, **kwargs) -> bool:
+        return await self.repo.is_holiday(date)
+
+    async def is_weekend(self, date: datetime, **kwargs) -> bool:
+        return await self.repo.is_weekend(date)
+
+    async def get_time_of_day(self, hour: int, **kwargs) -> str:
+        return await self.repo.get_time_of_day(hour)
+
+    async def estimate_travel_time(self, origin: str, destination: str, **kwargs) -> Dict[str, str | int]:
+        travel_time = await self.repo.estimate_travel_time(origin, destination)
+
+        return {
+            "origin": origin,
+            "destination": destination,
+            "time": travel_time
+        }
+
+    async def estimate_repair_time(self, node: str, **kwargs) -> Dict[str, str | int]:
+        repair_time = await self.repo.estimate_repair_time(node)
+
+        return {
+            "node": node,
+            "time": repair_time
+        }
+
+    async def get_crew_location(self, crew_id: str, **kwargs) -> Dict[str, str]:
+        crew_location = await self.repo.crew_location(crew_id)
+        return {
+            "crew_id": crew_id,
+            "location": crew_location
+        }
+
+    async def is_crew_available(self, crew_id: str, **kwargs) -> Dict[str, str | bool]:
+        is_available = await self.repo.is_crew_available(crew_id)
+        return {
+            "crew_id": crew_id,
+            "is_available": is_available
+        }
+
+    async def get_available_crews(self, **kwargs) -> List[str]:
+        return await self.repo.get_available_crews()
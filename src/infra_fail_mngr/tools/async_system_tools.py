@@ -0,0 +1,98 @@
+import asyncio
+from functools import partial
+from typing import Callable, List, Dict, Optional
+
+from ..domain import AsyncSystemRepository
+from .impact_engine import ImpactEngine
+from .system_tools import SystemTools, _ASSIGNMENT_STATUSES
+
+
+class AsyncSystemTools(SystemTools):
+    """
+    SystemTools over an AsyncSystemRepository, every tool is a coroutine.
+    """
+
+    def __init__(
+        self,
+        repo: AsyncSystemRepository,
+        max_dispatch_workers: int = 1,
+        dispatch_timeout: Optional[float] = None,
+        on_crew_assigned: Optional[Callable[[str, str], None]] = None,
+        impact_engine: Optional[ImpactEngine] = None,
+    ):
+        super().__init__(repo, max_dispatch_workers, dispatch_timeout, on_crew_assigned, impact_engine)
+
+    async def detect_failure_nodes(self, **kwargs) -> List[str]:
+        return await self.repo.get_failed_nodes()
+
+    async def detect_failure_nodes_since(self, cursor: Optional[str] = None, **kwargs) -> Dict:
+        get_since = getattr(self.repo, "get_failed_nodes_since", None)
+        if get_since is None:
+            return {"failures": await self.repo.get_failed_nodes(), "cursor": None}
+
+        failures, next_cursor = await get_since(cursor)
+        return {"failures": failures, "cursor": next_cursor}
+
+    async def estimate_impact(self, node_id: str, **kwargs) -> Dict:
+        details = await self.repo.get_node_details(node_id)
+
+        return self._impact_from_details(details)
+
+    async def estimate_impact_batch(self, node_ids: List[str], **kwargs) -> Dict[str, Dict]:
+        return self.impact_engine.score(node_ids, await self._details_batch(node_ids)).report()
+
+    async def rank_impact(self, node_ids: List[str], **kwargs) -> Dict:
+        scores = self.impact_engine.score(node_ids, await self._details_batch(node_ids))
+        return self._ranked(scores)
+
+    async def _details_batch(self, node_ids: List[str]) -> Dict[str, Dict]:
+        get_batch = getattr(self.repo, "get_node_details_batch", None)
+        if get_batch is None:
+            return {node_id: await self.repo.get_node_details(node_id) for node_id in node_ids}
+        return await get_batch(node_ids)
+
+    async def assign_repair_crew(self, node_ids: List[str], crew_ids: List[str], **kwargs) -> Dict:
+        pairs = list(zip(node_ids, crew_ids))
+        if self.max_dispatch_workers > 1 and len(pairs) > 1:
+            outcomes = await self._dispatch_concurrently(pairs)
+        else:
+            outcomes = [await self._assign(node, crew) for node, crew in pairs]
+
+        assignments = {}
+        for (node, crew), success in zip(pairs, outcomes):
+            assignments[node] = _ASSIGNMENT_STATUSES[success]
+            if success and self.on_crew_assigned is not None:
+                self.on_crew_assigned(node, crew)
+
+        return {
+            "status": "completed",
+            "details": assignments,
+        }
+
+    async def _assign(self, node: str, crew: str) -> bool:
+        try:
+            return bool(await self.repo.assign_crew(node, crew))
+        except Exception:
+            return False
+
+    async def _dispatch_concurrently(self, pairs: List[tuple]) -> List[Optional[bool]]:
+        """
+        Await `assign_crew` for every (node, crew) pair, at most `max_dispatch_workers` at a time.
+
+        Results are returned in the order of `pairs`: calls that raise count as failed, calls still running
+        `dispatch_timeout` seconds after they started are None and left running, without holding a slot.
+        """
+        semaphore = asyncio.Semaphore(self.max_dispatch_workers)
+
+        async def assign(node: str, crew: str) -> Optional[bool]:
+            async with semaphore:
+                call = asyncio.ensure_future(self.repo.assign_crew(node, crew))
+                try:
+                    return bool(await asyncio.wait_for(asyncio.shield(call), self.dispatch_timeout))
+                except asyncio.TimeoutError:
+                    call.add_done_callback(partial(self._on_late_assignment, node, crew))
+                    return None
+                except Exception:
+                    return False
+
+        return list(await asyncio.gather(*(assign(node, crew) for node, crew in pairs)))
@@ -0,0 +1,149 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Checks a value against a schema, returns whether it matches
+_Check = Callable[[Any], bool]
+
+TERMINAL_ACTION = "assign_repair_crew"
+
+
+class DecisionValidator:
+    """
+    Structural check of LLM decisions against the parameter schemas of the tools.
+
+    The schemas are compiled once into plain isinstance checks, so that validating a decision costs
+    microseconds and a malformed one is rejected before any tool runs, with an error precise enough
+    to be fed back to the LLM.
+    """
+
+    def __init__(self, schemas: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            schemas (Dict[str, dict]): JSON schema of the parameters of each tool, by tool name,
+                as returned by AgentTools.get_tool_schemas.
+        """
+        self._tools: Dict[str, Tuple[List[str], Dict[str, Tuple[_Check, str]], bool]] = {
+            name: _compile_parameters(schema) for name, schema in schemas.items()
+        }
+
+    def validate(self, decision: Any) -> Optional[str]:
+        """
+        Return the first problem of a decision, or None if it is well-formed.
+
+        Args:
+            decision (Any): The decoded LLM response.
+
+        Returns:
+            str | None: An error message, tool errors keep the "Unknown tool: <name>" wording.
+        """
+        if not isinstance(decision, dict):
+            return "The response must be a JSON object"
+
+        if "tool_calls" in decision:
+            tool_calls = decision["tool_calls"]
+            if not isinstance(tool_calls, list) or not tool_calls:
+                return "'tool_calls' must be a non-empty list"
+            for index, call in enumerate(tool_calls):
+                if not isinstance(call, dict):
+                    return f"tool_calls[{index}] must be an object"
+                if call.get("action") == TERMINAL_ACTION:
+                    return f"tool_calls[{index}]: {TERMINAL_ACTION} must be the only action of its response"
+                error = self._validate_call(call)
+                if error:
+                    return f"tool_calls[{index}]: {error}"
+            return None
+
+        return self._validate_call(decision)
+
+    def _validate_call(self, call: Dict[str, Any]) -> Optional[str]:
+        action = call.get("action")
+        if action is None:
+            return "Missing 'action' field"
+        if not isinstance(action, str):
+            return "'action' must be a string"
+
+        tool = self._tools.get(action)
+        if tool is None:
+            if action == TERMINAL_ACTION:
+                # Dispatched by the agent itself, even when it is not a registered tool
+                return None
+            return f"Unknown tool: {action}"
+
+        arguments = call.get("arguments", {})
+        if not isinstance(arguments, dict):
+            return "'arguments' must be an object"
+
+        required, properties, closed = tool
+        for name in required:
+            if name not in arguments:
+                return f"Missing argument '{name}' for {action}"
+        for name, value in arguments.items():
+            checked = properties.get(name)
+            if checked is None:
+                if closed:
+                    return f"Unexpected argument '{name}' for {action}"
+                continue
+            check, expected = checked
+            if not check(value):
+                return f"Argument '{name}' of {action} must be {expected}, got {_json_type(value)}"
+        return None
+
+
+def _compile_parameters(schema: Dict[str, Any]) -> Tuple[List[str], Dict[str, Tuple[_Check, str]], bool]:
+    properties = {
+        name: (_compile(property_schema), _expected(property_schema))
+        for name, property_schema in schema.get("properties", {}).items()
+    }
+    return list(schema.get("required", [])), properties, schema.get("additionalProperties") is False
+
+
+def _compile(schema: Dict[str, Any]) -> _Check:
+    if "anyOf" in schema:
+        checks = [_compile(option) for option in schema["anyOf"]]
+        return lambda value: any(check(value) for check in checks)
+
+    schema_type = schema.get("type")
+    if schema_type == "string":
+        return lambda value: isinstance(value, str)
+    if schema_type == "integer":
+        return lambda value: isinstance(value, int) and not isinstance(value, bool)
+    if schema_type == "number":
+        return lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+    if schema_type == "boolean":
+        return lambda value: isinstance(value, bool)
+    if schema_type == "null":
+        return lambda value: value is None
+    if schema_type == "object":
+        return lambda value: isinstance(value, dict)
+    if schema_type == "array":
+        if "items" not in schema:
+            return lambda value: isinstance(value, list)
+        check_item = _compile(schema["items"])
+        return lambda value: isinstance(value, list) and all(check_item(item) for item in value)
+    return lambda value: True
+
+
+def _expected(schema: Dict[str, Any]) -> str:
+    if "anyOf" in schema:
+        return " or ".join(_expected(option) for option in schema["anyOf"])
+    schema_type = schema.get("type", "any value")
+    if schema_type == "array" and "items" in schema:
+        return f"array of {_expected(schema['items'])}"
+    return schema_type
+
+
+def _json_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
@@ -0,0 +1,178 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python scoring is used without it
+    np = None
+
+
+# Exact classes, so that booleans aren't taken for numbers
+_NUMBERS = (int, float)
+_COLLECTIONS = (list, tuple, set)
+
+
+def _number(value: Any, default: float = 0.0) -> float:
+    return value if value.__class__ in _NUMBERS and value >= 0 else default
+
+
+def _count(value: Any) -> float:
+    # Fan-out is given either as the number of dependent nodes or as their list
+    if value.__class__ in _COLLECTIONS:
+        return len(value)
+    return _number(value)
+
+
+class ImpactScores:
+    """
+    Impact of a set of failed nodes, one entry per node in each column.
+
+    The columns are NumPy arrays when NumPy is installed, lists otherwise.
+    """
+
+    def __init__(self, node_ids: List[str], population_affected, critical, score):
+        self.node_ids = node_ids
+        self.population_affected = population_affected
+        self.critical = critical
+        self.score = score
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def ranking(self):
+        """
+        Return the positions of the nodes, most impactful first, ties in input order.
+        """
+        if np is not None and isinstance(self.score, np.ndarray):
+            return np.argsort(-self.score, kind="stable")
+        return sorted(range(len(self.node_ids)), key=lambda position: -self.score[position])
+
+    def ranked(self) -> List[str]:
+        """
+        Return the node ids, most impactful first.
+        """
+        ranking = self.ranking()
+        if np is not None and isinstance(ranking, np.ndarray):
+            return np.asarray(self.node_ids, dtype=object)[ranking].tolist()
+        return [self.node_ids[position] for position in ranking]
+
+    def report(self) -> Dict[str, Dict]:
+        """
+        Return the impact of each node, as `SystemTools.estimate_impact` does.
+        """
+        return {
+            node_id: {"population_affected": int(population), "criticality": "High" if critical else "Low"}
+            for node_id, population, critical in zip(self.node_ids, self.population_affected, self.critical)
+        }
+
+
+class ImpactEngine:
+    """
+    Columnar impact model of node failures.
+
+    Node details are loaded into one column per attribute, then every node is scored in a single pass:
+
+        population_affected = (population + downstream * dependent_population) / (1 + redundancy)
+        score = population_affected * (1 + critical_weight * critical_services)
+
+    All the attributes are optional. Without a "population", a node serves `critical_population` users when it is
+    "critical" and `default_population` otherwise. "downstream" is the number (or list) of nodes it supplies,
+    "redundancy" its number of backup feeds and "critical_services" the critical services it supplies, at least one
+    for a "critical" node.
+    """
+
+    def __init__(
+        self,
+        critical_population: int = 5000,
+        default_population: int = 100,
+        dependent_population: int = 100,
+        critical_weight: float = 10.0,
+    ):
+        """
+        Args:
+            critical_population (int): Users of a critical node without a known population.
+            default_population (int): Users of any other node without a known population.
+            dependent_population (int): Users cut off with each downstream node.
+            critical_weight (float): Extra weight of each critical service in the score.
+        """
+        self.critical_population = critical_population
+        self.default_population = default_population
+        self.dependent_population = dependent_population
+        self.critical_weight = critical_weight
+
+    def columns(self, details: Sequence[Dict]) -> Dict[str, List[float]]:
+        """
+        Load the node details into one column per attribute.
+
+        Args:
+            details (Sequence[Dict]): The details of each node, as returned by the repository.
+
+        Returns:
+            Dict[str, List[float]]: The "population", "critical_services", "downstream" and "redundancy" columns.
+        """
+        critical_population, default_population = self.critical_population, self.default_population
+        critical_services = [
+            _number(node.get("critical_services")) or (1 if node.get("critical") else 0) for node in details
+        ]
+        population = [
+            _number(node.get("population"), critical_population if services else default_population)
+            for node, services in zip(details, critical_services)
+        ]
+        downstream = [_count(node.get("downstream")) for node in details]
+        redundancy = [_number(node.get("redundancy")) for node in details]
+        return {
+            "population": population,
+            "critical_services": critical_services,
+            "downstream": downstream,
+            "redundancy": redundancy,
+        }
+
+    def score(self, node_ids: List[str], details_by_node: Dict[str, Dict]) -> ImpactScores:
+        """
+        Score the failure of every node.
+
+        Args:
+            node_ids (List[str]): The failed nodes.
+            details_by_node (Dict[str, Dict]): The details of each node, missing nodes have no known attribute.
+
+        Returns:
+            ImpactScores: The impact of each node, in the order of node_ids.
+        """
+        columns = self.columns([details_by_node.get(node_id) or {} for node_id in node_ids])
+        if np is not None:
+            return self._score_numpy(node_ids, columns)
+        return self._score_python(node_ids, columns)
+
+    def _score_numpy(self, node_ids: List[str], columns: Dict[str, List[float]]) -> ImpactScores:
+        population = np.asarray(columns["population"], dtype=float)
+        critical_services = np.asarray(columns["critical_services"], dtype=float)
+        downstream = np.asarray(columns["downstream"], dtype=float)
+        redundancy = np.asarray(columns["redundancy"], dtype=float)
+
+        affected = np.rint((population + downstream * self.dependent_population) / (1 + redundancy))
+        score = affected * (1 + self.critical_weight * critical_services)
+        return ImpactScores(node_ids, affected.astype(np.int64), critical_services > 0, score)
+
+    def _score_python(self, node_ids: List[str], columns: Dict[str, List[float]]) -> ImpactScores:
+        affected = [
+            round((population + downstream * self.dependent_population) / (1 + redundancy))
+            for population, downstream, redundancy
+            in zip(columns["population"], columns["downstream"], columns["redundancy"])
+        ]
+        critical_services = columns["critical_services"]
+        score = [
+            population * (1 + self.critical_weight * services)
+            for population, services in zip(affected, critical_services)
+        ]
+        return ImpactScores(node_ids, affected, [services > 0 for services in critical_services], score)
+
+    def impact(self, details: Optional[Dict]) -> Dict:
+        """
+        Return the impact of a single node failure.
+
+        Args:
+            details (Dict | None): The details of the node.
+
+        Returns:
+            dict: The "population_affected" and "criticality" of the node.
+        """
+        return self._score_python(["node"], self.columns([details or {}])).report()["node"]
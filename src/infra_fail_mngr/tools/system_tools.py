@@ -1,11 +1,41 @@
-from typing import List, Dict
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, List, Dict, Optional
 
 from ..domain import SystemRepository
+from .impact_engine import ImpactEngine, ImpactScores
+
+# Outcome of an `assign_crew` call: succeeded, failed or raised, still running past its deadline
+_ASSIGNMENT_STATUSES = {True: "Assigned", False: "Failed", None: "Pending"}
 
 
 class SystemTools:
-    def __init__(self, repo: SystemRepository):
+    def __init__(
+        self,
+        repo: SystemRepository,
+        max_dispatch_workers: int = 1,
+        dispatch_timeout: Optional[float] = None,
+        on_crew_assigned: Optional[Callable[[str, str], None]] = None,
+        impact_engine: Optional[ImpactEngine] = None,
+    ):
+        """
+        Args:
+            repo (SystemRepository): The system backend.
+            max_dispatch_workers (int): Maximum number of concurrent `assign_crew` calls.
+                With 1 (default) crews are dispatched sequentially.
+            dispatch_timeout (float | None): Seconds each `assign_crew` call may run, from the moment it
+                starts, when dispatching concurrently. Calls still running then are reported as "Pending".
+            on_crew_assigned (Callable | None): Called with (node_id, crew_id) after every successful
+                assignment, e.g. to invalidate cached crew availability, including "Pending" assignments
+                that succeed later.
+            impact_engine (ImpactEngine | None): Impact model of the node failures, defaults to ImpactEngine().
+        """
         self.repo = repo
+        self.max_dispatch_workers = max_dispatch_workers
+        self.dispatch_timeout = dispatch_timeout
+        self.on_crew_assigned = on_crew_assigned
+        self.impact_engine = impact_engine if impact_engine is not None else ImpactEngine()
 
     def detect_failure_nodes(self, **kwargs) -> List[str]:
         """
@@ -13,6 +43,26 @@ class SystemTools:
         """
         return self.repo.get_failed_nodes()
 
+    def detect_failure_nodes_since(self, cursor: Optional[str] = None, **kwargs) -> Dict:
+        """
+        Scans the network for nodes that broke since a previous scan.
+
+        Args:
+            cursor (str | None): Cursor returned by the previous scan, None scans for every broken node.
+
+        Returns:
+            dict: A dictionary containing:
+                - "failures" (List[str]): Nodes that broke since the cursor. Without repository support
+                  for incremental scans, every broken node.
+                - "cursor" (str | None): Cursor for the next scan.
+        """
+        get_since = getattr(self.repo, "get_failed_nodes_since", None)
+        if get_since is None:
+            return {"failures": self.repo.get_failed_nodes(), "cursor": None}
+
+        failures, next_cursor = get_since(cursor)
+        return {"failures": failures, "cursor": next_cursor}
+
     def estimate_impact(self, node_id: str, **kwargs) -> Dict:
         """
         Estimate the operational impact of a node failure.
@@ -27,9 +77,52 @@ class SystemTools:
         """
         details = self.repo.get_node_details(node_id)
 
+        return self._impact_from_details(details)
+
+    def estimate_impact_batch(self, node_ids: List[str], **kwargs) -> Dict[str, Dict]:
+        """
+        Estimate the operational impact of multiple node failures at once.
+
+        Args:
+            node_ids (List[str]): Identifiers of the affected nodes.
+
+        Returns:
+            dict: Mapping of node_id to the same dictionary `estimate_impact` returns.
+        """
+        return self.impact_engine.score(node_ids, self._details_batch(node_ids)).report()
+
+    def rank_impact(self, node_ids: List[str], **kwargs) -> Dict:
+        """
+        Rank node failures by impact, to prioritize their repair.
+
+        Args:
+            node_ids (List[str]): Identifiers of the affected nodes.
+
+        Returns:
+            dict: A dictionary containing:
+                - "node_ids" (List[str]): The nodes, most impactful first.
+                - "population_affected" (List[int]): Estimated number of impacted users of each node.
+                - "criticality" (List[str]): Impact level of each node ("High" or "Low").
+        """
+        scores = self.impact_engine.score(node_ids, self._details_batch(node_ids))
+        return self._ranked(scores)
+
+    def _details_batch(self, node_ids: List[str]) -> Dict[str, Dict]:
+        get_batch = getattr(self.repo, "get_node_details_batch", None)
+        if get_batch is None:
+            return {node_id: self.repo.get_node_details(node_id) for node_id in node_ids}
+        return get_batch(node_ids)
+
+    def _impact_from_details(self, details: Dict) -> Dict:
+        return self.impact_engine.impact(details)
+
+    @staticmethod
+    def _ranked(scores: ImpactScores) -> Dict:
+        ranking = scores.ranking()
         return {
-            "population_affected": 5000 if details.get("critical") else 100,
-            "criticality": "High" if details.get("critical") else "Low"
+            "node_ids": [scores.node_ids[position] for position in ranking],
+            "population_affected": [int(scores.population_affected[position]) for position in ranking],
+            "criticality": ["High" if scores.critical[position] else "Low" for position in ranking],
         }
 
     def assign_repair_crew(self, node_ids: List[str], crew_ids: List[str], **kwargs) -> Dict:
@@ -43,14 +136,97 @@ class SystemTools:
         Returns:
             dict: A dictionary containing:
                 - "status" (str): Assignment process status ("completed").
-                - "details" (dict): Mapping of node_id to assignment result ("Assigned" or "Failed").
+                - "details" (dict): Mapping of node_id to assignment result ("Assigned", "Failed", or
+                  "Pending" when the call is still running after `dispatch_timeout`).
         """
+        pairs = list(zip(node_ids, crew_ids))
+        if self.max_dispatch_workers > 1 and len(pairs) > 1:
+            outcomes = self._dispatch_concurrently(pairs)
+        else:
+            outcomes = [self._assign(node, crew) for node, crew in pairs]
+
         assignments = {}
-        for node, crew in zip(node_ids, crew_ids):
-            success = self.repo.assign_crew(node, crew)
-            assignments[node] = "Assigned" if success else "Failed"
+        for (node, crew), success in zip(pairs, outcomes):
+            assignments[node] = _ASSIGNMENT_STATUSES[success]
+            if success and self.on_crew_assigned is not None:
+                self.on_crew_assigned(node, crew)
 
         return {
             "status": "completed",
             "details": assignments,
         }
+
+    def _assign(self, node: str, crew: str) -> bool:
+        try:
+            return bool(self.repo.assign_crew(node, crew))
+        except Exception:
+            return False
+
+    def _dispatch_concurrently(self, pairs: List[tuple]) -> List[Optional[bool]]:
+        """
+        Run `assign_crew` for every (node, crew) pair on a bounded thread pool.
+
+        Results are returned in the order of `pairs`: calls that raise count as failed, calls still running
+        `dispatch_timeout` seconds after their worker started them are None and left running.
+        """
+        workers = min(self.max_dispatch_workers, len(pairs))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        started: List[Optional[float]] = [None] * len(pairs)
+
+        def assign(index: int, node: str, crew: str):
+            started[index] = time.monotonic()
+            return self.repo.assign_crew(node, crew)
+
+        try:
+            futures = [executor.submit(assign, index, node, crew) for index, (node, crew) in enumerate(pairs)]
+            self._await_dispatch(futures, started, workers)
+
+            outcomes = []
+            for (node, crew), future in zip(pairs, futures):
+                if future.done():
+                    outcomes.append(not future.cancelled() and self._succeeded(future))
+                else:
+                    outcomes.append(None)
+                    future.add_done_callback(partial(self._on_late_assignment, node, crew))
+            return outcomes
+        finally:
+            # Don't wait for the calls still running
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _await_dispatch(self, futures: List[Future], started: List[Optional[float]], workers: int):
+        """
+        Wait until every call is done or past its deadline, measured from when its worker started it.
+        """
+        timeout = self.dispatch_timeout
+        if timeout is None:
+            wait(futures)
+            return
+        while True:
+            waiting = [index for index, future in enumerate(futures) if not future.done()]
+            now = time.monotonic()
+            deadlines = [started[index] + timeout for index in waiting if started[index] is not None]
+            active = [deadline for deadline in deadlines if deadline > now]
+            queued = [index for index in waiting if started[index] is None]
+            if queued and len(deadlines) - len(active) >= workers:
+                # Every worker is held by a call past its deadline, the queued calls would never start
+                for index in queued:
+                    futures[index].cancel()
+                continue
+            if not active and not queued:
+                return
+            wait(
+                [futures[index] for index in waiting],
+                timeout=min(active) - now if active else timeout,
+                return_when=FIRST_COMPLETED,
+            )
+
+    @staticmethod
+    def _succeeded(future) -> bool:
+        try:
+            return bool(future.result())
+        except Exception:
+            return False
+
+    def _on_late_assignment(self, node: str, crew: str, future):
+        if not future.cancelled() and self._succeeded(future) and self.on_crew_assigned is not None:
+            self.on_crew_assigned(node, crew)
@@ -0,0 +1,151 @@
+import inspect
+import types
+import typing
+import weakref
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class ToolRegistry:
+    """
+    Name-to-tool mapping built once, with the tool descriptions and parameter schemas precomputed.
+
+    A registry holds the tools it is given, e.g. the bound methods of one AgentTools instance.
+    Only the descriptions and schemas are shared: they are cached per underlying function for as
+    long as the function is alive, so registries built for different AgentTools instances reflect
+    each method once.
+    """
+
+    def __init__(self, tools: List[Callable]):
+        """
+        Args:
+            tools (List[Callable]): The tools to register, in the order they are described to the LLM.
+        """
+        self._tools: Dict[str, Callable] = {}
+        self.schemas: Dict[str, Dict[str, Any]] = {}
+        descriptions = []
+
+        for func in tools:
+            name = func.__name__
+            description, schema = describe_tool(func)
+            descriptions.append(description)
+            self._tools.setdefault(name, func)
+            self.schemas.setdefault(name, schema)
+
+        self.descriptions = "\n".join(descriptions)
+
+    def get(self, name: str) -> Optional[Callable]:
+        """
+        Return the registered tool with the given name, or None.
+        """
+        return self._tools.get(name)
+
+    def names(self) -> List[str]:
+        """
+        Return the names of the registered tools.
+        """
+        return list(self._tools)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+
+def describe_tool(func: Callable) -> Tuple[str, Dict[str, Any]]:
+    """
+    Return the description line and the JSON schema of the parameters of a tool.
+
+    Args:
+        func (Callable): A function or bound method.
+
+    Returns:
+        tuple: The "name(signature) - docstring" line and the parameters schema.
+    """
+    if isinstance(func, types.MethodType):
+        return _describe(func.__func__, True)
+    return _describe(func, False)
+
+
+# Weak keys, so that per-agent closures and lambdas aren't kept alive by the cache
+_DESCRIPTIONS: "weakref.WeakKeyDictionary[Callable, Dict[bool, Tuple[str, Dict[str, Any]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _describe(func: Callable, bound: bool) -> Tuple[str, Dict[str, Any]]:
+    try:
+        cached = _DESCRIPTIONS.setdefault(func, {})
+    except TypeError:  # Not weakly referenceable, e.g. a builtin
+        return _reflect(func, bound)
+    if bound not in cached:
+        cached[bound] = _reflect(func, bound)
+    return cached[bound]
+
+
+def _reflect(func: Callable, bound: bool) -> Tuple[str, Dict[str, Any]]:
+    sig = inspect.signature(func)
+    if bound:
+        # Drop `self`, as inspect.signature does for bound methods
+        sig = sig.replace(parameters=list(sig.parameters.values())[1:])
+    doc = inspect.getdoc(func)
+
+    return f"{func.__name__}{sig} - {doc}", _parameters_schema(sig)
+
+
+def _parameters_schema(sig: inspect.Signature) -> Dict[str, Any]:
+    properties = {}
+    required = []
+    var_keyword = False
+    for param in sig.parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            var_keyword = var_keyword or param.kind == param.VAR_KEYWORD
+            continue
+        properties[param.name] = annotation_schema(param.annotation)
+        if param.default is param.empty:
+            required.append(param.name)
+
+    schema = {
+        "type": "object",
+        "properties": properties,
+        "required": required,
+    }
+    if not var_keyword:
+        schema["additionalProperties"] = False
+    return schema
+
+
+_SCALAR_SCHEMAS = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    datetime: {"type": "string", "format": "date-time"},
+    type(None): {"type": "null"},
+}
+
+
+def annotation_schema(annotation: Any) -> Dict[str, Any]:
+    """
+    Map a type annotation to a JSON schema, unknown annotations accept anything.
+    """
+    if annotation in _SCALAR_SCHEMAS:
+        return dict(_SCALAR_SCHEMAS[annotation])
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if annotation is list or origin is list:
+        schema = {"type": "array"}
+        if args:
+            schema["items"] = annotation_schema(args[0])
+        return schema
+
+    if annotation is dict or origin is dict:
+        return {"type": "object"}
+
+    if origin is typing.Union or origin is types.UnionType:
+        return {"anyOf": [annotation_schema(arg) for arg in args]}
+
+    return {}
@@ -0,0 +1,164 @@
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from ..domain import AgentRepository
+
+_UNKNOWN = -1
+
+
+class TravelTimeMatrix:
+    """
+    Cache of origin × destination travel times, one compact integer array per origin.
+
+    Only the cells that are not known yet are fetched from the repository, in a single call when
+    it implements BatchAgentRepository. Crews are mapped to their location, so a crew that moves
+    only costs the row of its new location, and only if that row is not known yet.
+
+    The matrix is thread-safe: the indexes, rows and crew locations are guarded by a lock, which is
+    not held while the repository is called.
+    """
+
+    def __init__(self, repo: AgentRepository):
+        """
+        Args:
+            repo (AgentRepository): Source of travel times and crew locations.
+        """
+        self.repo = repo
+        self._origin_index: Dict[str, int] = {}
+        self._destination_index: Dict[str, int] = {}
+        self._rows: List[array] = []
+        self._crew_locations: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, origin: str, destination: str) -> int:
+        """
+        Return the travel time between two locations, fetching it if unknown.
+        """
+        self.ensure([origin], [destination])
+        with self._lock:
+            return self._rows[self._origin_index[origin]][self._destination_index[destination]]
+
+    def matrix(self, origins: List[str], destinations: List[str]) -> List[List[int]]:
+        """
+        Return the travel times from every origin to every destination.
+
+        Returns:
+            List[List[int]]: One row per origin, one column per destination.
+        """
+        self.ensure(origins, destinations)
+        with self._lock:
+            columns = [self._destination_index[destination] for destination in destinations]
+            return [[row[c] for c in columns] for row in (self._rows[self._origin_index[o]] for o in origins)]
+
+    def crew_matrix(self, crew_ids: List[str], destinations: List[str]) -> List[List[int]]:
+        """
+        Return the travel times from the location of every crew to every destination.
+
+        Returns:
+            List[List[int]]: One row per crew, one column per destination.
+        """
+        return self.matrix([self.crew_location(crew_id) for crew_id in crew_ids], destinations)
+
+    def ensure(self, origins: List[str], destinations: List[str]) -> None:
+        """
+        Fetch the travel times missing between the given origins and destinations.
+        """
+        with self._lock:
+            missing = self._missing(origins, destinations)
+        if missing:
+            self._store(self._fetch(missing))
+
+    def _missing(self, origins: List[str], destinations: List[str]) -> Dict[str, List[str]]:
+        for origin in origins:
+            if origin not in self._origin_index:
+                self._origin_index[origin] = len(self._rows)
+                self._rows.append(array("q", [_UNKNOWN]) * len(self._destination_index))
+        new_destinations = [d for d in dict.fromkeys(destinations) if d not in self._destination_index]
+        if new_destinations:
+            for destination in new_destinations:
+                self._destination_index[destination] = len(self._destination_index)
+            padding = array("q", [_UNKNOWN]) * len(new_destinations)
+            for row in self._rows:
+                row.extend(padding)
+
+        missing = {}
+        columns = [(d, self._destination_index[d]) for d in dict.fromkeys(destinations)]
+        for origin in dict.fromkeys(origins):
+            row = self._rows[self._origin_index[origin]]
+            gaps = [d for d, c in columns if row[c] == _UNKNOWN]
+            if gaps:
+                missing[origin] = gaps
+        return missing
+
+    def _fetch(self, missing: Dict[str, List[str]]) -> List[Tuple[str, str, int]]:
+        get_batch = getattr(self.repo, "estimate_travel_times", None)
+        if get_batch is not None:
+            # One rectangular call, known cells in the block are refreshed along the way
+            origins = list(missing)
+            destinations = list(dict.fromkeys(d for gaps in missing.values() for d in gaps))
+            times = get_batch(origins, destinations)
+            return [
+                (origin, destination, time)
+                for origin, origin_times in zip(origins, times)
+                for destination, time in zip(destinations, origin_times)
+            ]
+
+        return [
+            (origin, destination, self.repo.estimate_travel_time(origin, destination))
+            for origin, gaps in missing.items()
+            for destination in gaps
+        ]
+
+    def _store(self, times: List[Tuple[str, str, int]]) -> None:
+        with self._lock:
+            for origin, destination, time in times:
+                self._rows[self._origin_index[origin]][self._destination_index[destination]] = int(time)
+
+    # Crew locations
+
+    def crew_location(self, crew_id: str) -> str:
+        """
+        Return the location of a crew, as last seen by the matrix.
+        """
+        with self._lock:
+            location = self._crew_locations.get(crew_id)
+        if location is None:
+            location = self.repo.crew_location(crew_id)
+            with self._lock:
+                # Keep a location recorded by a concurrent move
+                location = self._crew_locations.setdefault(crew_id, location)
+        return location
+
+    def move_crew(self, crew_id: str, location: Optional[str] = None) -> None:
+        """
+        Record that a crew moved, None looks its location up again on next use.
+        """
+        with self._lock:
+            if location is None:
+                self._crew_locations.pop(crew_id, None)
+            else:
+                self._crew_locations[crew_id] = location
+
+    def on_crew_assigned(self, node_id: str, crew_id: str) -> None:
+        """
+        Assignment listener for SystemTools, an assigned crew heads to the node.
+        """
+        self.move_crew(crew_id, node_id)
+
+    def invalidate_origin(self, origin: str) -> None:
+        """
+        Forget the travel times from a location, e.g. after a road closure.
+        """
+        with self._lock:
+            index = self._origin_index.get(origin)
+            if index is not None:
+                row = self._rows[index]
+                row[:] = array("q", [_UNKNOWN]) * len(row)
+
+    def __len__(self) -> int:
+        """
+        Number of known travel times.
+        """
+        with self._lock:
+            return sum(len(row) - row.count(_UNKNOWN) for row in self._rows)
@@ -0,0 +1,3 @@
+from .tracer import NOOP_TRACER, NoopTracer, Span, SpanExporter, Tracer
+from .exporters import InMemoryExporter, JSONLExporter, OTLPJSONExporter, to_otlp
+from .traced_repository import TracedRepository
@@ -0,0 +1,122 @@
+import json
+import threading
+from typing import Any, Dict, List
+
+from .tracer import Span
+
+
+class InMemoryExporter:
+    """
+    Keeps every finished span, for tests and interactive inspection.
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JSONLExporter:
+    """
+    Appends every finished span to a file, one JSON object per line (see Span.to_dict).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): File receiving the spans, it is truncated on open.
+        """
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line)
+            self._file.write("\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class OTLPJSONExporter(JSONLExporter):
+    """
+    Appends every finished span to a file in the OTLP/JSON format, one ExportTraceServiceRequest per line.
+
+    This is the format of the OpenTelemetry Collector file exporter and receiver, so the file can be replayed into
+    any OpenTelemetry backend.
+    """
+
+    def __init__(self, path: str, service_name: str = "infra_fail_mngr"):
+        """
+        Args:
+            path (str): File receiving the spans, it is truncated on open.
+            service_name (str): The "service.name" resource attribute.
+        """
+        super().__init__(path)
+        self.service_name = service_name
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(to_otlp([span], self.service_name))
+        with self._lock:
+            self._file.write(line)
+            self._file.write("\n")
+
+
+def to_otlp(spans: List[Span], service_name: str = "infra_fail_mngr") -> Dict[str, Any]:
+    """
+    Convert spans to an OTLP/JSON ExportTraceServiceRequest.
+
+    Args:
+        spans (List[Span]): Finished spans.
+        service_name (str): The "service.name" resource attribute.
+
+    Returns:
+        dict: The request, ready for json.dumps.
+    """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "infra_fail_mngr"},
+                "spans": [_otlp_span(span) for span in spans],
+            }],
+        }]
+    }
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # SPAN_KIND_INTERNAL
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_unix_nano),
+        "endTimeUnixNano": str(span.end_unix_nano),
+        "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+        # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+        "status": {"code": 2, "message": span.error} if span.error else {},
+    }
+    if span.parent_id is not None:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
@@ -0,0 +1,52 @@
+import inspect
+from typing import Any, Dict
+
+from .tracer import Tracer
+
+
+class TracedRepository:
+    """
+    Repository wrapper opening a span around every method call, e.g. "repo.get_failed_nodes".
+
+    Methods are looked up on the wrapped repository, so optional capabilities stay detectable with getattr.
+    Coroutine methods are awaited within their span.
+    """
+
+    def __init__(self, repo: Any, tracer: Tracer, prefix: str = "repo"):
+        """
+        Args:
+            repo (Any): The repository to trace, sync or async.
+            tracer (Tracer): Receives the spans.
+            prefix (str): Prefix of the span names.
+        """
+        self.repo = repo
+        self.tracer = tracer
+        self.prefix = prefix
+        self._methods: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not set in __init__
+        if name.startswith("__") or name in ("repo", "tracer", "prefix", "_methods"):
+            raise AttributeError(name)
+        method = self._methods.get(name)
+        if method is None:
+            method = getattr(self.repo, name)
+            if callable(method):
+                method = self._traced(name, method)
+                self._methods[name] = method
+        return method
+
+    def _traced(self, name: str, method):
+        span_name = f"{self.prefix}.{name}"
+        tracer = self.tracer
+
+        if inspect.iscoroutinefunction(method):
+            async def traced_async(*args, **kwargs):
+                with tracer.span(span_name):
+                    return await method(*args, **kwargs)
+            return traced_async
+
+        def traced(*args, **kwargs):
+            with tracer.span(span_name):
+                return method(*args, **kwargs)
+        return traced
@@ -0,0 +1,184 @@
+import contextvars
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Protocol
+
+
+class SpanExporter(Protocol):
+    """Receives every finished span of a Tracer."""
+
+    def export(self, span: "Span") -> None:
+        ...
+
+
+class Span:
+    """
+    A timed operation of the agent, e.g. one state, one LLM call or one tool call.
+
+    Times are read from a monotonic clock, in seconds. `start_unix_nano` and `end_unix_nano` map them to wall-clock
+    time for exporters.
+    """
+
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent_id", "start", "end", "error", "_tracer", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = 0.0
+        self.end = 0.0
+        self.error: Optional[str] = None
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def start_unix_nano(self) -> int:
+        return self._tracer.to_unix_nano(self.start)
+
+    @property
+    def end_unix_nano(self) -> int:
+        return self._tracer.to_unix_nano(self.end)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self._tracer._finish(self)
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.duration * 1000:.3f} ms)"
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Records spans and aggregates their latency by name.
+
+    Spans nest through a context variable, so a span opened within another one, in the same thread or task, becomes
+    its child. Work handed to other threads passes its parent explicitly.
+    """
+
+    enabled = True
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        """
+        Args:
+            exporter (SpanExporter | None): Receives every finished span, only the latency totals are kept without it.
+        """
+        self.exporter = exporter
+        self._lock = threading.Lock()
+        self._totals: Dict[str, List[float]] = {}
+        # Anchor of the monotonic clock to wall-clock time
+        self._unix_nano = time.time_ns()
+        self._perf = time.perf_counter()
+
+    def span(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """
+        Return a span to use as a context manager, timed from enter to exit.
+
+        Args:
+            name (str): Name of the operation, e.g. "state.REPAIR_PLANNING" or "tool.get_weather_at_location".
+            parent (Span | None): Parent span, defaults to the span currently open in this thread or task.
+            **attributes: Attributes of the span.
+        """
+        return Span(self, name, parent if parent is not None else _current_span.get(), attributes)
+
+    def current(self) -> Optional[Span]:
+        """
+        Return the span currently open in this thread or task.
+        """
+        return _current_span.get()
+
+    def to_unix_nano(self, timestamp: float) -> int:
+        return self._unix_nano + int((timestamp - self._perf) * 1e9)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            totals = self._totals.get(span.name)
+            if totals is None:
+                self._totals[span.name] = [1, span.duration]
+            else:
+                totals[0] += 1
+                totals[1] += span.duration
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def latency_breakdown(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return the latency of every span name, slowest total first.
+
+        Returns:
+            dict: Maps each span name to its "count", "total_seconds" and "mean_seconds".
+        """
+        with self._lock:
+            totals = sorted(self._totals.items(), key=lambda item: -item[1][1])
+        return {
+            name: {"count": count, "total_seconds": total, "mean_seconds": total / count}
+            for name, (count, total) in totals
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer:
+    """
+    Tracer used when tracing is disabled, every span is one shared object doing nothing.
+    """
+
+    enabled = False
+
+    def span(self, name: str, parent: Optional[Span] = None, **attributes) -> _NoopSpan:
+        return _NOOP_SPAN
+
+    def current(self) -> Optional[Span]:
+        return None
+
+    def latency_breakdown(self) -> Dict[str, Dict[str, float]]:
+        return {}
+
+
+NOOP_TRACER = NoopTracer()
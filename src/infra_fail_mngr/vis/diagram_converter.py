@@ -1,16 +1,15 @@
 import base64
 import json
 import zlib
-from typing import List, Dict
+from typing import Dict, Iterable, Mapping
 
 
-def step_history_to_flow_diagram(step_history: List[Dict]) -> str:
+def step_history_to_flow_diagram(step_history: Iterable[Mapping]) -> str:
     """
     Converts the step history to a flow diagram using Mermaid syntax.
-    """
-    if not step_history:
-        return "graph TD\n    Start[No execution history]"
 
+    The history is read in a single pass, so a StepHistory streams its spilled steps instead of loading them.
+    """
     lines = ["graph TD"]
 
     states_seen = set()
@@ -36,6 +35,9 @@ def step_history_to_flow_diagram(step_history: List[Dict]) -> str:
 
         lines.append(f"    {from_state} -->|{label}| {to_state}")
 
+    if len(lines) == 1:
+        return "graph TD\n    Start[No execution history]"
+
     lines.append("")
     lines.append("    classDef finalState fill:#90EE90,stroke:#2E8B57,stroke-width:3px")
     lines.append("    class FINAL finalState")
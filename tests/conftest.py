@@ -7,9 +7,19 @@ from infra_fail_mngr.tools import SystemTools, AgentTools
 @pytest.fixture
 def system_repo(mocker):
     system_repo = mocker.Mock()
+    # A plain SystemRepository, rescheduling falls back to get_failed_nodes
+    del system_repo.get_failed_nodes_since
+    # Impact analysis reads get_node_details, see batch_system_repo for the batch path
+    del system_repo.get_node_details_batch
     system_repo.get_failed_nodes.return_value = []
     return system_repo
 
+@pytest.fixture
+def batch_system_repo(system_repo, mocker):
+    # A repository fetching node details in one call
+    system_repo.get_node_details_batch = mocker.Mock(return_value={})
+    return system_repo
+
 @pytest.fixture
 def agent_repo(mocker):
     agent_repo = mocker.Mock()
@@ -127,3 +127,32 @@ def test_llm_timeout_raises(e2e_agent_base, system_repo):
     agent.run_to_completion()
     # FAILURE: agent should NOT be in INIT state after timeout (contradicts no raise)
     assert agent.state == State.INIT
+
+def test_impact_analysis_reads_node_details(e2e_agent_base, system_repo):
+    agent = e2e_agent_base
+    system_repo.get_failed_nodes.return_value = ["node1"]
+    system_repo.get_node_details.return_value = {"critical": False}
+
+    agent.run_step()
+    agent.run_step()
+    agent.run_step()
+
+    assert agent.state == State.REPAIR_PLANNING
+    assert agent.memory['impact_report'] == {"node1": {"population_affected": 100, "criticality": "Low"}}
+    system_repo.get_node_details.assert_called_once_with("node1")
+
+def test_impact_analysis_reads_node_details_in_one_batch(e2e_agent_base, batch_system_repo):
+    agent = e2e_agent_base
+    batch_system_repo.get_failed_nodes.return_value = ["node1", "node2"]
+    batch_system_repo.get_node_details_batch.return_value = {"node1": {"critical": True}, "node2": {"critical": False}}
+
+    agent.run_step()
+    agent.run_step()
+    agent.run_step()
+
+    assert agent.memory['impact_report'] == {
+        "node1": {"population_affected": 5000, "criticality": "High"},
+        "node2": {"population_affected": 100, "criticality": "Low"},
+    }
+    batch_system_repo.get_node_details_batch.assert_called_once_with(["node1", "node2"])
+    batch_system_repo.get_node_details.assert_not_called()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+
+import pytest
+
+from infra_fail_mngr.agent import AsyncInfraAgent, InfraAgent
+from infra_fail_mngr.llm import AsyncLLMServiceImpl, LLMClientImpl, LLMServiceImpl
+from infra_fail_mngr.llm.llm_client import AsyncLLMClientImpl
+from infra_fail_mngr.states import State
+from infra_fail_mngr.tools import AsyncAgentTools, AsyncSystemTools, DecisionValidator
+
+
+# Decisions as a model writes them, without the phrases LLMServiceImpl hands back unparsed
+def _agent(responses, system_tools, agent_tools):
+    llm_service = LLMServiceImpl(LLMClientImpl([json.dumps(response) for response in responses]))
+    validator = DecisionValidator(agent_tools.get_tool_schemas())
+    return InfraAgent(llm_service, system_tools, agent_tools, decision_validator=validator)
+
+
+@pytest.fixture
+def agent_in_repair_planning(system_repo):
+    system_repo.get_failed_nodes.return_value = ["node1"]
+    system_repo.get_node_details.return_value = {"critical": True}
+
+    def build(responses, system_tools, agent_tools):
+        agent = _agent(responses, system_tools, agent_tools)
+        while agent.state != State.REPAIR_PLANNING:
+            agent.run_step()
+        return agent
+    return build
+
+
+def describe_agent_with_llm_service():
+    def it_runs_the_decisions(agent_in_repair_planning, system_tools, agent_tools, agent_repo):
+        agent_repo.get_weather_at_location.return_value = 20
+        agent = agent_in_repair_planning([
+            {"thoughts": "Check the weather", "action": "get_weather_at_location", "arguments": {"location": "node1"}},
+        ], system_tools, agent_tools)
+
+        assert agent.handle_planning_step() is True
+        assert agent.memory["plan_history"][0]["role"] == "tool_output"
+        agent_repo.get_weather_at_location.assert_called_once_with("node1")
+
+    def it_reports_validation_errors_to_the_llm(agent_in_repair_planning, system_tools, agent_tools, agent_repo):
+        agent = agent_in_repair_planning([
+            {"thoughts": "Check the weather", "action": "get_weather_at_location", "arguments": {"location": 5}},
+        ], system_tools, agent_tools)
+
+        assert agent.handle_planning_step() is False
+        assert agent.memory["plan_history"] == [{
+            "role": "error",
+            "message": "Argument 'location' of get_weather_at_location must be string, got integer",
+        }]
+        agent_repo.get_weather_at_location.assert_not_called()
+
+    def it_runs_tool_calls_in_one_round_trip(agent_in_repair_planning, system_tools, agent_tools, agent_repo):
+        agent_repo.get_weather_at_location.return_value = 20
+        agent_repo.estimate_repair_time.return_value = 60
+        agent = agent_in_repair_planning([
+            {"thoughts": "Check the site", "tool_calls": [
+                {"action": "get_weather_at_location", "arguments": {"location": "node1"}},
+                {"action": "estimate_repair_time", "arguments": {"node": "node1"}},
+            ]},
+        ], system_tools, agent_tools)
+
+        assert agent.handle_planning_step() is True
+        entry = agent.memory["plan_history"][0]
+        assert entry["role"] == "tool_outputs"
+        assert [output["tool"] for output in entry["results"]] == ["get_weather_at_location", "estimate_repair_time"]
+        assert agent.llm_service.client.response_index == 1
+
+    def it_dispatches_the_crews(system_repo, system_tools, agent_tools):
+        system_repo.get_failed_nodes.side_effect = [["node1"], ["node1"]]
+        system_repo.get_node_details.return_value = {"critical": True}
+        system_repo.assign_crew.return_value = True
+        agent = _agent([
+            {"thoughts": "Send crew1", "action": "assign_repair_crew",
+             "arguments": {"node_ids": ["node1"], "crew_ids": ["crew1"]}},
+        ], system_tools, agent_tools)
+
+        agent.run_to_completion()
+
+        assert agent.state == State.FINAL
+        system_repo.assign_crew.assert_called_once_with("node1", "crew1")
+
+
+def describe_async_agent_with_llm_service():
+    def it_reports_validation_errors_to_the_llm(mocker):
+        system_repo = mocker.AsyncMock()
+        del system_repo.get_node_details_batch
+        del system_repo.get_failed_nodes_since
+        system_repo.get_failed_nodes.return_value = ["node1"]
+        system_repo.get_node_details.return_value = {"critical": True}
+        agent_repo = mocker.AsyncMock()
+        system_tools = AsyncSystemTools(system_repo)
+        agent_tools = AsyncAgentTools(agent_repo, [system_tools.assign_repair_crew])
+        llm_service = AsyncLLMServiceImpl(AsyncLLMClientImpl([json.dumps({
+            "thoughts": "Check the weather", "action": "get_weather_at_location", "arguments": {"location": 5},
+        })]))
+        agent = AsyncInfraAgent(
+            llm_service, system_tools, agent_tools,
+            decision_validator=DecisionValidator(agent_tools.get_tool_schemas()),
+        )
+        agent.state = State.REPAIR_PLANNING
+        agent.memory = {"failures": ["node1"], "impact_report": {}, "plan_history": []}
+
+        assert asyncio.run(agent.handle_planning_step()) is False
+        assert agent.memory["plan_history"][0]["message"] == (
+            "Argument 'location' of get_weather_at_location must be string, got integer"
+        )
+
+    def it_runs_tool_calls_in_one_round_trip(mocker):
+        system_repo = mocker.AsyncMock()
+        agent_repo = mocker.AsyncMock()
+        agent_repo.get_weather_at_location.return_value = 20
+        agent_repo.estimate_repair_time.return_value = 60
+        system_tools = AsyncSystemTools(system_repo)
+        agent_tools = AsyncAgentTools(agent_repo, [system_tools.assign_repair_crew])
+        llm_service = AsyncLLMServiceImpl(AsyncLLMClientImpl([json.dumps({"thoughts": "Check the site", "tool_calls": [
+            {"action": "get_weather_at_location", "arguments": {"location": "node1"}},
+            {"action": "estimate_repair_time", "arguments": {"node": "node1"}},
+        ]})]))
+        agent = AsyncInfraAgent(llm_service, system_tools, agent_tools)
+        agent.state = State.REPAIR_PLANNING
+        agent.memory = {"failures": ["node1"], "impact_report": {}, "plan_history": []}
+
+        assert asyncio.run(agent.handle_planning_step()) is True
+        assert agent.memory["plan_history"][0]["role"] == "tool_outputs"
+        assert len(agent.memory["plan_history"][0]["results"]) == 2
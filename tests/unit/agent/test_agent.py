@@ -1,9 +1,16 @@
 import json
+import logging
+import threading
+import time
 
 import pytest
 
 from src.infra_fail_mngr.agent.agent import InfraAgent
+from src.infra_fail_mngr.agent.step_history import DEFAULT_MAX_IN_MEMORY, StepHistory
 from src.infra_fail_mngr.states import State
+from src.infra_fail_mngr.tools.decision_validator import DecisionValidator
+from src.infra_fail_mngr.tools.tool_registry import ToolRegistry
+from src.infra_fail_mngr.tracing import InMemoryExporter, Tracer
 
 
 @pytest.fixture
@@ -15,6 +22,13 @@ def agent_base(mocker):
     return InfraAgent(llm_service, _system_tools, _agent_tools)
 
 
+def _wait_for_call(mock, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not mock.call_count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return mock.call_count
+
+
 def describe_infra_agent():
     def describe_run_step():
         def describe_when_state_is_init():
@@ -29,6 +43,12 @@ def describe_infra_agent():
                 assert agent.memory["impact_report"] == {}
                 assert agent.memory["plan_history"] == []
 
+            def it_logs_the_state(agent, caplog):
+                with caplog.at_level(logging.INFO, logger="infra_fail_mngr"):
+                    agent.run_step()
+
+                assert "--- STATE: INIT ---" in caplog.messages
+
             def it_transitions_to_failure_detection(agent):
                 agent.run_step()
 
@@ -48,7 +68,7 @@ def describe_infra_agent():
             def describe_and_no_failures():
                 @pytest.fixture
                 def agent(agent_in_failure_detection):
-                    agent_in_failure_detection.sys.detect_failure_nodes.return_value = []
+                    agent_in_failure_detection.sys.detect_failure_nodes_since.return_value = {"failures": [], "cursor": "c1"}
                     return agent_in_failure_detection
 
                 def it_transitions_to_final(agent):
@@ -60,15 +80,23 @@ def describe_infra_agent():
                     assert agent.step_history[-1]["action"] == "no_failures_detected"
                     assert agent.step_history[-1]["data"] == {}
 
-                def it_calls_detect_failure_nodes(agent):
+                def it_scans_every_failure(agent):
+                    agent.run_step()
+
+                    agent.sys.detect_failure_nodes_since.assert_called_once_with(cursor=None)
+
+                def it_stores_the_cursor(agent):
                     agent.run_step()
 
-                    agent.sys.detect_failure_nodes.assert_called_once()
+                    assert agent.memory["failure_cursor"] == "c1"
 
             def describe_and_has_failures():
                 @pytest.fixture
                 def agent(agent_in_failure_detection):
-                    agent_in_failure_detection.sys.detect_failure_nodes.return_value = ["node-1", "node-2", "node-3"]
+                    agent_in_failure_detection.sys.detect_failure_nodes_since.return_value = {
+                        "failures": ["node-1", "node-2", "node-3"],
+                        "cursor": "c1",
+                    }
                     return agent_in_failure_detection
 
                 def it_stores_all_failures(agent):
@@ -86,18 +114,17 @@ def describe_infra_agent():
             def describe_and_estimates_impact_low():
                 @pytest.fixture
                 def agent(agent_in_impact_analysis):
-                    agent_in_impact_analysis.sys.estimate_impact.return_value = {
-                        "population": 100,
-                        "criticality": "Low"
+                    agent_in_impact_analysis.sys.estimate_impact_batch.return_value = {
+                        "node-1": {"population": 100, "criticality": "Low"},
+                        "node-2": {"population": 100, "criticality": "Low"}
                     }
                     return agent_in_impact_analysis
 
-                def it_estimates_impact_for_each_failure(agent):
+                def it_estimates_impact_for_all_failures_in_one_batch(agent):
                     agent.run_step()
 
-                    assert agent.sys.estimate_impact.call_count == 2
-                    agent.sys.estimate_impact.assert_any_call(node_id="node-1")
-                    agent.sys.estimate_impact.assert_any_call(node_id="node-2")
+                    agent.sys.estimate_impact_batch.assert_called_once_with(node_ids=["node-1", "node-2"])
+                    agent.sys.estimate_impact.assert_not_called()
 
                 def it_stores_impact_report_in_memory(agent):
                     agent.run_step()
@@ -304,7 +331,7 @@ def describe_infra_agent():
             def describe_and_no_new_failures():
                 @pytest.fixture
                 def agent(agent_in_rescheduling):
-                    agent_in_rescheduling.sys.detect_failure_nodes.return_value = []
+                    agent_in_rescheduling.sys.detect_failure_nodes_since.return_value = {"failures": [], "cursor": "c1"}
                     return agent_in_rescheduling
 
                 def it_transitions_to_final(agent):
@@ -316,31 +343,69 @@ def describe_infra_agent():
                     assert agent.step_history[-1]["action"] == "repairs_completed"
                     assert agent.step_history[-1]["data"] == {}
 
-                def it_calls_detect_failure_nodes(agent):
+                def it_calls_detect_failure_nodes_since(agent):
+                    agent.run_step()
+
+                    agent.sys.detect_failure_nodes_since.assert_called_once_with(cursor=None)
+                    agent.sys.detect_failure_nodes.assert_not_called()
+
+                def it_stores_the_cursor(agent):
                     agent.run_step()
 
-                    agent.sys.detect_failure_nodes.assert_called_once()
+                    assert agent.memory["failure_cursor"] == "c1"
 
             def describe_and_cascading_failures():
                 @pytest.fixture
                 def agent(agent_in_rescheduling):
-                    agent_in_rescheduling.sys.detect_failure_nodes.return_value = ["node-4"]
+                    agent_in_rescheduling.memory = {
+                        "failures": ["node-1"],
+                        "impact_report": {"node-1": {"criticality": "High"}, "node-2": {"criticality": "Low"}},
+                        "failure_cursor": "c1",
+                    }
+                    agent_in_rescheduling.sys.detect_failure_nodes_since.return_value = {
+                        "failures": ["node-1", "node-2", "node-4", "node-4"],
+                        "cursor": "c2",
+                    }
                     return agent_in_rescheduling
 
-                def it_transitions_to_failure_detection(agent):
+                def it_transitions_to_impact_analysis(agent):
                     agent.run_step()
 
-                    assert agent.state == State.FAILURE_DETECTION
+                    assert agent.state == State.IMPACT_ANALYSIS
                     assert agent.step_history[-1]["from_state"] == State.RESCHEDULING.name
-                    assert agent.step_history[-1]["to_state"] == State.FAILURE_DETECTION.name
+                    assert agent.step_history[-1]["to_state"] == State.IMPACT_ANALYSIS.name
                     assert agent.step_history[-1]["action"] == "cascading_failures"
                     assert agent.step_history[-1]["data"] == {"new_failures": ["node-4"]}
 
+                def it_passes_the_previous_cursor(agent):
+                    agent.run_step()
+
+                    agent.sys.detect_failure_nodes_since.assert_called_once_with(cursor="c1")
+                    assert agent.memory["failure_cursor"] == "c2"
+
+                def it_appends_new_failures(agent):
+                    agent.run_step()
+
+                    assert agent.memory["failures"] == ["node-1", "node-4"]
+
+                def it_only_analyzes_the_new_failures(agent):
+                    agent.sys.estimate_impact_batch.return_value = {"node-4": {"criticality": "Low"}}
+                    agent.run_step()
+
+                    agent.run_step()
+
+                    agent.sys.estimate_impact_batch.assert_called_once_with(node_ids=["node-4"])
+                    assert agent.memory["impact_report"] == {
+                        "node-1": {"criticality": "High"},
+                        "node-2": {"criticality": "Low"},
+                        "node-4": {"criticality": "Low"},
+                    }
+
     def describe_run_to_completion():
         def describe_when_no_failures():
             @pytest.fixture
             def agent(agent_base):
-                agent_base.sys.detect_failure_nodes.return_value = []
+                agent_base.sys.detect_failure_nodes_since.return_value = {"failures": [], "cursor": None}
                 return agent_base
 
             def it_reaches_final_state(agent):
@@ -358,7 +423,7 @@ def describe_infra_agent():
         def describe_when_max_steps_reached():
             @pytest.fixture
             def agent(agent_base):
-                agent_base.sys.detect_failure_nodes.return_value = ["node-1"]
+                agent_base.sys.detect_failure_nodes_since.return_value = {"failures": ["node-1"], "cursor": None}
                 agent_base.max_steps = 2
                 return agent_base
 
@@ -469,6 +534,199 @@ def describe_infra_agent():
 
                 assert agent.state == State.REPAIR_PLANNING
 
+        def describe_when_llm_returns_tool_calls():
+            @pytest.fixture
+            def tools(mocker):
+                return {
+                    "weather": mocker.Mock(side_effect=lambda location: {"location": location, "temp": 20}),
+                    "crews": mocker.Mock(return_value=["crew-1"]),
+                }
+
+            @pytest.fixture
+            def agent(agent_in_repair_planning, tools):
+                agent_in_repair_planning.llm_service.handle_request.return_value = json.dumps({
+                    "thoughts": "t",
+                    "tool_calls": [
+                        {"action": "weather", "arguments": {"location": "loc-1"}},
+                        {"action": "weather", "arguments": {"location": "loc-2"}},
+                        {"action": "crews"},
+                    ]
+                })
+                agent_in_repair_planning.tools.get_tool.side_effect = tools.get
+                return agent_in_repair_planning
+
+            def it_calls_every_tool(agent, tools):
+                result = agent.handle_planning_step()
+
+                assert result is True
+                assert tools["weather"].call_count == 2
+                tools["crews"].assert_called_once_with()
+
+            def it_adds_all_results_to_history_in_one_entry(agent):
+                agent.handle_planning_step()
+
+                assert agent.memory["plan_history"] == [{
+                    "role": "tool_outputs",
+                    "results": [
+                        {"tool": "weather", "arguments": {"location": "loc-1"}, "result": {"location": "loc-1", "temp": 20}},
+                        {"tool": "weather", "arguments": {"location": "loc-2"}, "result": {"location": "loc-2", "temp": 20}},
+                        {"tool": "crews", "arguments": {}, "result": ["crew-1"]},
+                    ]
+                }]
+
+            def it_records_a_single_step(agent):
+                agent.handle_planning_step()
+
+                assert len(agent.step_history) == 1
+                assert agent.step_history[-1]["action"] == "llm_decision_use_tools"
+                assert agent.state == State.REPAIR_PLANNING
+
+            def it_runs_the_calls_concurrently(agent, tools):
+                barrier = threading.Barrier(2, timeout=5)
+                tools["weather"].side_effect = lambda location: barrier.wait()
+
+                assert agent.handle_planning_step() is True
+
+            def describe_and_one_tool_is_unknown():
+                @pytest.fixture
+                def agent_with_unknown(agent, tools):
+                    agent.llm_service.handle_request.return_value = json.dumps({
+                        "tool_calls": [{"action": "crews"}, {"action": "unknown-tool"}]
+                    })
+                    return agent
+
+                def it_runs_the_known_tools(agent_with_unknown, tools):
+                    result = agent_with_unknown.handle_planning_step()
+
+                    assert result is True
+                    tools["crews"].assert_called_once()
+
+                def it_adds_an_error_for_the_unknown_tool(agent_with_unknown):
+                    agent_with_unknown.handle_planning_step()
+
+                    assert agent_with_unknown.memory["plan_history"][0] == {
+                        "role": "error",
+                        "message": "Unknown tool: unknown-tool"
+                    }
+
+            def describe_and_it_includes_an_assignment():
+                def it_does_not_dispatch_crews(agent):
+                    agent.llm_service.handle_request.return_value = json.dumps({
+                        "tool_calls": [{"action": "assign_repair_crew", "arguments": {}}]
+                    })
+
+                    result = agent.handle_planning_step()
+
+                    assert result is False
+                    assert agent.state == State.REPAIR_PLANNING
+                    assert "pending_action" not in agent.memory
+
+            def describe_and_a_call_has_no_action():
+                def it_returns_false(agent):
+                    agent.llm_service.handle_request.return_value = json.dumps({"tool_calls": [{"arguments": {}}]})
+
+                    assert agent.handle_planning_step() is False
+                    assert agent.memory["plan_history"][0]["message"] == "Invalid JSON response from LLM"
+
+        def describe_with_a_decision_validator():
+            @pytest.fixture
+            def agent(agent_in_repair_planning, mocker):
+                def find_crew(crew_id: str, **kwargs):
+                    """Find a crew."""
+
+                agent_in_repair_planning.decision_validator = DecisionValidator(ToolRegistry([find_crew]).schemas)
+                agent_in_repair_planning.tools.get_tool.return_value = mocker.Mock(return_value={"crew_id": "crew-1"})
+                return agent_in_repair_planning
+
+            def it_runs_valid_decisions(agent):
+                agent.llm_service.handle_request.return_value = json.dumps({
+                    "action": "find_crew", "arguments": {"crew_id": "crew-1"}
+                })
+
+                assert agent.handle_planning_step() is True
+                agent.tools.get_tool.return_value.assert_called_once_with(crew_id="crew-1")
+
+            def it_rejects_malformed_decisions_without_calling_tools(agent):
+                agent.llm_service.handle_request.return_value = json.dumps({
+                    "action": "find_crew", "arguments": {"crew_id": 7}
+                })
+
+                assert agent.handle_planning_step() is False
+                agent.tools.get_tool.return_value.assert_not_called()
+                assert agent.memory["plan_history"] == [{
+                    "role": "error",
+                    "message": "Argument 'crew_id' of find_crew must be string, got integer"
+                }]
+
+            def it_rejects_tool_calls_as_a_whole(agent):
+                agent.llm_service.handle_request.return_value = json.dumps({
+                    "tool_calls": [{"action": "find_crew", "arguments": {"crew_id": "crew-1"}}, {"action": "crews"}]
+                })
+
+                assert agent.handle_planning_step() is False
+                agent.tools.get_tool.return_value.assert_not_called()
+                assert agent.memory["plan_history"][0]["message"] == "tool_calls[1]: Unknown tool: crews"
+
+        def describe_when_streaming_decisions():
+            @pytest.fixture
+            def tool_func(mocker):
+                return mocker.Mock(return_value={"result": "data-1"})
+
+            @pytest.fixture
+            def agent(agent_in_repair_planning, tool_func):
+                agent_in_repair_planning.stream_decisions = True
+                agent_in_repair_planning.tools.get_tool.return_value = tool_func
+                return agent_in_repair_planning
+
+            def _stream(agent, decision, on_action_args=None):
+                def handle_request_stream(system_prompt, context, tool_descriptions, on_action):
+                    if on_action_args is not None:
+                        on_action(*on_action_args)
+                    return decision
+                agent.llm_service.handle_request_stream.side_effect = handle_request_stream
+
+            def it_starts_the_tool_as_soon_as_the_action_is_known(agent, tool_func):
+                calls_before_end = []
+
+                def handle_request_stream(system_prompt, context, tool_descriptions, on_action):
+                    on_action("tool-1", {"arg-1": "value-1"})
+                    calls_before_end.append(_wait_for_call(tool_func))
+                    return {"action": "tool-1", "arguments": {"arg-1": "value-1"}}
+                agent.llm_service.handle_request_stream.side_effect = handle_request_stream
+
+                result = agent.handle_planning_step()
+
+                assert result is True
+                assert calls_before_end == [1]
+                tool_func.assert_called_once_with(**{"arg-1": "value-1"})
+                assert agent.memory["plan_history"][0]["result"] == {"result": "data-1"}
+                agent.llm_service.handle_request.assert_not_called()
+
+            def it_runs_the_tool_again_when_the_arguments_changed(agent, tool_func):
+                _stream(agent, {"action": "tool-1", "arguments": {"arg-1": "final"}}, ("tool-1", {"arg-1": "early"}))
+
+                agent.handle_planning_step()
+
+                assert tool_func.call_args_list[-1].kwargs == {"arg-1": "final"}
+                assert agent.memory["plan_history"][0]["result"] == {"result": "data-1"}
+
+            def it_never_starts_an_assignment_early(agent, tool_func):
+                decision = {"action": "assign_repair_crew", "arguments": {"node_ids": ["node-1"], "crew_ids": ["crew-1"]}}
+                _stream(agent, decision, ("assign_repair_crew", decision["arguments"]))
+
+                agent.handle_planning_step()
+
+                tool_func.assert_not_called()
+                assert agent.state == State.EXECUTION
+
+            def it_handles_an_aborted_response(agent):
+                agent.llm_service.handle_request_stream.side_effect = ValueError("Response is not a JSON object")
+
+                result = agent.handle_planning_step()
+
+                assert result is False
+                assert agent.memory["plan_history"][0]["message"] == "Invalid JSON response from LLM"
+
         def describe_when_llm_returns_invalid_json():
             @pytest.fixture
             def agent(agent_in_repair_planning):
@@ -634,3 +892,60 @@ def describe_infra_agent():
                 assert summary["total_steps"] == 0
                 assert summary["failures_detected"] == []
                 assert summary["execution_result"] is None
+
+        def describe_when_tracing():
+            @pytest.fixture
+            def exporter():
+                return InMemoryExporter()
+
+            @pytest.fixture
+            def agent(agent_base, exporter, mocker):
+                agent_base.tracer = Tracer(exporter)
+                agent_base.state = State.REPAIR_PLANNING
+                agent_base.memory = {"failures": ["node-1"], "impact_report": {}, "plan_history": []}
+                agent_base.llm_service.handle_request.return_value = json.dumps({"action": "tool-1", "arguments": {}})
+                agent_base.tools.get_tool.return_value = mocker.Mock(return_value={})
+                return agent_base
+
+            def it_traces_the_state_the_llm_call_and_the_tool_call(agent, exporter):
+                agent.run_step()
+
+                spans = {span.name: span for span in exporter.spans}
+                assert set(spans) == {"state.REPAIR_PLANNING", "llm.request", "tool.tool-1"}
+                assert spans["llm.request"].parent_id == spans["state.REPAIR_PLANNING"].span_id
+                assert spans["tool.tool-1"].parent_id == spans["state.REPAIR_PLANNING"].span_id
+
+            def it_reports_the_latency_breakdown(agent):
+                agent.run_step()
+
+                latency = agent.get_summary()["latency"]
+
+                assert latency["state.REPAIR_PLANNING"]["count"] == 1
+                assert latency["tool.tool-1"]["total_seconds"] >= 0
+
+        def describe_with_the_default_history():
+            def it_keeps_a_bounded_ring_in_memory(agent_base):
+                for _ in range(DEFAULT_MAX_IN_MEMORY + 5):
+                    agent_base._transition_state(State.REPAIR_PLANNING, "llm_decision_use_tool", {"tool": "tool1"})
+
+                assert len(agent_base.step_history) == DEFAULT_MAX_IN_MEMORY + 5
+                assert len(list(agent_base.step_history.recent())) == DEFAULT_MAX_IN_MEMORY
+                assert agent_base.step_history.dropped == 5
+
+        def describe_when_history_is_spilled_to_disk():
+            @pytest.fixture
+            def agent(mocker, tmp_path):
+                _agent_tools = mocker.Mock()
+                _agent_tools.get_tool_descriptions.return_value = "tools"
+                history = StepHistory(max_in_memory=2, spill_path=str(tmp_path / "steps.jsonl"))
+                yield InfraAgent(mocker.Mock(), mocker.Mock(), _agent_tools, step_history=history)
+                history.close()
+
+            def it_counts_every_step(agent):
+                for _ in range(5):
+                    agent._transition_state(State.REPAIR_PLANNING, "llm_decision_use_tool", {"tool": "tool1"})
+
+                summary = agent.get_summary()
+
+                assert summary["total_steps"] == 5
+                assert len(list(agent.step_history.recent())) == 2
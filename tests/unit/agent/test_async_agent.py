@@ -0,0 +1,169 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.infra_fail_mngr.agent.async_agent import AsyncInfraAgent
+from src.infra_fail_mngr.states import State
+from src.infra_fail_mngr.tools.async_agent_tools import AsyncAgentTools
+from src.infra_fail_mngr.tools.async_system_tools import AsyncSystemTools
+from src.infra_fail_mngr.tools.decision_validator import DecisionValidator
+
+
+@pytest.fixture
+def system_repo(mocker):
+    repo = mocker.AsyncMock()
+    del repo.get_node_details_batch
+    del repo.get_failed_nodes_since
+    repo.get_failed_nodes.side_effect = [["node-1"], []]
+    repo.get_node_details.return_value = {"critical": True}
+    repo.assign_crew.return_value = True
+    return repo
+
+
+@pytest.fixture
+def agent_repo(mocker):
+    repo = mocker.AsyncMock()
+    repo.get_available_crews.return_value = ["crew-1"]
+    return repo
+
+
+def _agent(responses, system_repo, agent_repo):
+    system_tools = AsyncSystemTools(system_repo)
+    agent_tools = AsyncAgentTools(agent_repo, [system_tools.assign_repair_crew])
+    llm_service = AsyncMock()
+    llm_service.handle_request.side_effect = [json.dumps(r) for r in responses]
+    return AsyncInfraAgent(llm_service, system_tools, agent_tools)
+
+
+def describe_async_infra_agent():
+    def describe_run_to_completion():
+        def describe_when_planning_uses_a_tool_then_assigns():
+            @pytest.fixture
+            def agent(system_repo, agent_repo):
+                return _agent([
+                    {"thoughts": "t", "action": "get_available_crews", "arguments": {}},
+                    {"thoughts": "t", "action": "assign_repair_crew", "arguments": {"node_ids": ["node-1"], "crew_ids": ["crew-1"]}},
+                ], system_repo, agent_repo)
+
+            def it_reaches_final_state(agent):
+                asyncio.run(agent.run_to_completion())
+
+                assert agent.state == State.FINAL
+                assert agent.step_history[-1]["action"] == "repairs_completed"
+
+            def it_follows_the_same_transitions_as_the_sync_agent(agent):
+                asyncio.run(agent.run_to_completion())
+
+                assert [step["action"] for step in agent.step_history] == [
+                    "initialize",
+                    "failures_detected",
+                    "impact_analyzed",
+                    "llm_decision_use_tool",
+                    "llm_decision_assign_crew",
+                    "assignments_succeeded",
+                    "repairs_completed",
+                ]
+
+            def it_awaits_the_tool_result(agent):
+                asyncio.run(agent.run_to_completion())
+
+                assert agent.memory["plan_history"][0]["result"] == ["crew-1"]
+
+            def it_dispatches_the_crews(agent, system_repo):
+                asyncio.run(agent.run_to_completion())
+
+                system_repo.assign_crew.assert_awaited_once_with("node-1", "crew-1")
+
+        def describe_when_planning_uses_several_tools_at_once():
+            @pytest.fixture
+            def agent(system_repo, agent_repo):
+                agent_repo.get_weather_at_location.side_effect = lambda location: len(location)
+                return _agent([
+                    {"thoughts": "t", "tool_calls": [
+                        {"action": "get_weather_at_location", "arguments": {"location": "loc-1"}},
+                        {"action": "get_available_crews"},
+                    ]},
+                    {"thoughts": "t", "action": "assign_repair_crew", "arguments": {"node_ids": ["node-1"], "crew_ids": ["crew-1"]}},
+                ], system_repo, agent_repo)
+
+            def it_awaits_every_tool_result(agent):
+                asyncio.run(agent.run_to_completion())
+
+                assert agent.state == State.FINAL
+                assert [output["result"] for output in agent.memory["plan_history"][0]["results"]] == [
+                    {"location": "loc-1", "temperature": 5, "is_raining": True},
+                    ["crew-1"],
+                ]
+
+        def describe_when_a_decision_fails_validation():
+            @pytest.fixture
+            def agent(system_repo, agent_repo):
+                agent = _agent([
+                    {"thoughts": "t", "action": "get_weather_at_location", "arguments": {"location": 3}},
+                    {"thoughts": "t", "action": "assign_repair_crew", "arguments": {"node_ids": ["node-1"], "crew_ids": ["crew-1"]}},
+                ], system_repo, agent_repo)
+                agent.decision_validator = DecisionValidator(agent.tools.get_tool_schemas())
+                return agent
+
+            def it_feeds_the_error_back_without_calling_the_tool(agent, agent_repo):
+                asyncio.run(agent.run_to_completion())
+
+                agent_repo.get_weather_at_location.assert_not_awaited()
+                assert agent.memory["plan_history"][0] == {
+                    "role": "error",
+                    "message": "Argument 'location' of get_weather_at_location must be string, got integer"
+                }
+                assert agent.state == State.FINAL
+
+        def describe_when_llm_returns_invalid_json():
+            @pytest.fixture
+            def agent(system_repo, agent_repo):
+                agent = _agent([], system_repo, agent_repo)
+                agent.llm_service.handle_request.side_effect = None
+                agent.llm_service.handle_request.return_value = "not-a-json"
+                return agent
+
+            def it_gives_up_after_max_retries(agent):
+                asyncio.run(agent.run_to_completion())
+
+                assert agent.state == State.FINAL
+                assert agent.retry_count == agent.max_retries
+
+        def describe_when_the_repository_scans_incrementally():
+            def it_reschedules_from_the_detection_cursor(system_repo, agent_repo):
+                system_repo.get_failed_nodes_since = AsyncMock(side_effect=[(["node-1"], "c1"), ([], "c1")])
+                agent = _agent(
+                    [{"action": "assign_repair_crew", "arguments": {"node_ids": ["node-1"], "crew_ids": ["crew-1"]}}],
+                    system_repo, agent_repo,
+                )
+
+                asyncio.run(agent.run_to_completion())
+
+                assert [call.args for call in system_repo.get_failed_nodes_since.call_args_list] == [(None,), ("c1",)]
+                system_repo.get_failed_nodes.assert_not_called()
+
+        def describe_when_many_agents_share_a_loop():
+            def it_runs_them_concurrently(mocker, agent_repo):
+                def make_system_repo():
+                    repo = mocker.AsyncMock()
+                    del repo.get_node_details_batch
+                    del repo.get_failed_nodes_since
+                    repo.get_failed_nodes.side_effect = [["node-1"], []]
+                    repo.get_node_details.return_value = {}
+                    repo.assign_crew.return_value = True
+                    return repo
+
+                agents = [
+                    _agent([{"action": "assign_repair_crew", "arguments": {"node_ids": ["node-1"], "crew_ids": ["crew-1"]}}],
+                           make_system_repo(), agent_repo)
+                    for _ in range(20)
+                ]
+
+                async def run_all():
+                    await asyncio.gather(*(agent.run_to_completion() for agent in agents))
+
+                asyncio.run(run_all())
+
+                assert all(agent.state == State.FINAL for agent in agents)
@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+from src.infra_fail_mngr.agent.agent import InfraAgent
+from src.infra_fail_mngr.agent.checkpoint import SQLiteCheckpointStore
+from src.infra_fail_mngr.states import State
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "checkpoints.db")
+
+
+@pytest.fixture
+def agent_factory(mocker):
+    def make(checkpointer=None):
+        system_tools = mocker.Mock()
+        system_tools.detect_failure_nodes_since.return_value = {"failures": ["node-1"], "cursor": None}
+        system_tools.estimate_impact_batch.return_value = {"node-1": {"population_affected": 10}}
+        agent_tools = mocker.Mock()
+        agent_tools.get_tool_descriptions.return_value = "tools"
+        return InfraAgent(mocker.Mock(), system_tools, agent_tools, checkpointer=checkpointer)
+    return make
+
+
+def _step_rows(db_path):
+    with sqlite3.connect(db_path) as connection:
+        return connection.execute("SELECT position, action FROM steps ORDER BY position").fetchall()
+
+
+def describe_sqlite_checkpoint_store():
+    @pytest.fixture(params=[True, False], ids=["background", "inline"])
+    def store(request, db_path):
+        store = SQLiteCheckpointStore(db_path, incident_id="incident-1", background=request.param)
+        yield store
+        store.close()
+
+    def it_returns_none_without_checkpoint(store):
+        assert store.load() is None
+
+    def it_round_trips_the_agent(store, agent_factory):
+        agent = agent_factory(store)
+        for _ in range(3):
+            agent.run_step()
+
+        checkpoint = store.load()
+
+        assert checkpoint["state"] == "REPAIR_PLANNING"
+        assert checkpoint["retry_count"] == 0
+        assert checkpoint["memory"]["failures"] == ["node-1"]
+        assert checkpoint["memory"]["impact_report"] == {"node-1": {"population_affected": 10}}
+        assert [step["action"] for step in checkpoint["steps"]] == ["initialize", "failures_detected", "impact_analyzed"]
+        assert checkpoint["step_count"] == 3
+
+    def it_only_writes_new_steps(store, agent_factory, db_path, mocker):
+        agent = agent_factory(store)
+        agent.run_step()
+        agent.run_step()
+        store.flush()
+        spy = mocker.spy(store, "_write")
+
+        agent.run_step()
+        store.flush()
+
+        _, _, steps = spy.call_args.args
+        assert [step[1] for step in steps] == [2]
+        assert [row[0] for row in _step_rows(db_path)] == [0, 1, 2]
+
+    def it_keeps_incidents_apart(db_path, agent_factory):
+        with SQLiteCheckpointStore(db_path, incident_id="a") as store_a, \
+                SQLiteCheckpointStore(db_path, incident_id="b") as store_b:
+            agent_factory(store_a).run_step()
+
+            assert store_a.load()["state"] == "FAILURE_DETECTION"
+            assert store_b.load() is None
+
+
+def describe_resume():
+    def it_continues_from_the_last_completed_step(db_path, agent_factory):
+        with SQLiteCheckpointStore(db_path) as store:
+            crashed = agent_factory(store)
+            for _ in range(3):
+                crashed.run_step()
+
+        with SQLiteCheckpointStore(db_path) as store:
+            agent = agent_factory(store)
+            agent.resume(store.load())
+
+            assert agent.state == State.REPAIR_PLANNING
+            assert agent.memory["failures"] == ["node-1"]
+            assert len(agent.step_history) == 3
+            assert agent.step_history[-1]["action"] == "impact_analyzed"
+
+            agent.state = State.RESCHEDULING
+            agent.run_step()
+            store.flush()
+
+            agent.sys.estimate_impact_batch.assert_not_called()
+            assert [row[1] for row in _step_rows(db_path)][-1] == "repairs_completed"
+            assert len(_step_rows(db_path)) == 4
@@ -0,0 +1,126 @@
+import json
+
+import pytest
+
+from src.infra_fail_mngr.agent.step_history import StepHistory, StepRecord
+from src.infra_fail_mngr.vis.diagram_converter import step_history_to_flow_diagram
+
+
+def _fill(history, count):
+    for i in range(count):
+        history.append("REPAIR_PLANNING", "REPAIR_PLANNING", "llm_decision_use_tool", {"step": i})
+
+
+def describe_step_record():
+    @pytest.fixture
+    def record():
+        return StepRecord("INIT", "FAILURE_DETECTION", "initialize", {"a": 1})
+
+    def it_reads_like_a_dict(record):
+        assert record["action"] == "initialize"
+        assert record.get("data") == {"a": 1}
+        assert record.get("missing", "default") == "default"
+
+    def it_raises_key_error_for_unknown_keys(record):
+        with pytest.raises(KeyError):
+            record["missing"]
+
+    def it_equals_the_matching_dict(record):
+        assert record == {"from_state": "INIT", "to_state": "FAILURE_DETECTION", "action": "initialize", "data": {"a": 1}}
+
+    def it_interns_names():
+        action = "".join(["initia", "lize"])
+
+        record = StepRecord("INIT", "FAILURE_DETECTION", action)
+
+        assert record.action is StepRecord("INIT", "FAILURE_DETECTION", "initialize").action
+
+    def it_has_no_instance_dict(record):
+        assert not hasattr(record, "__dict__")
+
+
+def describe_step_history():
+    def describe_when_unbounded():
+        def it_keeps_every_step_in_memory():
+            history = StepHistory()
+
+            _fill(history, 50)
+
+            assert len(history) == 50
+            assert len(list(history.recent())) == 50
+            assert history[0]["data"] == {"step": 0}
+            assert history[-1]["data"] == {"step": 49}
+
+    def describe_when_bounded_without_spill_file():
+        def it_drops_the_oldest_steps():
+            history = StepHistory(max_in_memory=3)
+
+            _fill(history, 5)
+
+            assert len(history) == 5
+            assert history.dropped == 2
+            assert [step["data"]["step"] for step in history] == [2, 3, 4]
+
+        def it_raises_for_dropped_steps():
+            history = StepHistory(max_in_memory=3)
+            _fill(history, 5)
+
+            with pytest.raises(IndexError):
+                history[0]
+
+    def describe_when_bounded_with_spill_file():
+        @pytest.fixture
+        def spill_path(tmp_path):
+            return str(tmp_path / "steps.jsonl")
+
+        @pytest.fixture
+        def history(spill_path):
+            history = StepHistory(max_in_memory=3, spill_path=spill_path)
+            yield history
+            history.close()
+
+        def it_keeps_only_the_ring_in_memory(history):
+            _fill(history, 10)
+
+            assert [step["data"]["step"] for step in history.recent()] == [7, 8, 9]
+
+        def it_iterates_over_the_full_history_in_order(history):
+            _fill(history, 10)
+
+            assert [step["data"]["step"] for step in history] == list(range(10))
+
+        def it_writes_spilled_steps_as_json_lines(history, spill_path):
+            _fill(history, 5)
+            history.close()
+
+            with open(spill_path) as spill_file:
+                lines = [json.loads(line) for line in spill_file]
+
+            assert [line["data"]["step"] for line in lines] == [0, 1]
+
+        def it_indexes_spilled_steps(history):
+            _fill(history, 10)
+
+            assert history[1]["data"] == {"step": 1}
+            assert history[-1]["data"] == {"step": 9}
+
+        def it_keeps_spilling_after_close(history):
+            _fill(history, 5)
+            history.close()
+            _fill(history, 2)
+
+            assert [step["data"]["step"] for step in history] == [0, 1, 2, 3, 4, 0, 1]
+
+        def it_feeds_the_flow_diagram(history):
+            history.append("INIT", "FAILURE_DETECTION", "initialize")
+            history.append("FAILURE_DETECTION", "IMPACT_ANALYSIS", "failures_detected", {"failures": ["node-1"]})
+            _fill(history, 3)
+            history.append("REPAIR_PLANNING", "FINAL", "max_retries_reached")
+
+            result = step_history_to_flow_diagram(history)
+
+            assert "INIT -->|initialize| FAILURE_DETECTION" in result
+            assert "REPAIR_PLANNING -->|max retries reached| FINAL" in result
+
+        def it_draws_an_empty_history(history):
+            assert "No execution history" in step_history_to_flow_diagram(history)
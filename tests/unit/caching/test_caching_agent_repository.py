@@ -0,0 +1,177 @@
+import pytest
+
+from src.infra_fail_mngr.caching.caching_agent_repository import CachingAgentRepository
+from src.infra_fail_mngr.tools.system_tools import SystemTools
+from src.infra_fail_mngr.tools.travel_time_matrix import TravelTimeMatrix
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def describe_caching_agent_repository():
+    @pytest.fixture
+    def clock():
+        return FakeClock()
+
+    @pytest.fixture
+    def repo(mocker):
+        mock = mocker.Mock()
+        mock.get_weather_at_location.return_value = 20
+        mock.get_available_crews.return_value = ["crew-1", "crew-2"]
+        mock.is_crew_available.return_value = True
+        mock.crew_location.return_value = "location-1"
+        return mock
+
+    @pytest.fixture
+    def cached(repo, clock):
+        return CachingAgentRepository(repo, ttls={"get_weather_at_location": 60}, clock=clock)
+
+    def describe_lookups():
+        def it_calls_the_repo_once_per_arguments(cached, repo):
+            cached.get_weather_at_location("location-1")
+            cached.get_weather_at_location("location-1")
+            cached.get_weather_at_location("location-2")
+
+            assert repo.get_weather_at_location.call_count == 2
+
+        def it_returns_the_repo_value(cached):
+            assert cached.get_weather_at_location("location-1") == 20
+
+        def it_refreshes_after_the_method_ttl(cached, repo, clock):
+            cached.get_weather_at_location("location-1")
+            clock.now = 60
+            cached.get_weather_at_location("location-1")
+
+            assert repo.get_weather_at_location.call_count == 2
+
+        def describe_when_ttl_is_zero():
+            def it_does_not_cache(repo, clock):
+                cached = CachingAgentRepository(repo, ttls={"get_available_crews": 0}, clock=clock)
+
+                cached.get_available_crews()
+                cached.get_available_crews()
+
+                assert repo.get_available_crews.call_count == 2
+
+        def describe_when_size_bound_reached():
+            def it_evicts_least_recently_used(repo, clock):
+                cached = CachingAgentRepository(repo, max_size=1, clock=clock)
+
+                cached.get_weather_at_location("location-1")
+                cached.get_weather_at_location("location-2")
+                cached.get_weather_at_location("location-1")
+
+                assert repo.get_weather_at_location.call_count == 3
+                assert cached.stats()["get_weather_at_location"]["evictions"] == 2
+
+    def describe_repair_time_batches():
+        def it_fetches_only_the_missing_nodes_in_one_call(cached, repo):
+            repo.estimate_repair_time.return_value = 45
+            repo.estimate_repair_times.side_effect = lambda nodes: [len(node) for node in nodes]
+            cached.estimate_repair_time("node-1")
+
+            assert cached.estimate_repair_times(["node-1", "node-22", "node-22"]) == [45, 7, 7]
+            repo.estimate_repair_times.assert_called_once_with(["node-22"])
+            assert cached.estimate_repair_time("node-22") == 7
+
+        def it_falls_back_to_single_lookups(cached, repo):
+            del repo.estimate_repair_times
+            repo.estimate_repair_time.side_effect = len
+
+            assert cached.estimate_repair_times(["node-1", "node-22"]) == [6, 7]
+
+    def describe_travel_time_batches():
+        def it_forwards_the_missing_pairs_in_one_call(cached, repo):
+            repo.estimate_travel_time.return_value = 5
+            repo.estimate_travel_times.side_effect = lambda origins, destinations: [
+                [len(origin) * 10 + len(destination) for destination in destinations] for origin in origins
+            ]
+            cached.estimate_travel_time("a", "x")
+
+            assert cached.estimate_travel_times(["a", "bb"], ["x", "yy"]) == [[5, 12], [21, 22]]
+            repo.estimate_travel_times.assert_called_once_with(["a", "bb"], ["yy", "x"])
+            repo.estimate_travel_time.assert_called_once_with("a", "x")
+
+        def it_serves_repeated_batches_from_the_cache(cached, repo):
+            repo.estimate_travel_times.return_value = [[7]]
+
+            cached.estimate_travel_times(["a"], ["x"])
+
+            assert cached.estimate_travel_times(["a"], ["x"]) == [[7]]
+            assert cached.estimate_travel_time("a", "x") == 7
+            repo.estimate_travel_times.assert_called_once()
+
+        def it_keeps_the_batch_path_of_a_travel_time_matrix(cached, repo):
+            repo.crew_location.side_effect = {"crew-1": "north", "crew-2": "south"}.get
+            repo.estimate_travel_times.side_effect = lambda origins, destinations: [[1] * len(destinations)] * len(origins)
+
+            TravelTimeMatrix(cached).crew_matrix(["crew-1", "crew-2"], ["node-1", "node-2", "node-3"])
+
+            repo.estimate_travel_times.assert_called_once()
+            repo.estimate_travel_time.assert_not_called()
+
+    def describe_invalidate_crew():
+        def it_drops_the_crew_lookups(cached, repo):
+            cached.get_available_crews()
+            cached.is_crew_available("crew-1")
+            cached.crew_location("crew-1")
+
+            cached.invalidate_crew("crew-1")
+            cached.get_available_crews()
+            cached.is_crew_available("crew-1")
+            cached.crew_location("crew-1")
+
+            assert repo.get_available_crews.call_count == 2
+            assert repo.is_crew_available.call_count == 2
+            assert repo.crew_location.call_count == 2
+
+        def it_keeps_other_crews(cached, repo):
+            cached.is_crew_available("crew-2")
+
+            cached.invalidate_crew("crew-1")
+            cached.is_crew_available("crew-2")
+
+            assert repo.is_crew_available.call_count == 1
+
+    def describe_invalidate():
+        def it_drops_everything_without_a_method(cached, repo):
+            cached.get_weather_at_location("location-1")
+            cached.get_available_crews()
+
+            cached.invalidate()
+            cached.get_weather_at_location("location-1")
+            cached.get_available_crews()
+
+            assert repo.get_weather_at_location.call_count == 2
+            assert repo.get_available_crews.call_count == 2
+
+    def describe_when_wired_to_system_tools():
+        def it_invalidates_crew_availability_after_assignment(cached, repo, mocker):
+            system_repo = mocker.Mock()
+            system_repo.assign_crew.side_effect = lambda node, crew: crew == "crew-1"
+            tools = SystemTools(system_repo, on_crew_assigned=cached.on_crew_assigned)
+            cached.is_crew_available("crew-1")
+            cached.is_crew_available("crew-2")
+
+            tools.assign_repair_crew(["node-1", "node-2"], ["crew-1", "crew-2"])
+            cached.is_crew_available("crew-1")
+            cached.is_crew_available("crew-2")
+
+            # Only the successfully assigned crew is looked up again
+            assert repo.is_crew_available.call_count == 3
+
+    def describe_stats():
+        def it_reports_totals(cached):
+            cached.get_weather_at_location("location-1")
+            cached.get_weather_at_location("location-1")
+            cached.get_available_crews()
+
+            total = cached.stats()["total"]
+
+            assert total["hits"] == 1
+            assert total["misses"] == 2
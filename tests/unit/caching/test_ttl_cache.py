@@ -0,0 +1,97 @@
+import pytest
+
+from src.infra_fail_mngr.caching.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def describe_ttl_cache():
+    @pytest.fixture
+    def clock():
+        return FakeClock()
+
+    def describe_get():
+        def it_returns_stored_values(clock):
+            cache = TTLCache(ttl=10, clock=clock)
+            cache.set("key-1", "value-1")
+
+            assert cache.get("key-1") == "value-1"
+
+        def it_returns_default_for_missing_keys(clock):
+            cache = TTLCache(ttl=10, clock=clock)
+
+            assert cache.get("key-1", "default") == "default"
+
+        def it_expires_entries_after_ttl(clock):
+            cache = TTLCache(ttl=10, clock=clock)
+            cache.set("key-1", "value-1")
+            clock.now = 10
+
+            assert cache.get("key-1") is None
+            assert cache.stats()["expirations"] == 1
+
+        def it_keeps_entries_without_ttl(clock):
+            cache = TTLCache(ttl=None, clock=clock)
+            cache.set("key-1", "value-1")
+            clock.now = 10 ** 9
+
+            assert cache.get("key-1") == "value-1"
+
+    def describe_set():
+        def it_evicts_least_recently_used(clock):
+            cache = TTLCache(max_size=2, clock=clock)
+            cache.set("key-1", 1)
+            cache.set("key-2", 2)
+            cache.get("key-1")
+            cache.set("key-3", 3)
+
+            assert cache.get("key-2") is None
+            assert cache.get("key-1") == 1
+            assert cache.stats()["evictions"] == 1
+
+    def describe_get_or_compute():
+        def it_computes_only_on_miss(clock, mocker):
+            cache = TTLCache(clock=clock)
+            compute = mocker.Mock(return_value="value-1")
+
+            assert cache.get_or_compute("key-1", compute) == "value-1"
+            assert cache.get_or_compute("key-1", compute) == "value-1"
+            compute.assert_called_once()
+
+        def it_caches_falsy_values(clock, mocker):
+            cache = TTLCache(clock=clock)
+            compute = mocker.Mock(return_value=None)
+
+            cache.get_or_compute("key-1", compute)
+            cache.get_or_compute("key-1", compute)
+
+            compute.assert_called_once()
+
+    def describe_invalidate():
+        def it_drops_the_entry(clock):
+            cache = TTLCache(clock=clock)
+            cache.set("key-1", 1)
+
+            assert cache.invalidate("key-1") is True
+            assert cache.get("key-1") is None
+            assert cache.invalidate("key-1") is False
+
+    def describe_stats():
+        def it_counts_hits_and_misses(clock):
+            cache = TTLCache(clock=clock)
+            cache.set("key-1", 1)
+            cache.get("key-1")
+            cache.get("key-2")
+
+            stats = cache.stats()
+
+            assert stats["hits"] == 1
+            assert stats["misses"] == 1
+            assert stats["hit_rate"] == 0.5
+            assert stats["size"] == 1
@@ -0,0 +1,65 @@
+import pytest
+
+from src.infra_fail_mngr.agent.agent import InfraAgent
+from src.infra_fail_mngr.events import EventDrivenSystemRepository, FailureEventIngestor, LocalEventSource
+from src.infra_fail_mngr.states import State
+from src.infra_fail_mngr.tools.system_tools import SystemTools
+
+
+def describe_event_driven_system_repository():
+    @pytest.fixture
+    def source():
+        return LocalEventSource()
+
+    @pytest.fixture
+    def backend(mocker):
+        backend = mocker.Mock()
+        del backend.get_node_details_batch
+        backend.get_node_details.return_value = {"critical": True}
+        return backend
+
+    @pytest.fixture
+    def repo(source, backend):
+        return EventDrivenSystemRepository(backend, FailureEventIngestor(source))
+
+    def it_answers_failure_scans_from_events(source, repo, backend):
+        source.node_down("node-1")
+
+        assert repo.get_failed_nodes() == ["node-1"]
+        backend.get_failed_nodes.assert_not_called()
+
+    def it_delegates_node_details(repo, backend):
+        assert repo.get_node_details_batch(["node-1"]) == {"node-1": {"critical": True}}
+        backend.get_node_details.assert_called_once_with("node-1")
+
+    def describe_driving_an_agent():
+        @pytest.fixture
+        def agent(repo, mocker):
+            agent_tools = mocker.Mock()
+            agent_tools.get_tool_descriptions.return_value = "tools"
+            agent = InfraAgent(mocker.Mock(), SystemTools(repo), agent_tools)
+            repo.ingestor.subscribe(agent.notify_failures_changed)
+            return agent
+
+        def it_stays_final_while_nothing_fails(agent):
+            agent.run_to_completion()
+
+            assert agent.state == State.FINAL
+            assert agent.step_history[-1]["action"] == "no_failures_detected"
+
+        def it_restarts_failure_detection_when_a_node_goes_down(source, agent):
+            agent.run_to_completion()
+
+            source.node_down("node-1")
+
+            assert agent.state == State.FAILURE_DETECTION
+            assert agent.step_history[-1]["action"] == "failure_events"
+            assert agent.step_history[-1]["data"] == {"version": 1}
+            agent.run_step()
+            assert agent.memory["failures"] == ["node-1"]
+
+        def it_ignores_changes_while_handling_an_incident(agent):
+            agent.state = State.REPAIR_PLANNING
+
+            assert agent.notify_failures_changed(1) is False
+            assert agent.state == State.REPAIR_PLANNING
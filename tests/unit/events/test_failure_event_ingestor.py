@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.infra_fail_mngr.events.failure_event_ingestor import FailureEventIngestor
+from src.infra_fail_mngr.events.failure_events import FailureEvent, LocalEventSource
+
+
+def describe_failure_event_ingestor():
+    @pytest.fixture
+    def source():
+        return LocalEventSource()
+
+    def describe_without_debounce():
+        @pytest.fixture
+        def ingestor(source):
+            return FailureEventIngestor(source)
+
+        def it_tracks_failed_nodes(source, ingestor):
+            source.node_down("node-1")
+            source.node_down("node-2")
+            source.node_up("node-1")
+
+            assert ingestor.get_failed_nodes() == ["node-2"]
+            assert ingestor.version == 3
+
+        def it_ignores_events_that_change_nothing(source, ingestor, mocker):
+            listener = mocker.Mock()
+            ingestor.subscribe(listener)
+            source.node_down("node-1")
+
+            source.node_down("node-1")
+            source.node_up("node-9")
+
+            listener.assert_called_once_with(1)
+            assert ingestor.version == 1
+
+        def it_stops_listening_after_close(source, ingestor):
+            ingestor.close()
+
+            source.node_down("node-1")
+
+            assert ingestor.get_failed_nodes() == []
+
+    def describe_with_debounce():
+        @pytest.fixture
+        def ingestor(source):
+            ingestor = FailureEventIngestor(source, debounce=60)
+            yield ingestor
+            ingestor.close()
+
+        def it_buffers_events_until_flushed(source, ingestor):
+            source.node_down("node-1")
+
+            assert ingestor.get_failed_nodes() == []
+
+        def it_coalesces_a_burst_into_one_change(source, ingestor, mocker):
+            listener = mocker.Mock()
+            ingestor.subscribe(listener)
+            for node in ["node-1", "node-2", "node-3"]:
+                source.node_down(node)
+            source.node_up("node-2")
+
+            assert ingestor.flush() is True
+
+            assert ingestor.get_failed_nodes() == ["node-1", "node-3"]
+            listener.assert_called_once_with(1)
+
+        def it_is_silent_when_a_node_flaps(source, ingestor, mocker):
+            listener = mocker.Mock()
+            ingestor.subscribe(listener)
+            source.node_down("node-1")
+            source.node_up("node-1")
+
+            assert ingestor.flush() is False
+            listener.assert_not_called()
+
+        def it_flushes_after_a_quiet_period(source):
+            ingestor = FailureEventIngestor(source, debounce=0.01)
+            source.node_down("node-1")
+
+            assert ingestor.wait_for_change(0, timeout=5) == 1
+            assert ingestor.get_failed_nodes() == ["node-1"]
+
+    def describe_get_failed_nodes_since():
+        def it_returns_nodes_failed_after_the_cursor(source):
+            ingestor = FailureEventIngestor(source, initial_failures=["node-0"])
+            nodes, cursor = ingestor.get_failed_nodes_since(None)
+            source.node_down("node-1")
+            source.node_down("node-2")
+
+            assert nodes == ["node-0"]
+            assert ingestor.get_failed_nodes_since(cursor) == (["node-1", "node-2"], "2")
+
+    def describe_wait_for_change():
+        def it_returns_none_on_timeout():
+            assert FailureEventIngestor().wait_for_change(0, timeout=0.01) is None
+
+        def it_wakes_up_on_change_from_another_thread():
+            ingestor = FailureEventIngestor()
+            threading.Timer(0.01, ingestor.on_event, [FailureEvent("node-1", "down")]).start()
+
+            assert ingestor.wait_for_change(0, timeout=5) == 1
+
+    def describe_consume():
+        def it_ingests_an_asyncio_queue():
+            ingestor = FailureEventIngestor(debounce=60)
+
+            async def produce_and_consume():
+                queue = asyncio.Queue()
+                for event in [FailureEvent("node-1", "down"), FailureEvent("node-2", "down"), None]:
+                    queue.put_nowait(event)
+                await ingestor.consume(queue)
+
+            asyncio.run(produce_and_consume())
+
+            assert ingestor.get_failed_nodes() == ["node-1", "node-2"]
+            assert ingestor.version == 1
@@ -0,0 +1,32 @@
+import pytest
+
+from src.infra_fail_mngr.events.failure_events import FailureEvent, LocalEventSource
+
+
+def describe_failure_event():
+    def it_rejects_unknown_statuses():
+        with pytest.raises(ValueError):
+            FailureEvent("node-1", "sideways")
+
+
+def describe_local_event_source():
+    def it_publishes_to_every_subscriber(mocker):
+        source = LocalEventSource()
+        first, second = mocker.Mock(), mocker.Mock()
+        source.subscribe(first)
+        source.subscribe(second)
+
+        source.node_down("node-1")
+
+        assert first.call_args.args[0].node_id == "node-1"
+        assert second.call_args.args[0].status == "down"
+
+    def it_stops_publishing_after_unsubscribe(mocker):
+        source = LocalEventSource()
+        callback = mocker.Mock()
+        unsubscribe = source.subscribe(callback)
+
+        unsubscribe()
+        source.node_up("node-1")
+
+        callback.assert_not_called()
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from src.infra_fail_mngr.llm.caching_llm_client import (
+    TIMESTAMP_PATTERN,
+    AsyncCachingLLMClient,
+    CachingLLMClient,
+    normalize_prompt,
+)
+
+
+def describe_normalize_prompt():
+    def it_collapses_whitespace():
+        assert normalize_prompt("\n    a   b\n\n c  ") == "a b c"
+
+    def it_masks_volatile_values():
+        first = normalize_prompt('{"at": "2026-01-01T10:00:00Z"}', [TIMESTAMP_PATTERN])
+        second = normalize_prompt('{"at": "2026-03-02 11:30:15"}', [TIMESTAMP_PATTERN])
+
+        assert first == second
+
+
+def describe_caching_llm_client():
+    @pytest.fixture
+    def client(mocker):
+        client = mocker.Mock()
+        client.generate.side_effect = lambda prompt: f"response to {prompt.strip()}"
+        return client
+
+    def describe_generate():
+        def it_calls_the_client_once_per_prompt(client):
+            cache = CachingLLMClient(client)
+
+            assert cache.generate("prompt-1") == "response to prompt-1"
+            assert cache.generate("prompt-1") == "response to prompt-1"
+
+            client.generate.assert_called_once_with("prompt-1")
+
+        def it_keeps_different_prompts_apart(client):
+            cache = CachingLLMClient(client)
+
+            cache.generate("prompt-1")
+            cache.generate("prompt-2")
+
+            assert client.generate.call_count == 2
+
+        def it_does_not_cache_empty_responses(client):
+            client.generate.side_effect = None
+            client.generate.return_value = ""
+            cache = CachingLLMClient(client)
+
+            cache.generate("prompt-1")
+            cache.generate("prompt-1")
+
+            assert client.generate.call_count == 2
+
+        def it_evicts_the_least_recently_used_prompt(client):
+            cache = CachingLLMClient(client, max_size=1)
+
+            cache.generate("prompt-1")
+            cache.generate("prompt-2")
+            cache.generate("prompt-1")
+
+            assert client.generate.call_count == 3
+
+        def it_expires_responses_after_the_ttl(client):
+            now = [0.0]
+            cache = CachingLLMClient(client, ttl=10, clock=lambda: now[0])
+            cache.generate("prompt-1")
+
+            now[0] = 11
+            cache.generate("prompt-1")
+
+            assert client.generate.call_count == 2
+
+        def describe_when_normalizing():
+            def it_ignores_whitespace_differences(client):
+                cache = CachingLLMClient(client, normalize=True)
+
+                cache.generate("  prompt   1 ")
+                cache.generate("prompt 1")
+
+                client.generate.assert_called_once()
+
+            def it_ignores_volatile_fields(client):
+                cache = CachingLLMClient(client, volatile_patterns=[TIMESTAMP_PATTERN])
+
+                cache.generate("now 2026-01-01T10:00:00")
+                cache.generate("now 2026-01-01T10:05:00")
+
+                client.generate.assert_called_once()
+
+            def it_is_off_by_default(client):
+                cache = CachingLLMClient(client)
+
+                cache.generate("prompt  1")
+                cache.generate("prompt 1")
+
+                assert client.generate.call_count == 2
+
+    def describe_disk_tier():
+        def it_survives_a_restart(client, tmp_path):
+            CachingLLMClient(client, cache_dir=str(tmp_path)).generate("prompt-1")
+
+            cache = CachingLLMClient(client, cache_dir=str(tmp_path))
+
+            assert cache.generate("prompt-1") == "response to prompt-1"
+            client.generate.assert_called_once()
+            assert cache.stats()["disk_hits"] == 1
+
+        def it_removes_the_oldest_entries_past_the_limit(client, tmp_path):
+            cache = CachingLLMClient(client, cache_dir=str(tmp_path), max_disk_entries=2)
+
+            for prompt in ["prompt-1", "prompt-2", "prompt-3"]:
+                cache.generate(prompt)
+
+            assert len(list(tmp_path.iterdir())) == 2
+            assert not (tmp_path / (cache.key_for("prompt-1") + ".txt")).exists()
+
+        def it_clears_both_tiers(client, tmp_path):
+            cache = CachingLLMClient(client, cache_dir=str(tmp_path))
+            cache.generate("prompt-1")
+
+            cache.clear()
+            cache.generate("prompt-1")
+
+            assert client.generate.call_count == 2
+
+    def describe_stats():
+        def it_reports_the_hit_rate(client):
+            cache = CachingLLMClient(client)
+            for _ in range(4):
+                cache.generate("prompt-1")
+
+            stats = cache.stats()
+
+            assert stats["misses"] == 1
+            assert stats["memory_hits"] == 3
+            assert stats["hit_rate"] == 0.75
+
+
+def describe_async_caching_llm_client():
+    def it_awaits_the_client_once_per_prompt(mocker):
+        client = mocker.AsyncMock()
+        client.generate.return_value = "response"
+        cache = AsyncCachingLLMClient(client, max_size=8)
+
+        async def generate_twice():
+            return [await cache.generate("prompt-1"), await cache.generate("prompt-1")]
+
+        assert asyncio.run(generate_twice()) == ["response", "response"]
+        client.generate.assert_awaited_once_with("prompt-1")
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from src.infra_fail_mngr.llm.context_packing import ContextPacker, estimate_tokens, history_priority
+
+
+def _tool_output(index, size=10):
+    return {"role": "tool_output", "tool": f"tool-{index}", "result": "x" * size}
+
+
+def describe_estimate_tokens():
+    @pytest.mark.parametrize("text, tokens", [("", 0), ("abc", 1), ("abcd", 1), ("abcde", 2)])
+    def it_counts_four_characters_per_token(text, tokens):
+        assert estimate_tokens(text) == tokens
+
+
+def describe_history_priority():
+    def it_ranks_feedback_above_tool_outputs():
+        assert history_priority({"role": "error"}) > history_priority({"role": "tool_output"}) > history_priority({})
+
+
+def describe_context_packer():
+    def it_keeps_a_context_that_fits():
+        context = {"failures": ["node-1"], "impact_report": {"node-1": {"population_affected": 10}},
+                   "conversation_history": [_tool_output(1)]}
+
+        assert ContextPacker(10000).pack(context) == context
+
+    def it_reports_the_tokens_of_each_section():
+        packer = ContextPacker(10000)
+        context = {"failures": ["node-1"], "impact_report": {}, "conversation_history": []}
+
+        packer.pack(context, reserved_tokens=100)
+
+        assert packer.last_usage["prompt"] == 100
+        assert packer.last_usage["failures"] == packer.count({"failures": ["node-1"]})
+        assert packer.last_usage["total"] == sum(
+            tokens for section, tokens in packer.last_usage.items() if section != "total"
+        )
+
+    def it_uses_the_given_tokenizer():
+        packer = ContextPacker(10000, tokenizer=lambda text: len(text.split()))
+
+        packer.pack({"failures": ["a", "b"]})
+
+        assert packer.last_usage["failures"] == len(json.dumps({"failures": ["a", "b"]}, indent=2).split())
+
+    def it_stays_within_the_budget():
+        packer = ContextPacker(400, response_tokens=50)
+        context = {
+            "failures": [f"node-{i}" for i in range(5)],
+            "impact_report": {f"node-{i}": {"population_affected": i, "notes": "n" * 100} for i in range(20)},
+            "conversation_history": [_tool_output(i, 200) for i in range(20)],
+        }
+
+        packer.pack(context, reserved_tokens=20)
+
+        assert packer.last_usage["total"] <= 400 - 50
+
+    def describe_impact_report():
+        @pytest.fixture
+        def context():
+            return {
+                "failures": ["node-9", "node-8"],
+                "impact_report": {f"node-{i}": {"notes": "n" * 40} for i in range(10)},
+            }
+
+        def it_keeps_the_current_failures_first(context):
+            packed = ContextPacker(120, response_tokens=0, report_share=1.0).pack(context)["impact_report"]
+
+            assert list(packed)[:2] == ["node-9", "node-8"]
+
+        def it_summarizes_the_omitted_nodes(context):
+            packed = ContextPacker(120, response_tokens=0, report_share=1.0).pack(context)["impact_report"]
+
+            kept = [node for node in packed if node != "_omitted"]
+            assert packed["_omitted"] == f"{10 - len(kept)} more nodes"
+
+    def describe_history():
+        def it_truncates_large_tool_outputs():
+            packer = ContextPacker(10000, max_tool_output_tokens=20)
+
+            packed = packer.pack({"conversation_history": [_tool_output(1, 1000)]})["conversation_history"]
+
+            assert packed[0]["result"].endswith("... [truncated]")
+            assert packer.count(packed[0]["result"]) <= 20
+
+        def it_truncates_each_result_of_a_batch():
+            packer = ContextPacker(10000, max_tool_output_tokens=20)
+            entry = {"role": "tool_outputs", "results": [
+                {"tool": "a", "result": ["y" * 10] * 50},
+                {"tool": "b", "result": "small"},
+            ]}
+
+            results = packer.pack({"conversation_history": [entry]})["conversation_history"][0]["results"]
+
+            assert results[0]["result"].endswith("... [truncated]")
+            assert results[1]["result"] == "small"
+
+        def it_drops_plain_tool_outputs_before_errors():
+            history = [{"role": "error", "message": "Unknown tool: x"}] + [_tool_output(i, 100) for i in range(10)]
+            packer = ContextPacker(100, response_tokens=0)
+
+            packed = packer.pack({"conversation_history": history})["conversation_history"]
+
+            assert packed[0] == history[0]
+            assert packed[1:] == history[len(history) - len(packed) + 1:]
+
+        def it_drops_the_oldest_entries_without_priority():
+            history = [_tool_output(i, 100) for i in range(10)]
+
+            packed = ContextPacker(100, response_tokens=0, priority=None).pack(
+                {"conversation_history": history}
+            )["conversation_history"]
+
+            assert packed == history[-len(packed):]
+
+        def it_measures_the_history_in_tokens_only():
+            history = [_tool_output(i) for i in range(5)]
+            packer = ContextPacker(50, tokenizer=lambda text: 10, response_tokens=0)
+
+            packed = packer.pack({"conversation_history": history})["conversation_history"]
+
+            assert packed == history
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from src.infra_fail_mngr.llm.context_trimming import (
+    limit_context_history,
+    serialized_list_size,
+    trim_history,
+)
+
+
+def _reference_limit(context, max_length):
+    """Drop-oldest loop re-serializing the context on every iteration."""
+    if len(json.dumps(context)) <= max_length:
+        return context
+    history = context.get('conversation_history', [])
+    limited_context = context.copy()
+    limited_context['conversation_history'] = history
+    while history and len(json.dumps(limited_context)) > max_length:
+        history = history[1:]
+        limited_context['conversation_history'] = history
+    return limited_context
+
+
+def describe_context_trimming():
+    def describe_serialized_list_size():
+        @pytest.mark.parametrize("items", [[], [1], ["a", {"b": 2}], [[], {}, "xyz", 1.5]])
+        def it_matches_json_dumps(items):
+            sizes = [len(json.dumps(item)) for item in items]
+
+            assert serialized_list_size(sizes) == len(json.dumps(items))
+
+    def describe_trim_history():
+        @pytest.fixture
+        def entries():
+            return [{"role": "tool_output", "result": "x" * i} for i in range(10)]
+
+        def it_keeps_everything_when_it_fits(entries):
+            result = trim_history(entries, len(json.dumps(entries)))
+
+            assert result == entries
+
+        def it_drops_oldest_entries_first(entries):
+            result = trim_history(entries, len(json.dumps(entries[-3:])))
+
+            assert result == entries[-3:]
+
+        def it_returns_empty_list_when_nothing_fits(entries):
+            result = trim_history(entries, 1)
+
+            assert result == []
+
+        def it_measures_each_entry_once(entries, mocker):
+            size_of = mocker.Mock(side_effect=lambda e: len(json.dumps(e)))
+
+            trim_history(entries, 10, size_of=size_of)
+
+            assert size_of.call_count == len(entries)
+
+        def it_applies_the_given_list_overhead(entries):
+            sizes = [1] * len(entries)
+
+            result = trim_history(entries, 3, sizes=sizes, separator_size=0, brackets_size=0)
+
+            assert result == entries[-3:]
+
+        def describe_when_priority_given():
+            def it_drops_lowest_priority_first():
+                entries = [
+                    {"role": "error", "message": "a"},
+                    {"role": "tool_output", "result": "b"},
+                    {"role": "error", "message": "c"},
+                ]
+                priority = lambda e: 0 if e["role"] == "error" else 1
+
+                result = trim_history(entries, len(json.dumps(entries[1:2])), priority=priority)
+
+                assert result == [entries[1]]
+
+            def it_preserves_original_order():
+                entries = [{"n": 3}, {"n": 1}, {"n": 2}]
+
+                result = trim_history(entries, len(json.dumps(entries[:1] + entries[2:])), priority=lambda e: e["n"])
+
+                assert result == [{"n": 3}, {"n": 2}]
+
+    def describe_limit_context_history():
+        @pytest.mark.parametrize("max_length", [10, 50, 120, 300, 1000, 5000])
+        @pytest.mark.parametrize("history_size", [0, 1, 5, 40])
+        def it_matches_the_drop_oldest_loop(max_length, history_size):
+            context = {
+                "failures": ["node-1", "node-2"],
+                "impact_report": {"node-1": {"criticality": "High"}},
+                "conversation_history": [{"role": "tool_output", "result": "r" * (i % 7)} for i in range(history_size)],
+            }
+
+            assert limit_context_history(context, max_length) == _reference_limit(context, max_length)
+
+        def it_returns_the_same_object_when_it_fits():
+            context = {"conversation_history": [{"a": 1}]}
+
+            assert limit_context_history(context, 1000) is context
+
+        def it_does_not_mutate_the_input():
+            history = [{"a": "x" * 20}, {"b": "y" * 20}]
+            context = {"conversation_history": history}
+
+            limit_context_history(context, 40)
+
+            assert context["conversation_history"] is history
+            assert len(history) == 2
+
+        def describe_when_history_key_is_missing():
+            def it_adds_an_empty_history():
+                context = {"failures": ["node-" + str(i) for i in range(20)]}
+
+                assert limit_context_history(context, 10) == _reference_limit(context, 10)
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from src.infra_fail_mngr.llm.incremental_json import IncrementalDecisionParser
+
+DECISION = {
+    "thoughts": "Need the \"weather\", {braces} and [brackets] are text",
+    "action": "get_weather_at_location",
+    "arguments": {"location": "loc-1", "nested": {"list": [1, 2.5, None, True], "escaped": "a\\b"}},
+}
+
+
+def _feed(parser, text, chunk_size):
+    for i in range(0, len(text), chunk_size):
+        parser.feed(text[i:i + chunk_size])
+
+
+def describe_incremental_decision_parser():
+    @pytest.fixture
+    def parser():
+        return IncrementalDecisionParser()
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def it_matches_json_loads(parser, chunk_size, indent):
+        text = json.dumps(DECISION, indent=indent)
+
+        _feed(parser, text, chunk_size)
+
+        assert parser.result() == json.loads(text)
+
+    def it_exposes_the_action_before_the_response_ends(parser):
+        text = json.dumps({"action": "tool-1", "arguments": {"a": 1}, "thoughts": "long " * 50})
+
+        _feed(parser, text[:text.index('"thoughts"')], 5)
+
+        assert parser.action_ready
+        assert parser.fields["action"] == "tool-1"
+        assert parser.fields["arguments"] == {"a": 1}
+        assert not parser.done
+
+    def it_waits_for_the_arguments(parser):
+        parser.feed('{"action": "tool-1", "argum')
+
+        assert parser.fields == {"action": "tool-1"}
+        assert not parser.action_ready
+
+    def it_is_ready_without_arguments_once_closed(parser):
+        parser.feed('{"action": "tool-1"}')
+
+        assert parser.action_ready
+
+    def it_parses_an_empty_object(parser):
+        parser.feed(" {} ")
+
+        assert parser.result() == {}
+
+    def describe_when_the_response_is_malformed():
+        def it_rejects_a_non_object_at_once(parser):
+            with pytest.raises(ValueError):
+                parser.feed("Sure! Here is")
+
+        def it_rejects_an_invalid_field_before_the_end(parser):
+            with pytest.raises(ValueError):
+                parser.feed('{"action": tool-1, "arguments": ')
+
+        def it_rejects_unquoted_field_names(parser):
+            with pytest.raises(ValueError):
+                parser.feed('{action: "tool-1"')
+
+        def it_rejects_data_after_the_object(parser):
+            with pytest.raises(ValueError):
+                parser.feed('{"action": "tool-1"} trailing')
+
+        def it_rejects_an_incomplete_response(parser):
+            parser.feed('{"action": "tool-1", "arguments": {')
+
+            with pytest.raises(ValueError):
+                parser.result()
@@ -1,6 +1,6 @@
 import pytest
 
-from src.infra_fail_mngr.llm import LLMClientImpl
+from src.infra_fail_mngr.llm import LLMClientImpl, StreamingLLMClientImpl
 
 def describe_llm_client_impl():
 
@@ -59,3 +59,14 @@ def describe_llm_client_impl():
                 assert res3 == "test-res-2"
                 assert client.response_index == 3
 
+
+
+def describe_streaming_llm_client_impl():
+    def describe_generate_stream():
+        def it_streams_the_next_response_in_chunks():
+            client = StreamingLLMClientImpl(["0123456789"], chunk_size=4)
+
+            assert list(client.generate_stream("test-prompt")) == ["0123", "4567", "89"]
+
+        def it_streams_nothing_for_an_empty_response():
+            assert list(StreamingLLMClientImpl([]).generate_stream("test-prompt")) == []
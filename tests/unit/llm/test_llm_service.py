@@ -1,9 +1,13 @@
+import asyncio
 import json
 
 import pytest
 
-from src.infra_fail_mngr.llm.llm_client import LLMClientImpl
-from src.infra_fail_mngr.llm.llm_service import LLMServiceImpl
+from src.infra_fail_mngr.llm.llm_client import AsyncLLMClientImpl, LLMClientImpl
+from src.infra_fail_mngr.llm import llm_service as llm_service_module
+from src.infra_fail_mngr.llm.llm_service import AsyncLLMServiceImpl, LLMServiceImpl
+from src.infra_fail_mngr.llm.context_packing import ContextPacker
+from src.infra_fail_mngr.tracing import InMemoryExporter, Tracer
 
 
 def describe_llm_service_impl():
@@ -76,6 +80,22 @@ def describe_llm_service_impl():
 
                 spy.assert_called_once()
 
+            def it_renders_static_sections_once(service, mocker):
+                spy = mocker.spy(llm_service_module, 'PromptBuilder')
+
+                service.handle_request("prompt-1", {"key-1": "val-1"}, "tools")
+                service.handle_request("prompt-1", {"key-2": "val-2"}, "tools")
+
+                spy.assert_called_once_with("prompt-1", "tools")
+
+            def it_rebuilds_static_sections_when_tools_change(service, mocker):
+                spy = mocker.spy(llm_service_module, 'PromptBuilder')
+
+                service.handle_request("prompt-1", {}, "tools")
+                service.handle_request("prompt-1", {}, "other tools")
+
+                assert spy.call_count == 2
+
         def describe_when_multiple_requests():
             @pytest.fixture
             def responses():
@@ -186,3 +206,148 @@ def describe_llm_service_impl():
             def it_raises_json_decode_error(service):
                 with pytest.raises(ValueError):
                     service.handle_request("prompt-1", {}, "tools")
+
+
+def describe_handle_request_stream():
+    @pytest.fixture
+    def response():
+        return json.dumps({"action": "tool-1", "arguments": {"a": 1}, "thoughts": "t" * 40})
+
+    @pytest.fixture
+    def stream_log():
+        return {"sent": [], "closed": False}
+
+    @pytest.fixture
+    def client(mocker, stream_log):
+        client = mocker.Mock()
+
+        def generate_stream(prompt, text):
+            try:
+                for i in range(0, len(text), 5):
+                    stream_log["sent"].append(text[i:i + 5])
+                    yield text[i:i + 5]
+            finally:
+                stream_log["closed"] = True
+
+        client.stream_text = None
+        client.generate_stream.side_effect = lambda prompt: generate_stream(prompt, client.stream_text)
+        return client
+
+    def it_returns_the_parsed_decision(client, response):
+        client.stream_text = response
+
+        result = LLMServiceImpl(client).handle_request_stream("prompt-1", {}, "tools")
+
+        assert result == json.loads(response)
+
+    def it_reports_the_action_before_the_stream_ends(client, response, stream_log):
+        client.stream_text = response
+        seen = []
+
+        def on_action(action, arguments):
+            seen.append((action, arguments, "".join(stream_log["sent"])))
+
+        LLMServiceImpl(client).handle_request_stream("prompt-1", {}, "tools", on_action)
+
+        assert len(seen) == 1
+        action, arguments, sent = seen[0]
+        assert (action, arguments) == ("tool-1", {"a": 1})
+        assert len(sent) < len(response)
+
+    def it_records_the_timings(client, response):
+        client.stream_text = response
+        service = LLMServiceImpl(client)
+
+        service.handle_request_stream("prompt-1", {}, "tools")
+
+        assert 0 <= service.last_stream_timings["first_chunk"] <= service.last_stream_timings["action"]
+        assert service.last_stream_timings["action"] <= service.last_stream_timings["total"]
+
+    def it_aborts_a_malformed_response_early(client, stream_log):
+        client.stream_text = '{"action": oops, "arguments": {}, "thoughts": "' + "t" * 200 + '"}'
+
+        with pytest.raises(ValueError):
+            LLMServiceImpl(client).handle_request_stream("prompt-1", {}, "tools")
+
+        assert stream_log["closed"]
+        assert len("".join(stream_log["sent"])) < 30
+
+    def it_raises_on_empty_response(client):
+        client.stream_text = ""
+
+        with pytest.raises(ValueError):
+            LLMServiceImpl(client).handle_request_stream("prompt-1", {}, "tools")
+
+    def it_sends_the_same_prompt_as_handle_request(client, mocker):
+        client.stream_text = "{}"
+        client.generate.return_value = "{}"
+        service = LLMServiceImpl(client)
+
+        service.handle_request_stream("prompt-1", {"k": "v"}, "tools")
+        service.handle_request("prompt-1", {"k": "v"}, "tools")
+
+        assert client.generate_stream.call_args == client.generate.call_args
+
+
+def describe_async_llm_service_impl():
+    def describe_handle_request():
+        def it_returns_parsed_json_response():
+            response = {"thoughts": "thoughts-1", "action": "action-1", "arguments": {}}
+            service = AsyncLLMServiceImpl(AsyncLLMClientImpl([json.dumps(response)]))
+
+            result = asyncio.run(service.handle_request("prompt-1", {"key-1": "val-1"}, "tools"))
+
+            assert result == response
+
+        def it_sends_the_same_prompt_as_the_sync_service(mocker):
+            client = mocker.AsyncMock()
+            client.generate.return_value = "{}"
+            sync_client = mocker.Mock()
+            sync_client.generate.return_value = "{}"
+            context = {"conversation_history": [{"role": "error"}]}
+
+            asyncio.run(AsyncLLMServiceImpl(client).handle_request("prompt-1", context, "tools"))
+            LLMServiceImpl(sync_client).handle_request("prompt-1", context, "tools")
+
+            assert client.generate.await_args == sync_client.generate.call_args
+
+        def it_raises_on_empty_response():
+            service = AsyncLLMServiceImpl(AsyncLLMClientImpl([""]))
+
+            with pytest.raises(ValueError):
+                asyncio.run(service.handle_request("prompt-1", {}, "tools"))
+
+
+def describe_with_a_context_packer():
+    def it_packs_the_context_within_the_window_left_by_the_prompt(mocker):
+        packer = ContextPacker(2000)
+        service = LLMServiceImpl(LLMClientImpl(['{"action": "a"}']), context_packer=packer)
+        spy = mocker.spy(packer, "pack")
+        history = [{"role": "tool_output", "result": "x" * 100} for _ in range(100)]
+
+        service.handle_request("prompt-1", {"conversation_history": history}, "tool-1")
+
+        assert spy.call_args.kwargs["reserved_tokens"] == packer.count(service.prompt_builder.static_prefix)
+        assert 0 < len(spy.spy_return["conversation_history"]) < len(history)
+        assert packer.last_usage["total"] <= 2000 - packer.response_tokens
+
+
+def describe_with_compact_context():
+    def it_sends_the_context_compactly(mocker):
+        client = LLMClientImpl(['{"action": "a"}'])
+        spy = mocker.spy(client, "generate")
+        service = LLMServiceImpl(client, compact_context=True)
+
+        service.handle_request("prompt-1", {"impact_report": {"node-1": {"criticality": "High"}}}, "tool-1")
+
+        assert '{"impact_report":{"columns":["nodes","criticality"],"rows":[[["node-1"],"High"]]}}' in spy.call_args.args[0]
+
+
+def describe_with_a_tracer():
+    def it_traces_prompt_building_and_generation():
+        exporter = InMemoryExporter()
+        service = LLMServiceImpl(LLMClientImpl(['{"action": "a"}']), tracer=Tracer(exporter))
+
+        service.handle_request("prompt-1", {}, "tool-1")
+
+        assert [span.name for span in exporter.spans] == ["llm.prompt", "llm.generate"]
@@ -0,0 +1,93 @@
+import logging
+import threading
+
+import pytest
+
+from src.infra_fail_mngr.logs import (
+    LOGGER_NAME,
+    RAW_RESPONSE_LOGGER_NAME,
+    SamplingFilter,
+    configure_logging,
+    get_logger,
+)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+
+def _record():
+    return logging.LogRecord("name", logging.DEBUG, __file__, 1, "msg", (), None)
+
+
+def describe_sampling_filter():
+    @pytest.mark.parametrize("rate, kept", [(0.0, 0), (0.1, 10), (0.25, 25), (1.0, 100)])
+    def it_keeps_the_share_of_records(rate, kept):
+        sampling = SamplingFilter(rate)
+
+        assert sum(sampling.filter(_record()) for _ in range(100)) == kept
+
+    def it_rejects_rates_outside_of_0_and_1():
+        with pytest.raises(ValueError):
+            SamplingFilter(1.5)
+
+
+def describe_configure_logging():
+    @pytest.fixture
+    def handler():
+        handler = _ListHandler()
+        yield handler
+        logger = logging.getLogger(LOGGER_NAME)
+        for h in [h for h in logger.handlers if not isinstance(h, logging.NullHandler)]:
+            logger.removeHandler(h)
+        logger.setLevel(logging.NOTSET)
+        raw_logger = logging.getLogger(RAW_RESPONSE_LOGGER_NAME)
+        raw_logger.setLevel(logging.NOTSET)
+        for f in list(raw_logger.filters):
+            raw_logger.removeFilter(f)
+
+    def it_writes_the_records_on_a_background_thread(handler):
+        listener = configure_logging(handlers=[handler])
+        get_logger("agent").info("--- STATE: %s ---", "INIT")
+        listener.stop()
+
+        assert handler.records == ["--- STATE: INIT ---"]
+        assert threading.current_thread().name not in handler.threads
+
+    def it_gates_by_level(handler):
+        listener = configure_logging(level=logging.WARNING, handlers=[handler])
+        get_logger("agent").info("dropped")
+        get_logger("agent").warning("kept")
+        listener.stop()
+
+        assert handler.records == ["kept"]
+
+    def it_drops_raw_responses_by_default(handler):
+        listener = configure_logging(handlers=[handler])
+        logging.getLogger(RAW_RESPONSE_LOGGER_NAME).debug("Raw LLM response: %s", "{}")
+        listener.stop()
+
+        assert handler.records == []
+
+    def it_samples_raw_responses(handler):
+        listener = configure_logging(handlers=[handler], raw_response_sample_rate=0.5)
+        for i in range(4):
+            logging.getLogger(RAW_RESPONSE_LOGGER_NAME).debug("Raw LLM response: %d", i)
+        listener.stop()
+
+        assert handler.records == ["Raw LLM response: 1", "Raw LLM response: 3"]
+
+    def it_formats_messages_lazily(handler, mocker):
+        listener = configure_logging(level=logging.WARNING, handlers=[handler])
+        argument = mocker.MagicMock()
+        get_logger("agent").info("%s", argument)
+        listener.stop()
+
+        argument.__str__.assert_not_called()
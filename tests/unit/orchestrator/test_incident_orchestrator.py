@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src.infra_fail_mngr.agent.agent import InfraAgent
+from src.infra_fail_mngr.agent.step_history import StepHistory
+from src.infra_fail_mngr.orchestrator.incident_orchestrator import IncidentOrchestrator, compute_stats
+from src.infra_fail_mngr.states import State
+from src.infra_fail_mngr.tools.agent_tools import AgentTools
+from src.infra_fail_mngr.tools.system_tools import SystemTools
+
+
+@pytest.fixture
+def agent_factory(mocker):
+    def factory(incident):
+        system_repo = mocker.Mock()
+        del system_repo.get_failed_nodes_since
+        system_repo.get_failed_nodes.side_effect = [incident["failures"], []]
+        system_repo.assign_crew.return_value = True
+        system_tools = SystemTools(system_repo)
+        agent_tools = AgentTools(mocker.Mock(), [system_tools.assign_repair_crew])
+        llm_service = mocker.Mock()
+        llm_service.handle_request.return_value = json.dumps({
+            "action": "assign_repair_crew",
+            "arguments": {"node_ids": incident["failures"], "crew_ids": ["crew-1"] * len(incident["failures"])}
+        })
+        return InfraAgent(llm_service, system_tools, agent_tools)
+
+    return factory
+
+
+def describe_incident_orchestrator():
+    def describe_with_a_step_history_dir():
+        def it_spills_each_incident_to_its_own_file(agent_factory, tmp_path):
+            agents = []
+
+            def factory(incident):
+                agent = agent_factory(incident)
+                agent.step_history = StepHistory(max_in_memory=1)
+                agents.append(agent)
+                return agent
+
+            incidents = [{"failures": ["node-1"]}, {"failures": ["node-2"]}]
+            IncidentOrchestrator(factory, max_concurrency=1, step_history_dir=str(tmp_path)).run(incidents)
+
+            assert sorted(path.name for path in tmp_path.iterdir()) == ["incident-0.jsonl", "incident-1.jsonl"]
+            assert all(agent.step_history.spilled == len(agent.step_history) - 1 for agent in agents)
+            assert [step["action"] for step in agents[0].step_history][0] == "initialize"
+
+    def describe_run():
+        def describe_when_incidents_complete():
+            @pytest.fixture
+            def incidents():
+                return [{"region": f"region-{i}", "failures": [f"node-{i}"]} for i in range(12)]
+
+            def it_collects_a_summary_per_incident(agent_factory, incidents):
+                result = IncidentOrchestrator(agent_factory, max_concurrency=4).run(incidents)
+
+                assert len(result["results"]) == 12
+                assert {r["incident"]["region"] for r in result["results"]} == {i["region"] for i in incidents}
+                assert all(r["summary"]["current_state"] == State.FINAL.name for r in result["results"])
+
+            def it_reports_stats(agent_factory, incidents):
+                stats = IncidentOrchestrator(agent_factory, max_concurrency=4).run(incidents)["stats"]
+
+                assert stats["incidents"] == 12
+                assert stats["reached_final"] == 12
+                assert stats["errors"] == 0
+                assert stats["incidents_per_sec"] > 0
+                assert stats["p50_time_to_final"] <= stats["p99_time_to_final"]
+
+        def describe_when_an_agent_raises():
+            def it_reports_the_error_and_continues(agent_factory):
+                def factory(incident):
+                    if incident["region"] == "broken":
+                        raise RuntimeError("no backend")
+                    return agent_factory(incident)
+
+                result = IncidentOrchestrator(factory, max_concurrency=2).run([
+                    {"region": "broken", "failures": []},
+                    {"region": "ok", "failures": ["node-1"]},
+                ])
+
+                by_region = {r["incident"]["region"]: r for r in result["results"]}
+                assert "no backend" in by_region["broken"]["error"]
+                assert by_region["ok"]["reached_final"] is True
+                assert result["stats"]["errors"] == 1
+
+            def it_records_a_failing_summary_as_the_incident_error(agent_factory):
+                def factory(incident):
+                    agent = agent_factory(incident)
+                    if incident["region"] == "broken":
+                        agent.get_summary = lambda: 1 / 0
+                    return agent
+
+                result = IncidentOrchestrator(factory, max_concurrency=1).run([
+                    {"region": "broken", "failures": ["node-1"]},
+                    {"region": "ok", "failures": ["node-2"]},
+                ])
+
+                by_region = {r["incident"]["region"]: r for r in result["results"]}
+                assert "ZeroDivisionError" in by_region["broken"]["error"]
+                assert by_region["broken"]["summary"] is None
+                assert by_region["ok"]["reached_final"] is True
+
+        def describe_when_an_incident_exceeds_its_timeout():
+            def it_stops_the_agent_between_steps(agent_factory):
+                def factory(incident):
+                    agent = agent_factory(incident)
+                    run_step = agent.run_step
+
+                    def slow_step():
+                        time.sleep(0.02)
+                        run_step()
+
+                    agent.run_step = slow_step
+                    return agent
+
+                result = IncidentOrchestrator(factory, incident_timeout=0.03).run([{"failures": ["node-1"]}])
+
+                assert result["results"][0]["timed_out"] is True
+                assert result["results"][0]["reached_final"] is False
+                assert result["stats"]["p50_time_to_final"] is None
+
+            def it_abandons_an_agent_stuck_in_a_call(agent_factory):
+                release = threading.Event()
+
+                def factory(incident):
+                    agent = agent_factory(incident)
+                    if incident["region"] == "hung":
+                        agent.run_step = lambda: release.wait(5)
+                    return agent
+
+                start = time.monotonic()
+                result = IncidentOrchestrator(factory, max_concurrency=1, incident_timeout=0.05).run([
+                    {"region": "hung", "failures": ["node-1"]},
+                    {"region": "ok", "failures": ["node-2"]},
+                ])
+                elapsed = time.monotonic() - start
+                release.set()
+
+                by_region = {r["incident"]["region"]: r for r in result["results"]}
+                assert by_region["hung"]["timed_out"] is True
+                assert by_region["hung"]["summary"] is None
+                # The slot of the hung agent is given to the next incident
+                assert by_region["ok"]["reached_final"] is True
+                assert elapsed < 1
+
+    def describe_iter_results():
+        def it_applies_backpressure_on_the_incident_stream(agent_factory):
+            release = threading.Event()
+            consumed = []
+
+            def factory(incident):
+                release.wait(1)
+                return agent_factory(incident)
+
+            def incidents():
+                for i in range(10):
+                    consumed.append(i)
+                    yield {"failures": [f"node-{i}"]}
+
+            orchestrator = IncidentOrchestrator(factory, max_concurrency=2, max_pending=1)
+            results = orchestrator.iter_results(incidents())
+            consumer = threading.Thread(target=lambda: list(results))
+            consumer.start()
+            time.sleep(0.05)
+            consumed_while_blocked = len(consumed)
+            release.set()
+            consumer.join(2)
+
+            assert consumed_while_blocked == 4
+            assert len(consumed) == 10
+
+
+def describe_compute_stats():
+    def it_computes_nearest_rank_percentiles():
+        results = [
+            {"elapsed": float(i), "reached_final": True, "timed_out": False, "error": None}
+            for i in range(1, 101)
+        ]
+
+        stats = compute_stats(results, wall_time=10.0)
+
+        assert stats["p50_time_to_final"] == 50.0
+        assert stats["p99_time_to_final"] == 99.0
+        assert stats["incidents_per_sec"] == 10.0
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from src.infra_fail_mngr.prompts.context_encoding import columnar_report, encode_context_compact
+
+
+def describe_columnar_report():
+    def it_aggregates_nodes_with_identical_impact_values():
+        report = {
+            "node-1": {"population_affected": 10, "criticality": "High"},
+            "node-2": {"population_affected": 5, "criticality": "Low"},
+            "node-3": {"population_affected": 10, "criticality": "High"},
+        }
+
+        assert columnar_report(report) == {
+            "columns": ["nodes", "population_affected", "criticality"],
+            "rows": [[["node-1", "node-3"], 10, "High"], [["node-2"], 5, "Low"]],
+        }
+
+    @pytest.mark.parametrize("report", [
+        {},
+        {"node-1": {"a": 1}, "node-2": {"b": 1}},
+        {"node-1": {"a": 1, "b": 2}, "node-2": {"b": 2, "a": 1}},
+        {"node-1": {"a": [1]}},
+        {"node-1": "down"},
+        ["node-1"],
+    ])
+    def it_leaves_heterogeneous_reports_unchanged(report):
+        assert columnar_report(report) is report
+
+
+def describe_encode_context_compact():
+    def it_serializes_without_whitespace():
+        context = {"failures": ["node-1"], "conversation_history": [{"role": "error"}]}
+
+        assert encode_context_compact(context) == '{"failures":["node-1"],"conversation_history":[{"role":"error"}]}'
+
+    def it_renders_the_impact_report_as_columns():
+        context = {"impact_report": {"node-1": {"criticality": "High"}}}
+
+        assert json.loads(encode_context_compact(context)) == {
+            "impact_report": {"columns": ["nodes", "criticality"], "rows": [[["node-1"], "High"]]}
+        }
+
+    def it_does_not_modify_the_context():
+        context = {"impact_report": {"node-1": {"criticality": "High"}}}
+
+        encode_context_compact(context)
+
+        assert context == {"impact_report": {"node-1": {"criticality": "High"}}}
@@ -0,0 +1,73 @@
+import pytest
+
+from src.infra_fail_mngr.prompts.prompt_builder import PromptBuilder
+from src.infra_fail_mngr.prompts.prompt_formatting import (
+    include_context,
+    include_response_format,
+    include_tools
+)
+
+
+def describe_prompt_builder():
+    @pytest.fixture
+    def builder():
+        return PromptBuilder("prompt-1", "tool-1, tool-2")
+
+    @pytest.fixture
+    def context():
+        return {"failures": ["node-1"], "impact_report": {"node-1": {"criticality": "High"}}}
+
+    def describe_build():
+        def it_renders_the_static_sections_before_the_context(builder, context):
+            expected = include_context(include_tools(include_response_format("prompt-1"), "tool-1, tool-2"), context)
+
+            assert builder.build(context) == expected
+
+        def it_includes_all_sections(builder, context):
+            result = builder.build(context)
+
+            assert "prompt-1" in result
+            assert "Response Format:" in result
+            assert "Available Tools:" in result
+            assert '"node-1"' in result
+
+        def it_starts_every_prompt_with_the_static_prefix(builder, context):
+            first = builder.build(context)
+            second = builder.build({"failures": []})
+
+            assert first[:builder.prefix_boundary] == builder.static_prefix
+            assert second[:builder.prefix_boundary] == builder.static_prefix
+
+        def it_puts_only_the_context_after_the_boundary(builder, context):
+            result = builder.build(context)
+
+            assert "Available Tools:" not in result[builder.prefix_boundary:]
+            assert '"node-1"' in result[builder.prefix_boundary:]
+
+        def describe_when_compact():
+            @pytest.fixture
+            def compact_builder():
+                return PromptBuilder("prompt-1", "tool-1, tool-2", compact=True)
+
+            def it_renders_like_compact_include_context(compact_builder, context):
+                expected = include_context(
+                    include_tools(include_response_format("prompt-1"), "tool-1, tool-2"), context, compact=True
+                )
+
+                assert compact_builder.build(context) == expected
+
+            def it_encodes_the_context_compactly(compact_builder, context):
+                result = compact_builder.build(context)
+
+                assert '{"failures":["node-1"]' in result[compact_builder.prefix_boundary:]
+                assert '"columns":["nodes","criticality"]' in result
+
+    def describe_matches():
+        def it_matches_the_same_sections(builder):
+            assert builder.matches("prompt-1", "tool-1, tool-2")
+
+        def it_does_not_match_other_tools(builder):
+            assert not builder.matches("prompt-1", "tool-3")
+
+        def it_does_not_match_another_prompt(builder):
+            assert not builder.matches("prompt-2", "tool-1, tool-2")
@@ -156,6 +156,11 @@ def describe_prompt_formatting():
 
             assert '"arguments"' in result
 
+        def it_includes_tool_calls_field():
+            result = include_response_format("prompt-1")
+
+            assert '"tool_calls"' in result
+
     def describe_include_tools():
         def describe_when_tools_is_empty_string():
             def it_includes_prompt():
@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import pytest
+
+from src.infra_fail_mngr.simulation import InfraSimulator, Topology
+
+
+@pytest.fixture(scope="module")
+def topology():
+    return Topology.generate(num_nodes=2000, num_depots=5, seed=3)
+
+
+def describe_infra_simulator():
+    def it_starts_with_the_seeded_failures(topology):
+        first = InfraSimulator(topology, initial_failures=20, seed=1)
+        second = InfraSimulator(topology, initial_failures=20, seed=1)
+
+        assert len(first.get_failed_nodes()) == 20
+        assert first.get_failed_nodes() == second.get_failed_nodes()
+
+    def it_returns_the_failures_after_a_cursor(topology):
+        simulator = InfraSimulator(topology, initial_failures=0, seed=1)
+        simulator.inject_failures(0, nodes=["node1"])
+        failed, cursor = simulator.get_failed_nodes_since(None)
+
+        assert failed == ["node1"]
+        assert simulator.get_failed_nodes_since(cursor) == ([], cursor)
+
+        simulator.inject_failures(0, nodes=["node2"])
+
+        assert simulator.get_failed_nodes_since(cursor)[0] == ["node2"]
+
+    def it_describes_nodes(topology):
+        simulator = InfraSimulator(topology, initial_failures=0, seed=1)
+
+        details = simulator.get_node_details("node5")
+
+        assert details["node_id"] == "node5"
+        assert details["failed"] is False
+        assert isinstance(details["critical"], bool)
+        assert simulator.get_node_details_batch(["node5"]) == {"node5": details}
+
+    def it_repairs_assigned_nodes_once_the_crew_is_done(topology):
+        simulator = InfraSimulator(topology, initial_failures=0, assignment_failure_rate=0.0,
+                                   cascade_probability=0.0, seed=1)
+        simulator.inject_failures(0, nodes=["node10"])
+        duration = simulator.estimate_travel_time(simulator.crew_location("crew0"), "node10") \
+            + simulator.estimate_repair_time("node10")
+
+        assert simulator.assign_crew("node10", "crew0") is True
+        assert simulator.is_crew_available("crew0") is False
+        assert "crew0" not in simulator.get_available_crews()
+        assert simulator.crew_location("crew0") == "node10"
+
+        simulator.advance(duration - 1)
+        assert simulator.get_failed_nodes() == ["node10"]
+
+        assert simulator.advance(1)["repaired"] == ["node10"]
+        assert simulator.get_failed_nodes() == []
+        assert simulator.is_crew_available("crew0") is True
+
+    def it_refuses_assignments_to_working_nodes_and_busy_crews(topology):
+        simulator = InfraSimulator(topology, initial_failures=0, assignment_failure_rate=0.0, seed=1)
+        simulator.inject_failures(0, nodes=["node1", "node2"])
+
+        assert simulator.assign_crew("node3", "crew0") is False
+        assert simulator.assign_crew("node1", "crew0") is True
+        assert simulator.assign_crew("node2", "crew0") is False
+
+    def it_fails_assignments_at_the_configured_rate_regardless_of_order(topology):
+        pairs = [(f"node{i}", f"crew{i}") for i in range(200)]
+        outcomes = []
+        for ordered in (pairs, pairs[::-1]):
+            simulator = InfraSimulator(topology, initial_failures=0, assignment_failure_rate=0.3, seed=1)
+            simulator.inject_failures(0, nodes=[node for node, _ in pairs])
+            outcomes.append({pair: simulator.assign_crew(*pair) for pair in ordered})
+
+        assert outcomes[0] == outcomes[1]
+        assert 30 < list(outcomes[0].values()).count(False) < 90
+
+    def it_cascades_failures_downstream_of_unattended_nodes(topology):
+        root = max(topology.nodes.values(), key=lambda node: len(node.downstream))
+        simulator = InfraSimulator(topology, initial_failures=0, cascade_probability=1.0, seed=1)
+        simulator.inject_failures(0, nodes=[root.node_id])
+
+        cascaded = simulator.advance(60)["cascaded"]
+
+        assert cascaded == root.downstream
+        assert simulator.get_failed_nodes() == [root.node_id, *root.downstream]
+
+    def it_slows_travel_in_storms(topology):
+        calm = InfraSimulator(topology, initial_failures=0, storm_share=0.0, seed=1)
+        stormy = InfraSimulator(topology, initial_failures=0, storm_share=1.0, seed=1)
+
+        calm_time = calm.estimate_travel_time("depot0", "node100")
+
+        assert stormy.estimate_travel_time("depot0", "node100") == pytest.approx(2 * calm_time, abs=1)
+        assert calm.estimate_travel_times(["depot0"], ["node100", "depot0"]) == [[calm_time, 0]]
+
+    def it_estimates_repair_times_in_batches(topology):
+        simulator = InfraSimulator(topology, initial_failures=0, seed=1)
+
+        assert simulator.estimate_repair_times(["node1", "node2"]) == [
+            simulator.estimate_repair_time("node1"), simulator.estimate_repair_time("node2")
+        ]
+
+    def it_reports_the_weather_of_the_zone(topology):
+        simulator = InfraSimulator(topology, initial_failures=0, seed=1)
+        node = topology.nodes["node7"]
+
+        assert simulator.get_weather_at_location("node7") == simulator.temperatures[node.zone]
+
+    def it_answers_calendar_questions(topology):
+        simulator = InfraSimulator(topology, initial_failures=0, seed=1)
+
+        assert simulator.is_weekend(datetime(2024, 1, 13)) is True
+        assert simulator.is_holiday(datetime(2024, 12, 25)) is True
+        assert simulator.get_time_of_day(8) == "morning"
+        assert simulator.get_time_of_day(23) == "night"
+
+    def it_injects_latency_in_every_call(topology):
+        delays = []
+        simulator = InfraSimulator(topology, initial_failures=0, latency=0.01, jitter=0.005, seed=1,
+                                   sleep=delays.append)
+
+        simulator.get_failed_nodes()
+        simulator.get_available_crews()
+
+        assert len(delays) == 2
+        assert all(0.01 <= delay <= 0.015 for delay in delays)
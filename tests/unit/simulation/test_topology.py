@@ -0,0 +1,39 @@
+from src.infra_fail_mngr.simulation import Topology
+
+
+def describe_topology():
+    def it_is_identical_for_the_same_seed():
+        first = Topology.generate(num_nodes=500, seed=7)
+        second = Topology.generate(num_nodes=500, seed=7)
+
+        assert [node.details() for node in first.nodes.values()] == [node.details() for node in second.nodes.values()]
+        assert first.depots == second.depots
+
+    def it_differs_between_seeds():
+        first = Topology.generate(num_nodes=100, seed=1)
+        second = Topology.generate(num_nodes=100, seed=2)
+
+        assert [node.details() for node in first.nodes.values()] != [node.details() for node in second.nodes.values()]
+
+    def it_links_every_node_to_an_earlier_upstream_node():
+        topology = Topology.generate(num_nodes=1000, seed=0)
+
+        for index, node in enumerate(topology.nodes.values()):
+            if node.upstream is not None:
+                assert int(node.upstream[len("node"):]) < index
+                assert node.node_id in topology.nodes[node.upstream].downstream
+        assert topology.nodes["node0"].kind == "substation"
+
+    def it_places_nodes_and_depots_in_weather_zones():
+        topology = Topology.generate(num_nodes=200, num_depots=3, size_km=100, zones_per_side=2, seed=0)
+
+        assert topology.zones() == ["zone0-0", "zone0-1", "zone1-0", "zone1-1"]
+        assert {node.zone for node in topology.nodes.values()} <= set(topology.zones())
+        assert topology.zone_of("depot0") in topology.zones()
+
+    def it_measures_distances_between_locations():
+        topology = Topology.generate(num_nodes=10, seed=0)
+        topology.depots["depot-a"] = (0.0, 0.0)
+        topology.depots["depot-b"] = (3.0, 4.0)
+
+        assert topology.distance_km("depot-a", "depot-b") == 5.0
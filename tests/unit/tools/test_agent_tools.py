@@ -242,3 +242,59 @@ def describe_agent_tools():
                 result = agent_tools_base.get_tool(tool_name)
 
                 assert result is None
+
+        def describe_when_name_is_not_a_tool():
+            @pytest.fixture
+            def tool_name():
+                return "get_tool_descriptions"
+
+            def it_returns_none(agent_tools_base, tool_name):
+                assert agent_tools_base.get_tool(tool_name) is None
+                assert agent_tools_base.get_tool("repo") is None
+
+        def describe_when_tool_is_additional():
+            def it_returns_the_additional_tool(repo_mock):
+                def test_tool_3(arg: str):
+                    """Test tool 3 docstring."""
+
+                tools = AgentTools(repo_mock, additional_tools=[test_tool_3])
+
+                assert tools.get_tool("test_tool_3") is test_tool_3
+
+    def describe_get_tool_schemas():
+        def it_returns_schema_per_tool(agent_tools_base):
+            schemas = agent_tools_base.get_tool_schemas()
+
+            assert schemas["get_weather_at_location"] == {
+                "type": "object",
+                "properties": {"location": {"type": "string"}},
+                "required": ["location"],
+            }
+            assert schemas["get_available_crews"]["required"] == []
+
+    def describe_when_travel_time_matrix_given():
+        @pytest.fixture
+        def travel_times(mocker):
+            matrix = mocker.Mock()
+            matrix.get.return_value = 42
+            matrix.matrix.return_value = [[1, 2]]
+            return matrix
+
+        @pytest.fixture
+        def agent_tools(repo_mock, travel_times):
+            return AgentTools(repo_mock, additional_tools=[], travel_times=travel_times)
+
+        def it_reads_travel_time_from_the_matrix(agent_tools, repo_mock, travel_times):
+            result = agent_tools.estimate_travel_time("origin-1", "destination-1")
+
+            assert result["time"] == 42
+            travel_times.get.assert_called_once_with("origin-1", "destination-1")
+            repo_mock.estimate_travel_time.assert_not_called()
+
+        def it_registers_the_bulk_travel_times_tool(agent_tools):
+            result = agent_tools.get_tool("estimate_travel_times")(["origin-1"], ["node-1", "node-2"])
+
+            assert result == {"origins": ["origin-1"], "destinations": ["node-1", "node-2"], "times": [[1, 2]]}
+
+        def it_does_not_register_the_bulk_tool_without_a_matrix(agent_tools_base):
+            assert agent_tools_base.get_tool("estimate_travel_times") is None
@@ -0,0 +1,144 @@
+import itertools
+import random
+
+import pytest
+
+from src.infra_fail_mngr.tools import assignment_solver
+from src.infra_fail_mngr.tools.assignment_solver import CrewAssignmentPlanner, solve_assignment
+from src.infra_fail_mngr.tools.system_tools import SystemTools
+from src.infra_fail_mngr.tools.travel_time_matrix import TravelTimeMatrix
+
+
+def _brute_force_cost(cost):
+    rows, cols = len(cost), len(cost[0])
+    if rows <= cols:
+        return min(sum(cost[r][p[r]] for r in range(rows)) for p in itertools.permutations(range(cols), rows))
+    return min(sum(cost[p[c]][c] for c in range(cols)) for p in itertools.permutations(range(rows), cols))
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(assignment_solver, "np", None)
+    elif assignment_solver.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+def describe_solve_assignment():
+    def it_returns_empty_for_empty_matrix(backend):
+        assert solve_assignment([]) == []
+
+    def it_solves_a_square_matrix(backend):
+        cost = [
+            [4, 1, 3],
+            [2, 0, 5],
+            [3, 2, 2],
+        ]
+
+        assert solve_assignment(cost) == [(0, 1), (1, 0), (2, 2)]
+
+    def it_assigns_every_row_when_there_are_more_columns(backend):
+        cost = [[5, 1, 9, 9], [1, 5, 9, 9]]
+
+        assert solve_assignment(cost) == [(0, 1), (1, 0)]
+
+    def it_assigns_every_column_when_there_are_more_rows(backend):
+        cost = [[9], [2], [5]]
+
+        assert solve_assignment(cost) == [(1, 0)]
+
+    def it_finds_the_minimum_cost(backend):
+        rng = random.Random(7)
+        for _ in range(50):
+            rows, cols = rng.randint(1, 5), rng.randint(1, 5)
+            cost = [[rng.randint(0, 30) for _ in range(cols)] for _ in range(rows)]
+
+            pairs = solve_assignment(cost)
+
+            assert len(pairs) == min(rows, cols)
+            assert len({r for r, _ in pairs}) == len({c for _, c in pairs}) == len(pairs)
+            assert sum(cost[r][c] for r, c in pairs) == _brute_force_cost(cost)
+
+    def it_solves_wide_matrices_on_the_cheapest_columns(backend):
+        rng = random.Random(3)
+        for _ in range(30):
+            rows = rng.randint(1, 3)
+            cols = rng.randint(3 * rows, 10)
+            cost = [[rng.randint(0, 20) for _ in range(cols)] for _ in range(rows)]
+
+            pairs = solve_assignment(cost)
+
+            assert len({col for _, col in pairs}) == rows
+            assert sum(cost[row][col] for row, col in pairs) == _brute_force_cost(cost)
+
+
+def describe_crew_assignment_planner():
+    @pytest.fixture
+    def agent_repo(mocker):
+        repo = mocker.Mock()
+        del repo.estimate_travel_times
+        del repo.estimate_repair_times
+        repo.get_available_crews.return_value = ["crew-1", "crew-2"]
+        repo.crew_location.side_effect = {"crew-1": "north", "crew-2": "south", "crew-3": "north"}.get
+        travel = {("north", "node-n"): 10, ("north", "node-s"): 100, ("south", "node-n"): 100, ("south", "node-s"): 10}
+        repo.estimate_travel_time.side_effect = lambda origin, destination: travel.get((origin, destination), 50)
+        repo.estimate_repair_time.return_value = 30
+        return repo
+
+    @pytest.fixture
+    def system_tools(mocker):
+        repo = mocker.Mock()
+        repo.get_node_details_batch.side_effect = lambda node_ids: {n: {"critical": n != "node-minor"} for n in node_ids}
+        return SystemTools(repo)
+
+    @pytest.fixture
+    def planner(agent_repo, system_tools):
+        return CrewAssignmentPlanner(agent_repo, system_tools)
+
+    def describe_plan_crew_assignment():
+        def it_assigns_each_crew_to_its_closest_node(planner):
+            result = planner.plan_crew_assignment(["node-s", "node-n"])
+
+            assert dict(zip(result["node_ids"], result["crew_ids"])) == {"node-n": "crew-1", "node-s": "crew-2"}
+            assert result["unassigned_nodes"] == []
+            assert result["estimated_times"] == [40, 40]
+
+        def it_prefers_high_impact_nodes_when_crews_are_short(planner):
+            result = planner.plan_crew_assignment(["node-minor", "node-x"], crew_ids=["crew-1"])
+
+            assert result["node_ids"] == ["node-x"]
+            assert result["unassigned_nodes"] == ["node-minor"]
+
+        def it_fetches_travel_times_once_per_crew_location(planner, agent_repo):
+            planner.plan_crew_assignment(["node-n", "node-s"], crew_ids=["crew-1", "crew-3", "crew-2"])
+
+            assert agent_repo.estimate_travel_time.call_count == 4
+
+        def it_reads_travel_times_from_a_shared_matrix(agent_repo, system_tools):
+            travel_times = TravelTimeMatrix(agent_repo)
+            planner = CrewAssignmentPlanner(agent_repo, system_tools, travel_times)
+
+            planner.plan_crew_assignment(["node-n", "node-s"])
+            planner.plan_crew_assignment(["node-n", "node-s"])
+
+            assert agent_repo.estimate_travel_time.call_count == 4
+
+        def it_fetches_repair_times_in_one_call_when_supported(planner, agent_repo):
+            agent_repo.estimate_repair_times = lambda nodes: [20 if node == "node-n" else 30 for node in nodes]
+
+            result = planner.plan_crew_assignment(["node-s", "node-n"])
+
+            assert dict(zip(result["node_ids"], result["estimated_times"])) == {"node-n": 30, "node-s": 40}
+            agent_repo.estimate_repair_time.assert_not_called()
+
+        def it_uses_available_crews_by_default(planner, agent_repo):
+            planner.plan_crew_assignment(["node-n"])
+
+            agent_repo.get_available_crews.assert_called_once()
+
+        def describe_when_no_crews_available():
+            def it_leaves_all_nodes_unassigned(planner):
+                result = planner.plan_crew_assignment(["node-n"], crew_ids=[])
+
+                assert result == {"node_ids": [], "crew_ids": [], "unassigned_nodes": ["node-n"], "estimated_times": []}
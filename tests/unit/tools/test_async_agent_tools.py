@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from src.infra_fail_mngr.tools.agent_tools import AgentTools
+from src.infra_fail_mngr.tools.async_agent_tools import AsyncAgentTools
+
+
+@pytest.fixture
+def repo_mock(mocker):
+    return mocker.AsyncMock()
+
+
+def describe_async_agent_tools():
+    def describe_get_weather():
+        def it_awaits_the_repo(repo_mock):
+            repo_mock.get_weather_at_location.return_value = 14
+
+            result = asyncio.run(AsyncAgentTools(repo_mock, []).get_weather_at_location("location-1"))
+
+            assert result == {"location": "location-1", "temperature": 14, "is_raining": True}
+
+    def describe_get_crew_location():
+        def it_awaits_the_repo(repo_mock):
+            repo_mock.crew_location.return_value = "location-1"
+
+            result = asyncio.run(AsyncAgentTools(repo_mock, []).get_crew_location("crew-1"))
+
+            assert result == {"crew_id": "crew-1", "location": "location-1"}
+
+    def describe_get_tool_descriptions():
+        def it_matches_the_sync_tools(repo_mock, mocker):
+            assert AsyncAgentTools(repo_mock, []).get_tool_descriptions() == AgentTools(mocker.Mock(), []).get_tool_descriptions()
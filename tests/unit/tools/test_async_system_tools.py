@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from src.infra_fail_mngr.tools.async_system_tools import AsyncSystemTools
+
+
+def describe_async_system_tools():
+    def describe_detect_failure_nodes():
+        def it_awaits_repo_get_failed_nodes(mocker):
+            repo = mocker.AsyncMock()
+            repo.get_failed_nodes.return_value = ["node-1"]
+
+            result = asyncio.run(AsyncSystemTools(repo).detect_failure_nodes())
+
+            assert result == ["node-1"]
+
+    def describe_detect_failure_nodes_since():
+        def it_awaits_repo_get_failed_nodes_since(mocker):
+            repo = mocker.AsyncMock()
+            repo.get_failed_nodes_since.return_value = (["node-4"], "cursor-2")
+
+            result = asyncio.run(AsyncSystemTools(repo).detect_failure_nodes_since("cursor-1"))
+
+            assert result == {"failures": ["node-4"], "cursor": "cursor-2"}
+
+        def it_falls_back_to_a_full_scan(mocker):
+            repo = mocker.AsyncMock()
+            del repo.get_failed_nodes_since
+            repo.get_failed_nodes.return_value = ["node-1"]
+
+            result = asyncio.run(AsyncSystemTools(repo).detect_failure_nodes_since("cursor-1"))
+
+            assert result == {"failures": ["node-1"], "cursor": None}
+
+    def describe_estimate_impact_batch():
+        def describe_when_repo_supports_batch():
+            def it_fetches_details_in_one_call(mocker):
+                repo = mocker.AsyncMock()
+                repo.get_node_details_batch.return_value = {"node-1": {"critical": True}}
+
+                result = asyncio.run(AsyncSystemTools(repo).estimate_impact_batch(["node-1", "node-2"]))
+
+                assert result == {
+                    "node-1": {"population_affected": 5000, "criticality": "High"},
+                    "node-2": {"population_affected": 100, "criticality": "Low"},
+                }
+                repo.get_node_details.assert_not_awaited()
+
+        def describe_when_repo_has_no_batch_method():
+            def it_falls_back_to_per_node_calls(mocker):
+                repo = mocker.AsyncMock()
+                del repo.get_node_details_batch
+                repo.get_node_details.return_value = {"critical": False}
+
+                result = asyncio.run(AsyncSystemTools(repo).estimate_impact_batch(["node-1", "node-2"]))
+
+                assert repo.get_node_details.await_count == 2
+                assert result["node-2"]["criticality"] == "Low"
+
+    def describe_rank_impact():
+        def it_returns_the_nodes_most_impactful_first(mocker):
+            repo = mocker.AsyncMock()
+            repo.get_node_details_batch.return_value = {"node-2": {"critical": True}}
+
+            result = asyncio.run(AsyncSystemTools(repo).rank_impact(["node-1", "node-2"]))
+
+            assert result["node_ids"] == ["node-2", "node-1"]
+            assert result["criticality"] == ["High", "Low"]
+
+    def describe_assign_repair_crew():
+        @pytest.fixture
+        def repo(mocker):
+            async def assign_crew(node, crew):
+                if node == "node-2":
+                    raise ConnectionError("dispatch unavailable")
+                if node == "node-3":
+                    await asyncio.sleep(1)
+                return True
+
+            mock = mocker.AsyncMock()
+            mock.assign_crew.side_effect = assign_crew
+            return mock
+
+        def describe_when_dispatching_sequentially():
+            def it_assigns_each_pair(mocker):
+                repo = mocker.AsyncMock()
+                repo.assign_crew.side_effect = [True, False]
+
+                result = asyncio.run(AsyncSystemTools(repo).assign_repair_crew(["node-1", "node-2"], ["crew-1", "crew-2"]))
+
+                assert result == {"status": "completed", "details": {"node-1": "Assigned", "node-2": "Failed"}}
+
+            def it_reports_exceptions_as_failed(repo):
+                result = asyncio.run(AsyncSystemTools(repo).assign_repair_crew(["node-1", "node-2"], ["crew-1", "crew-2"]))
+
+                assert result["details"] == {"node-1": "Assigned", "node-2": "Failed"}
+
+        def describe_when_dispatching_concurrently():
+            def it_reports_errors_as_failed_and_timeouts_as_pending_in_input_order(repo):
+                tools = AsyncSystemTools(repo, max_dispatch_workers=4, dispatch_timeout=0.05)
+
+                result = asyncio.run(tools.assign_repair_crew(
+                    ["node-1", "node-2", "node-3", "node-4"], ["crew-1", "crew-2", "crew-3", "crew-4"]
+                ))
+
+                assert list(result["details"].items()) == [
+                    ("node-1", "Assigned"),
+                    ("node-2", "Failed"),
+                    ("node-3", "Pending"),
+                    ("node-4", "Assigned"),
+                ]
+
+            def it_notifies_pending_assignments_that_succeed_later(mocker):
+                async def assign_crew(node, crew):
+                    await asyncio.sleep(0.1 if node == "node-1" else 0)
+                    return True
+
+                repo = mocker.AsyncMock()
+                repo.assign_crew.side_effect = assign_crew
+                on_crew_assigned = mocker.Mock()
+                tools = AsyncSystemTools(
+                    repo, max_dispatch_workers=2, dispatch_timeout=0.02, on_crew_assigned=on_crew_assigned
+                )
+
+                async def dispatch():
+                    result = await tools.assign_repair_crew(["node-1", "node-2"], ["crew-1", "crew-2"])
+                    await asyncio.sleep(0.2)
+                    return result
+
+                result = asyncio.run(dispatch())
+
+                assert result["details"] == {"node-1": "Pending", "node-2": "Assigned"}
+                assert on_crew_assigned.call_args_list == [mocker.call("node-2", "crew-2"), mocker.call("node-1", "crew-1")]
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.infra_fail_mngr.tools.decision_validator import DecisionValidator
+from src.infra_fail_mngr.tools.tool_registry import ToolRegistry
+
+
+def find_crew(crew_id: str, **kwargs) -> Dict:
+    """Find a crew."""
+    return {"crew_id": crew_id}
+
+
+def dispatch(node_ids: List[str], priority: int = 1, ratio: float = 1.0, when: Optional[datetime] = None):
+    """Dispatch crews."""
+    return {"status": "completed"}
+
+
+def describe_decision_validator():
+    @pytest.fixture
+    def validator():
+        return DecisionValidator(ToolRegistry([find_crew, dispatch]).schemas)
+
+    def it_accepts_well_formed_decisions(validator):
+        assert validator.validate({"action": "find_crew", "arguments": {"crew_id": "crew-1"}}) is None
+        assert validator.validate({"action": "dispatch", "arguments": {"node_ids": ["n1"], "ratio": 2, "when": None}}) is None
+
+    def it_accepts_assignments_of_unregistered_assign_repair_crew(validator):
+        assert validator.validate({"action": "assign_repair_crew", "arguments": {}}) is None
+
+    def it_allows_extra_arguments_for_tools_taking_kwargs(validator):
+        assert validator.validate({"action": "find_crew", "arguments": {"crew_id": "crew-1", "reason": "x"}}) is None
+
+    @pytest.mark.parametrize("decision, error", [
+        ([], "The response must be a JSON object"),
+        ({"arguments": {}}, "Missing 'action' field"),
+        ({"action": 3}, "'action' must be a string"),
+        ({"action": "repo"}, "Unknown tool: repo"),
+        ({"action": "find_crew", "arguments": ["crew-1"]}, "'arguments' must be an object"),
+        ({"action": "find_crew", "arguments": {}}, "Missing argument 'crew_id' for find_crew"),
+        ({"action": "find_crew", "arguments": {"crew_id": 1}},
+         "Argument 'crew_id' of find_crew must be string, got integer"),
+        ({"action": "dispatch", "arguments": {"node_ids": ["n1", 2]}},
+         "Argument 'node_ids' of dispatch must be array of string, got array"),
+        ({"action": "dispatch", "arguments": {"node_ids": [], "priority": True}},
+         "Argument 'priority' of dispatch must be integer, got boolean"),
+        ({"action": "dispatch", "arguments": {"node_ids": [], "when": 5}},
+         "Argument 'when' of dispatch must be string or null, got integer"),
+        ({"action": "dispatch", "arguments": {"node_ids": [], "crews": []}},
+         "Unexpected argument 'crews' for dispatch"),
+    ])
+    def it_reports_the_first_problem(validator, decision, error):
+        assert validator.validate(decision) == error
+
+    def describe_tool_calls():
+        def it_accepts_valid_calls(validator):
+            assert validator.validate({"tool_calls": [
+                {"action": "find_crew", "arguments": {"crew_id": "crew-1"}},
+                {"action": "dispatch", "arguments": {"node_ids": ["n1"]}},
+            ]}) is None
+
+        def it_prefixes_errors_with_the_call_index(validator):
+            assert validator.validate({"tool_calls": [
+                {"action": "find_crew", "arguments": {"crew_id": "crew-1"}},
+                {"action": "find_crew", "arguments": {}},
+            ]}) == "tool_calls[1]: Missing argument 'crew_id' for find_crew"
+
+        def it_rejects_empty_lists(validator):
+            assert validator.validate({"tool_calls": []}) == "'tool_calls' must be a non-empty list"
+
+        def it_rejects_assignments(validator):
+            error = validator.validate({"tool_calls": [{"action": "assign_repair_crew", "arguments": {}}]})
+
+            assert error.startswith("tool_calls[0]: assign_repair_crew")
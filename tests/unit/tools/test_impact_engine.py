@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from src.infra_fail_mngr.tools import impact_engine
+from src.infra_fail_mngr.tools.impact_engine import ImpactEngine
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(impact_engine, "np", None)
+    elif impact_engine.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+def describe_impact_engine():
+    @pytest.fixture
+    def engine():
+        return ImpactEngine()
+
+    def it_matches_the_critical_flag_model_without_other_attributes(engine, backend):
+        scores = engine.score(["node-1", "node-2", "node-3"], {"node-1": {"critical": True}, "node-2": {}})
+
+        assert scores.report() == {
+            "node-1": {"population_affected": 5000, "criticality": "High"},
+            "node-2": {"population_affected": 100, "criticality": "Low"},
+            "node-3": {"population_affected": 100, "criticality": "Low"},
+        }
+
+    def it_scales_with_population_fan_out_and_redundancy(engine, backend):
+        details = {
+            "node-1": {"population": 1000, "downstream": 4},
+            "node-2": {"population": 1000, "downstream": ["a", "b"], "redundancy": 1},
+            "node-3": {"population": 300, "critical_services": 2},
+        }
+
+        report = engine.score(list(details), details).report()
+
+        assert report["node-1"] == {"population_affected": 1400, "criticality": "Low"}
+        assert report["node-2"] == {"population_affected": 600, "criticality": "Low"}
+        assert report["node-3"] == {"population_affected": 300, "criticality": "High"}
+
+    def it_ignores_malformed_attributes(engine, backend):
+        details = {"node-1": {"population": "many", "redundancy": None}, "node-2": {"population": -5, "downstream": True}}
+
+        report = engine.score(["node-1", "node-2"], details).report()
+
+        assert report["node-1"] == {"population_affected": 100, "criticality": "Low"}
+        assert report["node-2"] == {"population_affected": 100, "criticality": "Low"}
+
+    def it_keeps_an_empty_population(engine, backend):
+        assert engine.score(["node-1"], {"node-1": {"population": 0}}).report()["node-1"]["population_affected"] == 0
+
+    def it_ranks_critical_services_first_then_by_population(engine, backend):
+        details = {
+            "small": {"population": 10},
+            "large": {"population": 2000},
+            "hospital": {"population": 500, "critical": True},
+            "also-small": {"population": 10},
+        }
+
+        scores = engine.score(list(details), details)
+
+        assert scores.ranked() == ["hospital", "large", "small", "also-small"]
+        assert list(scores.ranking()) == [2, 1, 0, 3]
+
+    def it_agrees_between_numpy_and_python(engine, monkeypatch):
+        if impact_engine.np is None:
+            pytest.skip("numpy is not installed")
+        rng = random.Random(0)
+        details = {
+            f"node-{i}": {
+                "population": rng.randint(0, 10000),
+                "critical": rng.random() < 0.1,
+                "downstream": rng.randint(0, 20),
+                "redundancy": rng.randint(0, 2),
+            }
+            for i in range(500)
+        }
+        vectorized = engine.score(list(details), details)
+        monkeypatch.setattr(impact_engine, "np", None)
+        python = engine.score(list(details), details)
+
+        assert vectorized.report() == python.report()
+        assert vectorized.ranked() == python.ranked()
+
+    def it_scores_a_single_node_like_a_batch(engine, backend):
+        details = {"population": 800, "downstream": 3, "critical": True}
+
+        assert engine.impact(details) == engine.score(["node-1"], {"node-1": details}).report()["node-1"]
+        assert engine.impact(None) == {"population_affected": 100, "criticality": "Low"}
@@ -1,5 +1,10 @@
+import threading
+import time
+
 import pytest
 
+from src.infra_fail_mngr.domain import SystemRepository
+from src.infra_fail_mngr.tools.impact_engine import ImpactEngine
 from src.infra_fail_mngr.tools.system_tools import SystemTools
 
 
@@ -83,6 +88,31 @@ def describe_system_tools():
 
                 assert result == ["node-1"]
 
+    def describe_detect_failure_nodes_since():
+        def describe_when_repo_supports_incremental_scans():
+            @pytest.fixture
+            def repo(mocker):
+                mock = mocker.Mock()
+                mock.get_failed_nodes_since.return_value = (["node-4"], "cursor-2")
+                return mock
+
+            def it_returns_failures_since_the_cursor(repo):
+                result = SystemTools(repo).detect_failure_nodes_since("cursor-1")
+
+                assert result == {"failures": ["node-4"], "cursor": "cursor-2"}
+                repo.get_failed_nodes_since.assert_called_once_with("cursor-1")
+                repo.get_failed_nodes.assert_not_called()
+
+        def describe_when_repo_has_no_incremental_scans():
+            def it_falls_back_to_a_full_scan(mocker):
+                class Repo(SystemRepository):
+                    def get_failed_nodes(self):
+                        return ["node-1", "node-4"]
+
+                result = SystemTools(Repo()).detect_failure_nodes_since("cursor-1")
+
+                assert result == {"failures": ["node-1", "node-4"], "cursor": None}
+
     def describe_estimate_impact():
         def describe_when_node_is_critical():
             @pytest.fixture
@@ -161,6 +191,95 @@ def describe_system_tools():
 
                 assert result["population_affected"] == 5000
 
+    def describe_estimate_impact_batch():
+        def describe_when_repo_supports_batch():
+            @pytest.fixture
+            def repo(mocker):
+                mock = mocker.Mock()
+                mock.get_node_details_batch.return_value = {
+                    "node-1": {"critical": True},
+                    "node-2": {"critical": False},
+                }
+                return mock
+
+            @pytest.fixture
+            def tools(repo):
+                return SystemTools(repo)
+
+            def it_returns_impact_per_node(tools):
+                result = tools.estimate_impact_batch(["node-1", "node-2"])
+
+                assert result == {
+                    "node-1": {"population_affected": 5000, "criticality": "High"},
+                    "node-2": {"population_affected": 100, "criticality": "Low"},
+                }
+
+            def it_fetches_details_in_one_call(tools, repo):
+                tools.estimate_impact_batch(["node-1", "node-2"])
+
+                repo.get_node_details_batch.assert_called_once_with(["node-1", "node-2"])
+                repo.get_node_details.assert_not_called()
+
+            def it_treats_missing_details_as_low_impact(tools):
+                result = tools.estimate_impact_batch(["node-3"])
+
+                assert result["node-3"]["criticality"] == "Low"
+
+        def describe_when_repo_has_no_batch_method():
+            @pytest.fixture
+            def repo(mocker):
+                mock = mocker.Mock(spec=["get_failed_nodes", "get_node_details", "assign_crew"])
+                mock.get_node_details.side_effect = lambda node_id: {"critical": node_id == "node-1"}
+                return mock
+
+            @pytest.fixture
+            def tools(repo):
+                return SystemTools(repo)
+
+            def it_falls_back_to_per_node_calls(tools, repo):
+                result = tools.estimate_impact_batch(["node-1", "node-2"])
+
+                assert repo.get_node_details.call_count == 2
+                assert result["node-1"]["criticality"] == "High"
+                assert result["node-2"]["criticality"] == "Low"
+
+        def describe_when_repo_subclasses_the_protocol():
+            def it_falls_back_to_per_node_calls():
+                class Repo(SystemRepository):
+                    def get_node_details(self, node_id):
+                        return {"critical": True}
+
+                result = SystemTools(Repo()).estimate_impact_batch(["node-1"])
+
+                assert result == {"node-1": {"population_affected": 5000, "criticality": "High"}}
+
+    def describe_rank_impact():
+        @pytest.fixture
+        def repo(mocker):
+            mock = mocker.Mock()
+            mock.get_node_details_batch.return_value = {
+                "node-1": {"population": 200},
+                "node-2": {"critical": True},
+                "node-3": {"population": 900, "downstream": 2},
+            }
+            return mock
+
+        def it_returns_the_nodes_most_impactful_first(repo):
+            result = SystemTools(repo).rank_impact(["node-1", "node-2", "node-3"])
+
+            assert result == {
+                "node_ids": ["node-2", "node-3", "node-1"],
+                "population_affected": [5000, 1100, 200],
+                "criticality": ["High", "Low", "Low"],
+            }
+
+        def it_uses_the_given_impact_engine(repo):
+            tools = SystemTools(repo, impact_engine=ImpactEngine(dependent_population=0))
+
+            assert tools.estimate_impact_batch(["node-3"]) == {
+                "node-3": {"population_affected": 900, "criticality": "Low"}
+            }
+
     def describe_assign_repair_crew():
         def describe_when_single_assignment_succeeds():
             @pytest.fixture
@@ -320,3 +439,117 @@ def describe_system_tools():
                 )
 
                 assert result["status"] == "completed"
+
+        def describe_when_dispatching_concurrently():
+            @pytest.fixture
+            def node_ids():
+                return [f"node-{i}" for i in range(20)]
+
+            @pytest.fixture
+            def crew_ids():
+                return [f"crew-{i}" for i in range(20)]
+
+            def it_returns_details_in_input_order(mocker, node_ids, crew_ids):
+                repo = mocker.Mock()
+                # Later nodes finish first
+                repo.assign_crew.side_effect = lambda n, c: time.sleep(0.001 * (20 - int(n.split("-")[1]))) or True
+                tools = SystemTools(repo, max_dispatch_workers=8)
+
+                result = tools.assign_repair_crew(node_ids, crew_ids)
+
+                assert list(result["details"].keys()) == node_ids
+                assert set(result["details"].values()) == {"Assigned"}
+
+            def it_limits_concurrency(mocker, node_ids, crew_ids):
+                lock = threading.Lock()
+                running = {"now": 0, "max": 0}
+
+                def assign_crew(node, crew):
+                    with lock:
+                        running["now"] += 1
+                        running["max"] = max(running["max"], running["now"])
+                    time.sleep(0.005)
+                    with lock:
+                        running["now"] -= 1
+                    return True
+
+                repo = mocker.Mock()
+                repo.assign_crew.side_effect = assign_crew
+                tools = SystemTools(repo, max_dispatch_workers=4)
+
+                tools.assign_repair_crew(node_ids, crew_ids)
+
+                assert 1 < running["max"] <= 4
+
+            def it_reports_exceptions_as_failed(mocker):
+                def assign_crew(node, crew):
+                    if node == "node-2":
+                        raise ConnectionError("dispatch unavailable")
+                    return True
+
+                repo = mocker.Mock()
+                repo.assign_crew.side_effect = assign_crew
+                tools = SystemTools(repo, max_dispatch_workers=2)
+
+                result = tools.assign_repair_crew(["node-1", "node-2", "node-3"], ["crew-1", "crew-2", "crew-3"])
+
+                assert result["details"] == {"node-1": "Assigned", "node-2": "Failed", "node-3": "Assigned"}
+
+            def it_reports_calls_running_past_the_timeout_as_pending(mocker):
+                release = threading.Event()
+                repo = mocker.Mock()
+                repo.assign_crew.side_effect = lambda n, c: release.wait(1) if n == "node-1" else True
+                tools = SystemTools(repo, max_dispatch_workers=2, dispatch_timeout=0.05)
+
+                result = tools.assign_repair_crew(["node-1", "node-2"], ["crew-1", "crew-2"])
+                release.set()
+
+                assert result["details"] == {"node-1": "Pending", "node-2": "Assigned"}
+
+            def it_measures_the_timeout_from_the_start_of_each_call(mocker):
+                repo = mocker.Mock()
+                repo.assign_crew.side_effect = lambda n, c: time.sleep(0.05) or True
+                tools = SystemTools(repo, max_dispatch_workers=2, dispatch_timeout=0.15)
+                node_ids = [f"node-{i}" for i in range(12)]
+
+                result = tools.assign_repair_crew(node_ids, [f"crew-{i}" for i in range(12)])
+
+                assert set(result["details"].values()) == {"Assigned"}
+
+            def it_notifies_pending_assignments_that_succeed_later(mocker):
+                release = threading.Event()
+                notified = threading.Event()
+                on_crew_assigned = mocker.Mock(side_effect=lambda n, c: notified.set())
+                repo = mocker.Mock()
+                repo.assign_crew.side_effect = lambda n, c: release.wait(1) if n == "node-1" else False
+                tools = SystemTools(
+                    repo, max_dispatch_workers=2, dispatch_timeout=0.05, on_crew_assigned=on_crew_assigned
+                )
+
+                tools.assign_repair_crew(["node-1", "node-2"], ["crew-1", "crew-2"])
+                on_crew_assigned.assert_not_called()
+                release.set()
+
+                assert notified.wait(1)
+                on_crew_assigned.assert_called_once_with("node-1", "crew-1")
+
+            def it_fails_calls_that_cannot_start_while_every_worker_is_stuck(mocker):
+                release = threading.Event()
+                repo = mocker.Mock()
+                repo.assign_crew.side_effect = lambda n, c: release.wait(1) if n != "node-3" else True
+                tools = SystemTools(repo, max_dispatch_workers=2, dispatch_timeout=0.05)
+
+                result = tools.assign_repair_crew(["node-1", "node-2", "node-3"], ["crew-1", "crew-2", "crew-3"])
+                release.set()
+
+                assert result["details"] == {"node-1": "Pending", "node-2": "Pending", "node-3": "Failed"}
+                assert repo.assign_crew.call_count == 2
+
+        def describe_when_dispatching_sequentially():
+            def it_reports_exceptions_as_failed(mocker):
+                repo = mocker.Mock()
+                repo.assign_crew.side_effect = [True, ConnectionError("dispatch unavailable")]
+
+                result = SystemTools(repo).assign_repair_crew(["node-1", "node-2"], ["crew-1", "crew-2"])
+
+                assert result["details"] == {"node-1": "Assigned", "node-2": "Failed"}
@@ -0,0 +1,98 @@
+import gc
+import weakref
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.infra_fail_mngr.tools import tool_registry
+from src.infra_fail_mngr.tools.tool_registry import ToolRegistry, annotation_schema
+
+
+class _Tools:
+    def find_crew(self, crew_id: str, **kwargs) -> Dict:
+        """Find a crew."""
+        return {"crew_id": crew_id}
+
+
+def describe_tool_registry():
+    @pytest.fixture
+    def tool():
+        def dispatch(node_ids: List[str], priority: int = 1, when: Optional[datetime] = None):
+            """Dispatch crews."""
+            return {"status": "completed"}
+
+        return dispatch
+
+    @pytest.fixture
+    def registry(tool):
+        return ToolRegistry([_Tools().find_crew, tool])
+
+    def describe_get():
+        def it_returns_registered_tools(registry, tool):
+            assert registry.get("dispatch") is tool
+
+        def it_returns_none_for_unknown_names(registry):
+            assert registry.get("repo") is None
+
+    def describe_descriptions():
+        def it_describes_every_tool_on_its_own_line(registry):
+            assert registry.descriptions.split("\n") == [
+                "find_crew(crew_id: str, **kwargs) -> Dict - Find a crew.",
+                "dispatch(node_ids: List[str], priority: int = 1, when: Optional[datetime.datetime] = None) - Dispatch crews.",
+            ]
+
+        def it_reflects_each_function_once(mocker):
+            tool_registry._DESCRIPTIONS.clear()
+            spy = mocker.spy(tool_registry.inspect, "signature")
+
+            ToolRegistry([_Tools().find_crew])
+            ToolRegistry([_Tools().find_crew])
+
+            assert spy.call_count == 1
+
+        def it_does_not_keep_described_functions_alive():
+            def dispatch(node_id: str):
+                """Dispatch a crew."""
+
+            ToolRegistry([dispatch])
+            ref = weakref.ref(dispatch)
+            del dispatch
+            gc.collect()
+
+            assert ref() is None
+
+    def describe_schemas():
+        def it_lists_required_parameters(registry):
+            assert registry.schemas["dispatch"]["required"] == ["node_ids"]
+
+        def it_skips_var_keyword_parameters(registry):
+            assert registry.schemas["find_crew"] == {
+                "type": "object",
+                "properties": {"crew_id": {"type": "string"}},
+                "required": ["crew_id"],
+            }
+
+        def it_closes_schemas_without_var_keyword_parameters(registry):
+            assert registry.schemas["dispatch"]["additionalProperties"] is False
+
+        def it_maps_parameter_types(registry):
+            properties = registry.schemas["dispatch"]["properties"]
+
+            assert properties["node_ids"] == {"type": "array", "items": {"type": "string"}}
+            assert properties["priority"] == {"type": "integer"}
+            assert properties["when"] == {"anyOf": [{"type": "string", "format": "date-time"}, {"type": "null"}]}
+
+
+def describe_annotation_schema():
+    @pytest.mark.parametrize("annotation, expected", [
+        (str, {"type": "string"}),
+        (bool, {"type": "boolean"}),
+        (float, {"type": "number"}),
+        (dict, {"type": "object"}),
+        (list, {"type": "array"}),
+        (str | int, {"anyOf": [{"type": "string"}, {"type": "integer"}]}),
+        (object, {}),
+    ])
+    def it_maps_annotations(annotation, expected):
+        assert annotation_schema(annotation) == expected
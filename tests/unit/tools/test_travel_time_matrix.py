@@ -0,0 +1,128 @@
+import sys
+import threading
+
+import pytest
+
+from src.infra_fail_mngr.tools.travel_time_matrix import TravelTimeMatrix
+
+
+def _travel_time(origin, destination):
+    return 10 * int(origin[-1]) + int(destination[-1])
+
+
+def describe_travel_time_matrix():
+    @pytest.fixture
+    def repo(mocker):
+        mock = mocker.Mock()
+        del mock.estimate_travel_times
+        mock.estimate_travel_time.side_effect = _travel_time
+        mock.crew_location.side_effect = {"crew-1": "loc-1", "crew-2": "loc-2", "crew-3": "loc-1"}.get
+        return mock
+
+    @pytest.fixture
+    def matrix(repo):
+        return TravelTimeMatrix(repo)
+
+    def describe_get():
+        def it_returns_the_repo_travel_time(matrix):
+            assert matrix.get("loc-1", "node-2") == 12
+
+        def it_fetches_each_pair_once(matrix, repo):
+            matrix.get("loc-1", "node-2")
+            matrix.get("loc-1", "node-2")
+
+            repo.estimate_travel_time.assert_called_once_with("loc-1", "node-2")
+
+        def it_is_thread_safe():
+            class Repo:
+                def estimate_travel_time(self, origin, destination):
+                    return _travel_time(origin, destination)
+
+            pairs = [(f"loc-{o}", f"node-{d}") for o in range(40) for d in range(40)]
+            errors = []
+
+            def get_all(matrix, thread):
+                try:
+                    for origin, destination in pairs[thread::8]:
+                        assert matrix.get(origin, destination) == _travel_time(origin, destination)
+                except Exception as error:
+                    errors.append(error)
+
+            interval = sys.getswitchinterval()
+            # Switch threads as often as possible, so that unguarded updates interleave
+            sys.setswitchinterval(1e-6)
+            try:
+                for _ in range(5):
+                    matrix = TravelTimeMatrix(Repo())
+                    threads = [threading.Thread(target=get_all, args=(matrix, thread)) for thread in range(8)]
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join()
+            finally:
+                sys.setswitchinterval(interval)
+
+            assert errors == []
+
+    def describe_matrix():
+        def it_returns_one_row_per_origin(matrix):
+            assert matrix.matrix(["loc-1", "loc-2"], ["node-1", "node-2", "node-3"]) == [
+                [11, 12, 13],
+                [21, 22, 23],
+            ]
+
+        def it_only_fetches_missing_cells(matrix, repo):
+            matrix.matrix(["loc-1"], ["node-1", "node-2"])
+            matrix.matrix(["loc-1", "loc-2"], ["node-2", "node-3"])
+
+            # loc-1: node-1, node-2, node-3 / loc-2: node-2, node-3
+            assert repo.estimate_travel_time.call_count == 5
+            assert len(matrix) == 5
+
+        def describe_when_repo_supports_batch():
+            def it_fetches_missing_cells_in_one_call(mocker):
+                repo = mocker.Mock()
+                repo.estimate_travel_times.side_effect = lambda origins, destinations: [
+                    [_travel_time(o, d) for d in destinations] for o in origins
+                ]
+                matrix = TravelTimeMatrix(repo)
+
+                result = matrix.matrix(["loc-1", "loc-2"], ["node-1", "node-2"])
+
+                assert result == [[11, 12], [21, 22]]
+                repo.estimate_travel_times.assert_called_once_with(["loc-1", "loc-2"], ["node-1", "node-2"])
+                repo.estimate_travel_time.assert_not_called()
+
+    def describe_crew_matrix():
+        def it_maps_crews_to_their_location(matrix):
+            assert matrix.crew_matrix(["crew-1", "crew-2", "crew-3"], ["node-1"]) == [[11], [21], [11]]
+
+        def it_shares_rows_between_crews_at_the_same_location(matrix, repo):
+            matrix.crew_matrix(["crew-1", "crew-3"], ["node-1", "node-2"])
+
+            assert repo.estimate_travel_time.call_count == 2
+
+        def describe_when_a_crew_moves():
+            def it_only_fetches_the_new_row(matrix, repo):
+                matrix.crew_matrix(["crew-1", "crew-2"], ["node-1"])
+                repo.estimate_travel_time.reset_mock()
+
+                matrix.move_crew("crew-1", "loc-5")
+                result = matrix.crew_matrix(["crew-1", "crew-2"], ["node-1"])
+
+                assert result == [[51], [21]]
+                repo.estimate_travel_time.assert_called_once_with("loc-5", "node-1")
+
+            def it_moves_assigned_crews_to_their_node(matrix):
+                matrix.on_crew_assigned("node-7", "crew-1")
+
+                assert matrix.crew_location("crew-1") == "node-7"
+
+    def describe_invalidate_origin():
+        def it_fetches_the_row_again(matrix, repo):
+            matrix.get("loc-1", "node-1")
+
+            matrix.invalidate_origin("loc-1")
+            matrix.get("loc-1", "node-1")
+
+            assert repo.estimate_travel_time.call_count == 2
@@ -0,0 +1,58 @@
+import json
+
+from src.infra_fail_mngr.tracing import JSONLExporter, OTLPJSONExporter, Tracer, to_otlp
+
+
+def _traced(exporter):
+    tracer = Tracer(exporter)
+    with tracer.span("state.REPAIR_PLANNING"):
+        with tracer.span("tool.get_weather_at_location", location="loc-1", retries=2):
+            pass
+    return tracer
+
+
+def describe_jsonl_exporter():
+    def it_writes_one_span_per_line(tmp_path):
+        exporter = JSONLExporter(str(tmp_path / "spans.jsonl"))
+        _traced(exporter)
+        exporter.close()
+
+        lines = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+
+        assert [line["name"] for line in lines] == ["tool.get_weather_at_location", "state.REPAIR_PLANNING"]
+        assert lines[0]["parent_id"] == lines[1]["span_id"]
+        assert lines[0]["attributes"] == {"location": "loc-1", "retries": 2}
+
+
+def describe_otlp_json_exporter():
+    def it_writes_export_requests(tmp_path):
+        exporter = OTLPJSONExporter(str(tmp_path / "spans.otlp.jsonl"), service_name="agent-1")
+        _traced(exporter)
+        exporter.close()
+
+        requests = [json.loads(line) for line in (tmp_path / "spans.otlp.jsonl").read_text().splitlines()]
+        resource_spans = requests[0]["resourceSpans"][0]
+        span = resource_spans["scopeSpans"][0]["spans"][0]
+        parent = requests[1]["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+
+        assert resource_spans["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "agent-1"}}]
+        assert span["name"] == "tool.get_weather_at_location"
+        assert span["parentSpanId"] == parent["spanId"]
+        assert "parentSpanId" not in parent
+        assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+        assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+        assert span["attributes"] == [
+            {"key": "location", "value": {"stringValue": "loc-1"}},
+            {"key": "retries", "value": {"intValue": "2"}},
+        ]
+
+    def it_marks_failed_spans():
+        tracer = Tracer()
+        span = tracer.span("tool.a")
+        with span:
+            pass
+        span.error = "ValueError: boom"
+
+        assert to_otlp([span])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["status"] == {
+            "code": 2, "message": "ValueError: boom"
+        }
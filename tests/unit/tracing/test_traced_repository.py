@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from src.infra_fail_mngr.tracing import InMemoryExporter, TracedRepository, Tracer
+
+
+class _Repo:
+    def get_failed_nodes(self):
+        return ["node-1"]
+
+    async def get_node_details(self, node_id):
+        await asyncio.sleep(0)
+        return {"node_id": node_id}
+
+
+def describe_traced_repository():
+    @pytest.fixture
+    def exporter():
+        return InMemoryExporter()
+
+    @pytest.fixture
+    def repo(exporter):
+        return TracedRepository(_Repo(), Tracer(exporter))
+
+    def it_traces_method_calls(repo, exporter):
+        assert repo.get_failed_nodes() == ["node-1"]
+
+        assert [span.name for span in exporter.spans] == ["repo.get_failed_nodes"]
+
+    def it_awaits_coroutines_within_their_span(repo, exporter):
+        assert asyncio.run(repo.get_node_details("node-1")) == {"node_id": "node-1"}
+
+        assert [span.name for span in exporter.spans] == ["repo.get_node_details"]
+
+    def it_keeps_optional_methods_detectable(repo):
+        assert getattr(repo, "get_failed_nodes_since", None) is None
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from src.infra_fail_mngr.tracing import InMemoryExporter, NOOP_TRACER, Tracer
+
+
+def describe_tracer():
+    @pytest.fixture
+    def exporter():
+        return InMemoryExporter()
+
+    @pytest.fixture
+    def tracer(exporter):
+        return Tracer(exporter)
+
+    def it_exports_finished_spans_with_their_timing(tracer, exporter):
+        with tracer.span("state.INIT", node="node-1"):
+            pass
+
+        [span] = exporter.spans
+        assert span.name == "state.INIT"
+        assert span.attributes == {"node": "node-1"}
+        assert span.end >= span.start
+        assert span.duration >= 0
+        assert span.end_unix_nano >= span.start_unix_nano > 0
+
+    def it_nests_spans_opened_within_another_one(tracer, exporter):
+        with tracer.span("state.REPAIR_PLANNING") as parent:
+            with tracer.span("llm.request"):
+                assert tracer.current() is not parent
+            assert tracer.current() is parent
+
+        child, root = exporter.spans
+        assert child.parent_id == root.span_id
+        assert child.trace_id == root.trace_id
+        assert root.parent_id is None
+        assert tracer.current() is None
+
+    def it_accepts_an_explicit_parent_from_another_thread(tracer, exporter):
+        with tracer.span("state.REPAIR_PLANNING") as parent:
+            thread = threading.Thread(target=lambda: tracer.span("tool.a", parent=parent).__enter__().__exit__(None, None, None))
+            thread.start()
+            thread.join()
+
+        assert exporter.spans[0].parent_id == parent.span_id
+
+    def it_records_errors_without_swallowing_them(tracer, exporter):
+        with pytest.raises(ValueError):
+            with tracer.span("tool.a"):
+                raise ValueError("boom")
+
+        assert exporter.spans[0].error == "ValueError: boom"
+
+    def it_aggregates_latency_by_name(tracer):
+        for name in ("tool.a", "tool.a", "tool.b"):
+            with tracer.span(name):
+                pass
+
+        breakdown = tracer.latency_breakdown()
+
+        assert breakdown["tool.a"]["count"] == 2
+        assert breakdown["tool.b"]["count"] == 1
+        assert breakdown["tool.a"]["mean_seconds"] == pytest.approx(breakdown["tool.a"]["total_seconds"] / 2)
+
+    def it_aggregates_without_an_exporter():
+        tracer = Tracer()
+
+        with tracer.span("tool.a"):
+            pass
+
+        assert tracer.latency_breakdown()["tool.a"]["count"] == 1
+
+
+def describe_noop_tracer():
+    def it_does_nothing():
+        with NOOP_TRACER.span("tool.a", node="node-1") as span:
+            span.set_attribute("key", "value")
+
+        assert NOOP_TRACER.current() is None
+        assert NOOP_TRACER.latency_breakdown() == {}
+
+    def it_reuses_one_span():
+        assert NOOP_TRACER.span("a") is NOOP_TRACER.span("b")